@@ -15,6 +15,9 @@ from api.views import (
     notifications,
     public_profile,
     verification,
+    gate,
+    analytics,
+    exports,
 )
 
 api = NinjaAPI()
@@ -29,3 +32,6 @@ api.add_router("", feedback.router)
 api.add_router("", notifications.router)
 api.add_router("", public_profile.router)
 api.add_router("", verification.router)
+api.add_router("", gate.router)
+api.add_router("", analytics.router)
+api.add_router("", exports.router)
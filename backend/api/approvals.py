@@ -0,0 +1,150 @@
+"""
+Registration approval shared by the approval views and the `apply_criteria_action`
+background task: status changes with their notifications, token revocations and
+counter updates, and criteria-based selection of tickets.
+"""
+
+from django.db import transaction
+from django.db.models import CharField, F, Func
+from django.utils import timezone
+
+from api.model.event import Event
+from api.model.event_stats import record_ticket_transitions
+from api.model.notification import send_approval_notifications, send_rejection_notifications
+from api.model.task import Task
+from api.model.ticket import Ticket
+from api.model.ticket_token import revoke_ticket_tokens
+
+TICKET_ACTION_FIELDS = ("id", "event_id", "attendee_id", "approval_status", "event_dates")
+TICKET_STATUSES = ("pending", "approved", "rejected")
+CRITERIA_CHUNK_SIZE = 500
+
+
+def apply_ticket_status(event: Event, tickets, new_status: str, reason: str = "") -> list:
+    """
+    Move tickets to new_status with a constant number of queries: one UPDATE,
+    one notification INSERT and one counter update. Returns the tickets that changed.
+    The tickets are locked and re-read first, so when two organizers act on the
+    same registration at once only the first one records the transition.
+    """
+    with transaction.atomic():
+        changed = list(
+            Ticket.objects.select_for_update()
+            .filter(id__in=[ticket.id for ticket in tickets])
+            .exclude(approval_status=new_status)
+            .only(*TICKET_ACTION_FIELDS)
+            .order_by("id")
+        )
+        if not changed:
+            return changed
+        _write_status(event, changed, new_status, reason)
+    return changed
+
+
+def _write_status(event: Event, changed: list, new_status: str, reason: str):
+    # imported here: the api.views package imports this module
+    from api.views.utils import extract_ticket_dates
+
+    transitions = [
+        (ticket.approval_status, new_status, extract_ticket_dates(ticket.event_dates))
+        for ticket in changed
+    ]
+    for ticket in changed:
+        ticket.event = event
+
+    now = timezone.now()
+    if new_status == "approved":
+        Ticket.objects.filter(id__in=[t.id for t in changed]).update(
+            approval_status=new_status, approved_at=now
+        )
+        send_approval_notifications(changed)
+    else:
+        Ticket.objects.filter(id__in=[t.id for t in changed]).update(
+            approval_status=new_status, rejected_at=now, revoked_at=now
+        )
+        send_rejection_notifications(changed, reason)
+        revoke_ticket_tokens(changed, reason="Registration rejected")
+
+        # free up the spots of rejected attendees; re-read the list under a row lock
+        attendees = Event.objects.select_for_update().values_list("attendee", flat=True).get(id=event.id)
+        rejected_ids = {t.attendee_id for t in changed}
+        if isinstance(attendees, list) and rejected_ids & set(attendees):
+            event.attendee = [a for a in attendees if a not in rejected_ids]
+            event.save(update_fields=["attendee"])
+
+    record_ticket_transitions(event.id, transitions)
+
+
+class AboutMeValue(Func):
+    """
+    about_me ->> key as text. Registration stores about_me as a JSON-encoded
+    string, so unwrap string values before reading the key.
+    """
+
+    output_field = CharField()
+
+    def __init__(self, expression, key: str):
+        if key not in ("faculty", "year"):
+            raise ValueError(f"Unsupported about_me key '{key}'")
+        self.template = (
+            "(CASE WHEN jsonb_typeof(%(expressions)s) = 'string' "
+            "THEN (%(expressions)s #>> '{}')::jsonb ELSE %(expressions)s END) ->> '" + key + "'"
+        )
+        super().__init__(expression)
+
+
+def criteria_queryset(event: Event, criteria: dict):
+    """Tickets of the event matching a RegistrationCriteriaSchema dict"""
+    tickets = Ticket.objects.filter(event=event, approval_status=criteria["status"])
+    if criteria.get("registered_before"):
+        tickets = tickets.filter(purchase_date__lt=criteria["registered_before"])
+    if criteria.get("registered_after"):
+        tickets = tickets.filter(purchase_date__gte=criteria["registered_after"])
+    if criteria.get("role"):
+        tickets = tickets.filter(attendee__role__iexact=criteria["role"])
+    for key in ("faculty", "year"):
+        value = criteria.get(key)
+        if value:
+            tickets = tickets.alias(
+                **{f"about_{key}": AboutMeValue(F("attendee__about_me"), key)}
+            ).filter(**{f"about_{key}__iexact": value})
+    return tickets
+
+
+def criteria_task_key(event_id: int, operation_id: str) -> str:
+    return f"criteria-action:{event_id}:{operation_id}"
+
+
+def run_criteria_action(event_id: int, new_status: str, criteria: dict, reason: str, progress: dict) -> dict:
+    """
+    Apply new_status to every matching ticket in chunks of CRITERIA_CHUNK_SIZE, each in
+    its own transaction, and store the progress on the task row after every chunk so
+    any web process can report it. Tickets already moved no longer match, so a retried
+    run continues where the last one stopped.
+    """
+    event = Event.objects.get(id=event_id)
+    tickets = criteria_queryset(event, criteria)
+    key = criteria_task_key(event_id, progress["operation_id"])
+    # a retry picks up the counts of the failed attempt
+    stored = Task.objects.filter(key=key, status="running").values_list("result", flat=True).first()
+    progress = {**(stored or progress), "state": "running", "error": None}
+
+    while True:
+        with transaction.atomic():
+            # rows another run is already moving are skipped, not waited on
+            chunk = list(
+                tickets.select_for_update(skip_locked=True, of=("self",))
+                .only(*TICKET_ACTION_FIELDS)
+                .order_by("id")[:CRITERIA_CHUNK_SIZE]
+            )
+            if not chunk:
+                break
+            changed = apply_ticket_status(event, chunk, new_status, reason)
+
+        progress["processed"] += len(changed)
+        progress["chunks"] += 1
+        if progress["matched"]:
+            progress["progress"] = round(min(progress["processed"] / progress["matched"], 1) * 100, 1)
+        Task.objects.filter(key=key, status="running").update(result=progress)
+
+    return {**progress, "state": "done", "progress": 100.0}
@@ -0,0 +1,339 @@
+"""
+Bulk event import from iCalendar (.ics) and CSV files.
+
+Files are parsed lazily and written in chunks, each chunk in its own transaction.
+Every record carries a UID (the ICS UID, or the CSV "uid" column), stored on
+Event.import_uid. Importing the same file again updates the matching events
+instead of creating duplicates.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from itertools import islice
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.db import transaction
+from django.utils import timezone
+
+from api.model.event import Event
+from api.model.event_schedule import EventSchedule
+from api.model.event_stats import EventStats
+
+IMPORT_CHUNK_SIZE = 200
+IMPORT_ERROR_LIMIT = 500
+DEFAULT_MAX_ATTENDEE = 100
+
+# fields an import may overwrite on an existing event
+IMPORTED_FIELDS = [
+    "event_title",
+    "event_description",
+    "event_start_date",
+    "event_end_date",
+    "event_address",
+    "is_online",
+    "event_meeting_link",
+    "tags",
+    "schedule",
+]
+
+
+class ImportRecordError(ValueError):
+    pass
+
+
+def _parse_datetime(value: str, tzid: str = None) -> datetime:
+    """ISO 8601 or iCalendar basic format; naive values are in tzid or the site time zone."""
+    value = value.strip()
+    if not value:
+        raise ImportRecordError("Missing date")
+
+    try:
+        if len(value) == 8 and value.isdigit():
+            parsed = datetime.combine(datetime.strptime(value, "%Y%m%d").date(), time())
+        elif "T" in value and "-" not in value:
+            parsed = datetime.strptime(value.rstrip("Z"), "%Y%m%dT%H%M%S")
+            if value.endswith("Z"):
+                parsed = parsed.replace(tzinfo=dt_timezone.utc)
+        else:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ImportRecordError(f"Invalid date '{value}'")
+
+    if timezone.is_naive(parsed):
+        try:
+            zone = ZoneInfo(tzid) if tzid else timezone.get_current_timezone()
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ImportRecordError(f"Unknown time zone '{tzid}'")
+        parsed = parsed.replace(tzinfo=zone)
+    return parsed
+
+
+def _schedule_days(start: datetime, end: datetime, location: str, meeting_link: str) -> list:
+    """
+    One schedule entry per calendar day, in the shape create_event stores.
+    A multi-day record repeats its start and end time on every day it spans.
+    """
+    if end <= start:
+        raise ImportRecordError("End must be after start")
+
+    local_start = timezone.localtime(start)
+    local_end = timezone.localtime(end)
+    end_clock = local_end.time()
+    last_day = local_end.date()
+    if end_clock == time():
+        # all-day events end at midnight of the following day
+        end_clock = time(23, 59, 59)
+        last_day -= timedelta(days=1)
+
+    days = []
+    current = local_start.date()
+    while current <= last_day:
+        day_start = timezone.make_aware(datetime.combine(current, local_start.time()))
+        day_end = timezone.make_aware(datetime.combine(current, end_clock))
+        days.append(
+            {
+                "date": current.isoformat(),
+                "start_time": day_start.strftime("%H:%M"),
+                "end_time": day_end.strftime("%H:%M"),
+                "is_online": bool(meeting_link),
+                "address": location,
+                "meeting_link": meeting_link,
+                "start_iso": day_start.astimezone(dt_timezone.utc).isoformat().replace("+00:00", "Z"),
+                "end_iso": day_end.astimezone(dt_timezone.utc).isoformat().replace("+00:00", "Z"),
+            }
+        )
+        current += timedelta(days=1)
+    return days
+
+
+def _record(uid, title, description, start, end, location, meeting_link, categories):
+    uid = (uid or "").strip()
+    title = (title or "").strip()
+    if not uid:
+        raise ImportRecordError("Missing UID")
+    if not title:
+        raise ImportRecordError("Missing title")
+
+    location = (location or "").strip() or None
+    meeting_link = (meeting_link or "").strip() or None
+    return {
+        "uid": uid[:255],
+        "event_title": title[:200],
+        "event_description": (description or "").strip(),
+        "event_start_date": start,
+        "event_end_date": end,
+        "event_address": None if meeting_link else location,
+        "is_online": bool(meeting_link),
+        "event_meeting_link": meeting_link,
+        "tags": json.dumps([c.strip() for c in categories if c.strip()]),
+        # stored as a JSON string, as create_event does and the event views expect
+        "schedule": json.dumps(_schedule_days(start, end, location, meeting_link)),
+    }
+
+
+def _unescape_ics(value: str) -> str:
+    return (
+        value.replace("\\n", "\n").replace("\\N", "\n").replace("\\,", ",")
+        .replace("\\;", ";").replace("\\\\", "\\")
+    )
+
+
+def _ics_lines(stream):
+    """Unfold iCalendar content lines (continuations start with a space or tab)."""
+    current = None
+    for raw in stream:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+def parse_ics(stream):
+    """Yield (position, record or None, error or None) for every VEVENT."""
+    properties = None
+    position = 0
+    for line in _ics_lines(stream):
+        if line == "BEGIN:VEVENT":
+            properties = {}
+            position += 1
+            continue
+        if properties is None:
+            continue
+        if line == "END:VEVENT":
+            try:
+                if "RRULE" in properties:
+                    raise ImportRecordError("Recurring events (RRULE) are not supported")
+                dtstart, start_params = properties.get("DTSTART", ("", {}))
+                dtend, end_params = properties.get("DTEND", ("", {}))
+                start = _parse_datetime(dtstart, start_params.get("TZID"))
+                if dtend:
+                    end = _parse_datetime(dtend, end_params.get("TZID"))
+                elif start_params.get("VALUE") == "DATE" or len(dtstart) == 8:
+                    # RFC 5545: a date-only DTSTART without DTEND lasts one day
+                    end = start + timedelta(days=1)
+                else:
+                    end = start + timedelta(hours=1)
+                location = properties.get("LOCATION", ("", {}))[0]
+                url = properties.get("URL", ("", {}))[0]
+                yield position, _record(
+                    properties.get("UID", ("", {}))[0],
+                    properties.get("SUMMARY", ("", {}))[0],
+                    properties.get("DESCRIPTION", ("", {}))[0],
+                    start,
+                    end,
+                    location,
+                    url if url and not location else None,
+                    properties.get("CATEGORIES", ("", {}))[0].split(","),
+                ), None
+            except ImportRecordError as e:
+                yield position, None, str(e)
+            properties = None
+            continue
+
+        name_part, _, value = line.partition(":")
+        name, *params = name_part.split(";")
+        properties[name.upper()] = (
+            _unescape_ics(value),
+            dict(param.split("=", 1) for param in params if "=" in param),
+        )
+
+
+def parse_csv(stream):
+    """
+    Yield (row number, record or None, error or None) for every CSV row.
+    Columns: uid, title, start, end, plus optional description, location,
+    meeting_link and category. Dates are ISO 8601.
+    """
+    reader = csv.DictReader(stream)
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+    missing = {"uid", "title", "start", "end"} - set(reader.fieldnames)
+    if missing:
+        raise ValueError(f"CSV is missing columns: {', '.join(sorted(missing))}")
+
+    for row_number, row in enumerate(reader, start=2):
+        try:
+            yield row_number, _record(
+                row["uid"],
+                row["title"],
+                row.get("description"),
+                _parse_datetime(row["start"] or ""),
+                _parse_datetime(row["end"] or ""),
+                row.get("location"),
+                row.get("meeting_link"),
+                (row.get("category") or "").split(","),
+            ), None
+        except ImportRecordError as e:
+            yield row_number, None, str(e)
+
+
+def _schedule_rows(event: Event) -> list:
+    rows = []
+    for day in json.loads(event.schedule):
+        start = datetime.fromisoformat(day["start_iso"].replace("Z", "+00:00"))
+        end = datetime.fromisoformat(day["end_iso"].replace("Z", "+00:00"))
+        rows.append(
+            EventSchedule(
+                event=event,
+                event_date=start.date(),
+                start_time_event=start.time(),
+                end_time_event=end.time(),
+            )
+        )
+    return rows
+
+
+def _import_chunk(organizer, records: list, registration_end: date = None) -> tuple[list, list, int]:
+    """Create or update one chunk of events in one transaction."""
+    with transaction.atomic():
+        existing = {
+            event.import_uid: event
+            for event in Event.objects.select_for_update().filter(
+                organizer=organizer, import_uid__in=[record["uid"] for record in records]
+            )
+        }
+
+        created, updated, unchanged = [], [], 0
+        now = timezone.now()
+        for record in records:
+            uid = record.pop("uid")
+            event = existing.get(uid)
+            if event is None:
+                event = Event(
+                    organizer=organizer,
+                    import_uid=uid,
+                    start_date_register=now,
+                    end_date_register=registration_end or record["event_start_date"],
+                    max_attendee=DEFAULT_MAX_ATTENDEE,
+                    available_spots=DEFAULT_MAX_ATTENDEE,
+                    verification_status="pending",
+                    **record,
+                )
+                created.append(event)
+                existing[uid] = event
+            elif any(getattr(event, field) != value for field, value in record.items()):
+                for field, value in record.items():
+                    setattr(event, field, value)
+                event.event_updated_at = now
+                updated.append(event)
+            else:
+                unchanged += 1
+
+        # bulk_create skips Event.save(), so create the stats rows here as well
+        Event.objects.bulk_create(created)
+        EventStats.objects.bulk_create([EventStats(event=event) for event in created])
+        Event.objects.bulk_update(updated, [*IMPORTED_FIELDS, "event_updated_at"])
+
+        EventSchedule.objects.filter(event__in=updated).delete()
+        EventSchedule.objects.bulk_create(
+            [row for event in created + updated for row in _schedule_rows(event)]
+        )
+
+    return created, updated, unchanged
+
+
+def import_events(organizer, upload, file_format: str, registration_end: date = None) -> dict:
+    """
+    Import an uploaded .ics or .csv file for an organizer and return a summary
+    with counts and the records that could not be imported.
+    """
+    stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    records = parse_ics(stream) if file_format == "ics" else parse_csv(stream)
+
+    summary = {"total": 0, "created": 0, "updated": 0, "unchanged": 0, "failed": 0, "errors": []}
+    seen_uids = set()
+
+    while True:
+        chunk = list(islice(records, IMPORT_CHUNK_SIZE))
+        if not chunk:
+            break
+
+        valid = {}
+        for position, record, error in chunk:
+            summary["total"] += 1
+            if record is not None and record["uid"] in seen_uids:
+                error = "Duplicate UID in file"
+            if error:
+                summary["failed"] += 1
+                if len(summary["errors"]) < IMPORT_ERROR_LIMIT:
+                    summary["errors"].append({"record": position, "error": error})
+                continue
+            seen_uids.add(record["uid"])
+            valid[record["uid"]] = record
+
+        if not valid:
+            continue
+
+        created, updated, unchanged = _import_chunk(organizer, list(valid.values()), registration_end)
+        summary["created"] += len(created)
+        summary["updated"] += len(updated)
+        summary["unchanged"] += unchanged
+
+    return summary
@@ -0,0 +1,249 @@
+import json
+import logging
+import random
+import statistics
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.model.event import Event
+from api.model.event_schedule import EventSchedule
+from api.model.ticket import Ticket
+from api.model.ticket_token import issue_ticket_token
+from api.model.user import AttendeeUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed an event with approved multi-day tickets and drive concurrent simulated "
+        "gates against /api/checkin, reporting latency percentiles, queries per scan "
+        "and error rates. Run it against a local Postgres, never production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tickets", type=int, default=5000, help="Approved tickets to seed")
+        parser.add_argument("--days", type=int, default=3, help="Event days per ticket")
+        parser.add_argument("--gates", type=int, default=8, help="Concurrent simulated gates")
+        parser.add_argument("--scans", type=int, default=5000, help="Total scans across all gates")
+        parser.add_argument("--duplicate-ratio", type=float, default=0.10)
+        parser.add_argument("--wrong-day-ratio", type=float, default=0.05)
+        parser.add_argument("--signed", action="store_true", help="Scan signed QR tokens instead of bare qr codes")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed for a repeatable scan plan")
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded event and users")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        run_id = uuid.uuid4().hex[:8]
+
+        self.stdout.write(f"Seeding {options['tickets']} tickets over {options['days']} days...")
+        organizer, event, days, tickets = self._seed(run_id, options["tickets"], options["days"])
+
+        try:
+            codes = self._ticket_codes(tickets, days, options["signed"])
+            plan = self._build_plan(rng, codes, days, options)
+            self.stdout.write(f"Driving {len(plan)} scans through {options['gates']} gates...")
+
+            # Expected 4xx responses (wrong day) would otherwise flood the output
+            request_logger = logging.getLogger("django.request")
+            previous_level = request_logger.level
+            request_logger.setLevel(logging.ERROR)
+            try:
+                samples, elapsed = self._run(organizer, event, plan, options["gates"])
+            finally:
+                request_logger.setLevel(previous_level)
+
+            report = self._report(samples, elapsed, options)
+        finally:
+            if not options["keep"]:
+                event.delete()
+                AttendeeUser.objects.filter(username__startswith=f"loadtest-{run_id}-").delete()
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            for key, value in report.items():
+                self.stdout.write(f"{key:>22}: {value}")
+
+    def _seed(self, run_id, ticket_count, day_count):
+        now = timezone.now()
+        organizer = AttendeeUser.objects.create_user(
+            email=f"loadtest-{run_id}-organizer@example.com",
+            username=f"loadtest-{run_id}-organizer",
+            password=uuid.uuid4().hex,
+            role="organizer",
+        )
+        event = Event.objects.create(
+            organizer=organizer,
+            event_title=f"Check-in load test {run_id}",
+            event_description="Seeded by checkin_loadtest",
+            start_date_register=now - timedelta(days=7),
+            end_date_register=now,
+            event_start_date=now,
+            event_end_date=now + timedelta(days=day_count),
+            max_attendee=ticket_count,
+            verification_status="approved",
+        )
+
+        days = [timezone.localdate() + timedelta(days=offset) for offset in range(day_count)]
+        EventSchedule.objects.bulk_create(
+            [
+                EventSchedule(
+                    event=event,
+                    event_date=day,
+                    start_time_event=datetime.min.time().replace(hour=9),
+                    end_time_event=datetime.min.time().replace(hour=17),
+                )
+                for day in days
+            ]
+        )
+
+        users = AttendeeUser.objects.bulk_create(
+            [
+                AttendeeUser(
+                    username=f"loadtest-{run_id}-{i}",
+                    email=f"loadtest-{run_id}-{i}@example.com",
+                    password="!",
+                    first_name="Load",
+                    last_name=f"Tester {i}",
+                )
+                for i in range(ticket_count)
+            ],
+            batch_size=1000,
+        )
+
+        event_dates = [{"date": day.isoformat(), "time": "09:00:00", "endTime": "17:00:00"} for day in days]
+        tickets = Ticket.objects.bulk_create(
+            [
+                Ticket(
+                    event=event,
+                    attendee=user,
+                    qr_code=str(uuid.uuid4()),
+                    ticket_number=f"L{run_id}{i}",
+                    user_name=f"{user.first_name} {user.last_name}",
+                    user_email=user.email,
+                    event_title=event.event_title,
+                    start_date=event.event_start_date,
+                    event_dates=event_dates,
+                    approval_status="approved",
+                    approved_at=now,
+                )
+                for i, user in enumerate(users)
+            ],
+            batch_size=1000,
+        )
+        for ticket in tickets:
+            ticket.event = event
+        return organizer, event, days, tickets
+
+    def _ticket_codes(self, tickets, days, signed):
+        if not signed:
+            return [ticket.qr_code for ticket in tickets]
+        valid_days = [day.isoformat() for day in days]
+        return [issue_ticket_token(ticket, valid_days)[0] for ticket in tickets]
+
+    def _build_plan(self, rng, codes, days, options):
+        """Scans as (code, day, expected outcome) with the requested duplicate and wrong-day mix"""
+        wrong_day = (days[-1] + timedelta(days=30)).isoformat()
+        fresh = [(code, day.isoformat()) for code in codes for day in days]
+        rng.shuffle(fresh)
+
+        plan, scanned = [], []
+        for _ in range(options["scans"]):
+            roll = rng.random()
+            if roll < options["wrong_day_ratio"]:
+                plan.append((rng.choice(codes), wrong_day, "wrong_day"))
+            elif (roll < options["wrong_day_ratio"] + options["duplicate_ratio"] and scanned) or not fresh:
+                code, day = rng.choice(scanned)
+                plan.append((code, day, "duplicate"))
+            else:
+                code, day = fresh.pop()
+                scanned.append((code, day))
+                plan.append((code, day, "accepted"))
+        return plan
+
+    def _run(self, organizer, event, plan, gate_count):
+        samples = []
+        lock = threading.Lock()
+        slices = [plan[i::gate_count] for i in range(gate_count)]
+
+        def gate(scans):
+            # exceptions outside the view become 500s instead of stopping the gate
+            client = Client(raise_request_exception=False)
+            client.force_login(organizer)
+            local = []
+            try:
+                for code, day, expected in scans:
+                    body = json.dumps({"qr_code": code, "event_date": day, "event_id": event.id})
+                    with CaptureQueriesContext(connection) as queries:
+                        started = time.perf_counter()
+                        response = client.post("/api/checkin", body, content_type="application/json")
+                        latency = time.perf_counter() - started
+                    local.append(
+                        {
+                            "expected": expected,
+                            "latency": latency,
+                            "queries": len(queries),
+                            "outcome": self._outcome(response),
+                        }
+                    )
+            finally:
+                connection.close()
+                with lock:
+                    samples.extend(local)
+
+        threads = [threading.Thread(target=gate, args=(scans,)) for scans in slices]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return samples, time.perf_counter() - started
+
+    @staticmethod
+    def _outcome(response):
+        if response.status_code >= 500:
+            return "error"
+        if response.status_code >= 400:
+            return "rejected"
+        return "duplicate" if response.json().get("already_checked_in") else "accepted"
+
+    @staticmethod
+    def _report(samples, elapsed, options):
+        latencies = sorted(sample["latency"] * 1000 for sample in samples)
+        percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        outcomes = Counter(sample["outcome"] for sample in samples)
+        wrong_day = [sample for sample in samples if sample["expected"] == "wrong_day"]
+        # gates run concurrently, so a planned duplicate may land first; only refusals count
+        unexpected = sum(
+            1 for s in samples if (s["outcome"] == "rejected") != (s["expected"] == "wrong_day")
+        )
+
+        return {
+            "scans": len(samples),
+            "gates": options["gates"],
+            "signed_tokens": options["signed"],
+            "elapsed_s": round(elapsed, 2),
+            "throughput_scans_s": round(len(samples) / elapsed, 1) if elapsed else 0,
+            "latency_p50_ms": round(percentiles[49], 2),
+            "latency_p95_ms": round(percentiles[94], 2),
+            "latency_p99_ms": round(percentiles[98], 2),
+            "latency_max_ms": round(latencies[-1], 2),
+            "queries_per_scan": round(statistics.mean(s["queries"] for s in samples), 2),
+            "accepted": outcomes["accepted"],
+            "duplicates": outcomes["duplicate"],
+            "rejected": outcomes["rejected"],
+            "wrong_day_rejected": f"{sum(1 for s in wrong_day if s['outcome'] == 'rejected')}/{len(wrong_day)}",
+            "server_errors": outcomes["error"],
+            "error_rate": round(outcomes["error"] / len(samples), 4),
+            # valid scans refused or wrong-day scans let in
+            "unexpected_outcomes": unexpected,
+        }
@@ -0,0 +1,60 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.retention import PRUNE_BATCH_SIZE, prunable_notifications, prune_read_notifications, retention_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete read notifications older than the retention period in batches, "
+        "optionally archiving them first. Runs once, or every --interval seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Keep read notifications this many days (default NOTIFICATION_RETENTION_DAYS)",
+        )
+        parser.add_argument("--batch-size", type=int, default=PRUNE_BATCH_SIZE, help="Rows per DELETE")
+        parser.add_argument(
+            "--archive-dir",
+            default=None,
+            help="Write pruned rows to a .jsonl.gz file here (default NOTIFICATION_ARCHIVE_DIR)",
+        )
+        parser.add_argument("--pause", type=float, default=0.1, help="Seconds to sleep between batches")
+        parser.add_argument("--dry-run", action="store_true", help="Count what would be pruned")
+        parser.add_argument("--interval", type=float, default=None, help="Repeat every this many seconds")
+
+    def handle(self, *args, **options):
+        archive_dir = options["archive_dir"] or settings.NOTIFICATION_ARCHIVE_DIR
+        while True:
+            close_old_connections()
+            started = time.monotonic()
+            cutoff = retention_cutoff(options["days"])
+
+            if options["dry_run"]:
+                count = prunable_notifications(cutoff).count()
+                self.stdout.write(f"Would prune {count} read notifications created before {cutoff:%Y-%m-%d %H:%M}")
+                return
+
+            deleted = prune_read_notifications(
+                cutoff,
+                batch_size=max(1, options["batch_size"]),
+                archive_dir=archive_dir,
+                pause=options["pause"],
+            )
+            if deleted:
+                where = f", archived to {archive_dir}" if archive_dir else ""
+                self.stdout.write(
+                    f"Pruned {deleted} read notifications created before {cutoff:%Y-%m-%d %H:%M}"
+                    f" in {time.monotonic() - started:.1f}s{where}"
+                )
+
+            if options["interval"] is None:
+                return
+            time.sleep(max(options["interval"] - (time.monotonic() - started), 0))
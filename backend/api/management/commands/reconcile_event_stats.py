@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from api.model.event import Event
+from api.model.event_stats import COUNTER_FIELDS, EventStats, count_event_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount EventStats from the ticket table and repair rows that drifted. "
+        "Each batch locks its stats rows, so concurrent registrations and check-ins "
+        "wait for the batch instead of being lost."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Events per batch")
+        parser.add_argument("--event", type=int, action="append", help="Only reconcile this event id")
+        parser.add_argument("--dry-run", action="store_true", help="Report drift without writing")
+
+    def handle(self, *args, **options):
+        events = Event.objects.order_by("id")
+        if options["event"]:
+            events = events.filter(id__in=options["event"])
+        event_ids = list(events.values_list("id", flat=True))
+        batch_size = max(1, options["batch_size"])
+
+        checked = repaired = created = 0
+        for start in range(0, len(event_ids), batch_size):
+            batch = event_ids[start : start + batch_size]
+            with transaction.atomic():
+                stored = {
+                    stats.event_id: stats
+                    for stats in EventStats.objects.select_for_update().filter(event_id__in=batch)
+                }
+                actual = count_event_stats(batch)
+
+                drifted, missing = [], []
+                for event_id in batch:
+                    counts = actual[event_id]
+                    stats = stored.get(event_id)
+                    if stats is None:
+                        missing.append(EventStats(event_id=event_id, **counts))
+                        continue
+                    if stats.as_dict() != counts:
+                        self.stdout.write(f"Event {event_id}: {stats.as_dict()} -> {counts}")
+                        for field, value in counts.items():
+                            setattr(stats, field, value)
+                        stats.updated_at = timezone.now()
+                        drifted.append(stats)
+
+                if not options["dry_run"]:
+                    EventStats.objects.bulk_update(drifted, [*COUNTER_FIELDS, "updated_at"])
+                    EventStats.objects.bulk_create(missing, ignore_conflicts=True)
+
+            checked += len(batch)
+            repaired += len(drifted)
+            created += len(missing)
+
+        verb = "Would repair" if options["dry_run"] else "Repaired"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {checked} events. {verb} {repaired} drifted and {created} missing stats rows."
+            )
+        )
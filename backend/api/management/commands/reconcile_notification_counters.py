@@ -0,0 +1,83 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from api.model.notification_counter import NotificationCounter, count_notifications
+from api.model.user import AttendeeUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount NotificationCounter rows from the Notification table and repair rows "
+        "that drifted (cascade deletes, manual SQL). Each batch locks its counter rows, "
+        "so concurrent dispatches and reads wait for the batch instead of being lost. "
+        "Runs once, or every --interval seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Users per batch")
+        parser.add_argument("--dry-run", action="store_true", help="Report drift without writing")
+        parser.add_argument("--interval", type=float, default=None, help="Repeat every this many seconds")
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            started = time.monotonic()
+            self.reconcile(max(1, options["batch_size"]), options["dry_run"])
+            if options["interval"] is None:
+                return
+            time.sleep(max(options["interval"] - (time.monotonic() - started), 0))
+
+    def reconcile(self, batch_size: int, dry_run: bool):
+        checked = repaired = created = 0
+        last_id = 0
+        while True:
+            batch = list(
+                AttendeeUser.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1]
+
+            with transaction.atomic():
+                stored = {
+                    counter.user_id: counter
+                    for counter in NotificationCounter.objects.select_for_update().filter(user_id__in=batch)
+                }
+                actual = count_notifications(batch)
+
+                drifted, missing = [], []
+                for user_id in batch:
+                    counts = actual[user_id]
+                    counter = stored.get(user_id)
+                    if counter is None:
+                        # no row reads as zero, so only users with notifications need one
+                        if counts["latest_id"]:
+                            missing.append(NotificationCounter(user_id=user_id, **counts))
+                        continue
+                    current = {"unread": counter.unread, "latest_id": counter.latest_id}
+                    if current != counts:
+                        self.stdout.write(f"User {user_id}: {current} -> {counts}")
+                        counter.unread = counts["unread"]
+                        counter.latest_id = counts["latest_id"]
+                        counter.updated_at = timezone.now()
+                        drifted.append(counter)
+
+                if not dry_run:
+                    NotificationCounter.objects.bulk_update(drifted, ["unread", "latest_id", "updated_at"])
+                    NotificationCounter.objects.bulk_create(missing, ignore_conflicts=True)
+
+            checked += len(batch)
+            repaired += len(drifted)
+            created += len(missing)
+
+        verb = "Would repair" if dry_run else "Repaired"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {checked} users. {verb} {repaired} drifted and {created} missing notification counters."
+            )
+        )
@@ -0,0 +1,88 @@
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from api.model.task import claim_tasks, prune_finished_tasks
+from api.tasks import run_task
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background tasks from the Task table. Start more processes (or raise "
+        "--concurrency) to add throughput; tasks are claimed with SKIP LOCKED."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=1, help="Worker threads in this process")
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds to sleep when idle")
+        parser.add_argument("--min-priority", type=int, default=None, help="Only run tasks at or above this priority")
+        parser.add_argument("--once", action="store_true", help="Exit when no task is due")
+        parser.add_argument(
+            "--prune-interval",
+            type=float,
+            default=3600.0,
+            help="Seconds between deletions of old done and failed tasks (0 disables)",
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: self.stopping.set())
+        signal.signal(signal.SIGINT, lambda *_: self.stopping.set())
+
+        name = f"{socket.gethostname()}:{os.getpid()}"
+        threads = [
+            threading.Thread(target=self.work, args=(f"{name}:{i}", options), daemon=True)
+            for i in range(options["concurrency"])
+        ]
+        self.stdout.write(f"Worker {name} started with {len(threads)} thread(s)")
+        for thread in threads:
+            thread.start()
+        next_prune = time.monotonic()
+        while any(thread.is_alive() for thread in threads):
+            if options["prune_interval"] and time.monotonic() >= next_prune and not self.stopping.is_set():
+                self.prune()
+                next_prune = time.monotonic() + options["prune_interval"]
+            # join with a timeout so signals reach the main thread
+            for thread in threads:
+                thread.join(timeout=0.5)
+        connection.close()
+        self.stdout.write(f"Worker {name} stopped")
+
+    def prune(self):
+        close_old_connections()
+        try:
+            deleted = prune_finished_tasks()
+        except Exception as e:
+            self.stderr.write(self.style.ERROR(f"Pruning finished tasks failed: {e}"))
+            return
+        if deleted:
+            self.stdout.write(f"Pruned {deleted} finished tasks")
+
+    def work(self, worker: str, options):
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                tasks = claim_tasks(worker, limit=1, min_priority=options["min_priority"])
+                if not tasks:
+                    if options["once"]:
+                        return
+                    self.stopping.wait(options["interval"])
+                    continue
+
+                task = tasks[0]
+                started = time.monotonic()
+                try:
+                    run_task(task)
+                except Exception as e:
+                    self.stderr.write(
+                        self.style.ERROR(f"Task {task.id} {task.name} failed (attempt {task.attempts}): {e}")
+                    )
+                    continue
+                self.stdout.write(f"Task {task.id} {task.name} done in {time.monotonic() - started:.2f}s")
+        finally:
+            connection.close()
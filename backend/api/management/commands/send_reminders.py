@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.reminders import REMINDER_CHUNK_SIZE, send_due_reminders
+
+
+class Command(BaseCommand):
+    help = "Send 24h and 1h event reminders to approved attendees, once or every --interval seconds."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Run a single tick and exit")
+        parser.add_argument("--interval", type=float, default=60.0, help="Seconds between ticks")
+        parser.add_argument("--chunk-size", type=int, default=REMINDER_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            started = time.monotonic()
+            counts = send_due_reminders(chunk_size=options["chunk_size"])
+            if any(counts.values()):
+                summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+                self.stdout.write(f"Sent {summary} in {time.monotonic() - started:.1f}s")
+
+            if options["once"]:
+                return
+            time.sleep(max(options["interval"] - (time.monotonic() - started), 0))
@@ -0,0 +1,113 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:15
+
+import django.db.models.deletion
+import django.utils.timezone
+from datetime import date, datetime
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def _parse_day(value):
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def _parse_time(value, fallback):
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return fallback
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt)
+    return dt
+
+
+def copy_checked_in_dates(apps, schema_editor):
+    Ticket = apps.get_model("api", "Ticket")
+    CheckIn = apps.get_model("api", "CheckIn")
+
+    batch = []
+    tickets = (
+        Ticket.objects.exclude(checked_in_dates={})
+        .exclude(checked_in_dates=[])
+        .exclude(checked_in_dates__isnull=True)
+        .only("id", "event_id", "checked_in_at", "checked_in_dates")
+    )
+    for ticket in tickets.iterator(chunk_size=1000):
+        fallback = ticket.checked_in_at or timezone.now()
+        raw = ticket.checked_in_dates
+
+        # checked_in_dates is {day: iso time}, older rows hold a bare list of days
+        if isinstance(raw, dict):
+            entries = raw.items()
+        elif isinstance(raw, list):
+            entries = [(value, fallback) for value in raw]
+        else:
+            entries = [(raw, fallback)]
+
+        seen = set()
+        for day_value, time_value in entries:
+            day = _parse_day(day_value)
+            if day is None or day in seen:
+                continue
+            seen.add(day)
+            batch.append(
+                CheckIn(
+                    ticket_id=ticket.id,
+                    event_id=ticket.event_id,
+                    day=day,
+                    scanned_at=_parse_time(time_value, fallback),
+                )
+            )
+
+        if len(batch) >= 1000:
+            CheckIn.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+
+    if batch:
+        CheckIn.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def copy_check_ins_back(apps, schema_editor):
+    Ticket = apps.get_model("api", "Ticket")
+    CheckIn = apps.get_model("api", "CheckIn")
+
+    dates_by_ticket = {}
+    for ticket_id, day, scanned_at in CheckIn.objects.values_list("ticket_id", "day", "scanned_at"):
+        dates_by_ticket.setdefault(ticket_id, {})[day.isoformat()] = scanned_at.isoformat()
+
+    for ticket_id, checked_in_dates in dates_by_ticket.items():
+        Ticket.objects.filter(id=ticket_id).update(checked_in_dates=checked_in_dates)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_merge_20251122_2030'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckIn',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('scanned_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('gate', models.CharField(blank=True, max_length=100, null=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='check_ins', to='api.event')),
+                ('ticket', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='check_ins', to='api.ticket')),
+            ],
+            options={
+                'ordering': ['day', 'scanned_at'],
+                'indexes': [models.Index(fields=['event', 'day'], name='api_checkin_event_i_c8435c_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ticket', 'day'), name='unique_checkin_per_ticket_day')],
+            },
+        ),
+        migrations.RunPython(copy_checked_in_dates, copy_check_ins_back),
+        migrations.RemoveField(
+            model_name='ticket',
+            name='checked_in_dates',
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0023_ticket_tokens'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['event', 'approval_status'], name='api_ticket_event_i_6403be_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:23
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0024_ticket_event_approval_status_index'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['event', 'purchase_date'], name='api_ticket_event_i_fd2732_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('user_name'), name='gin_trgm_ops'), name='ticket_user_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('user_email'), name='gin_trgm_ops'), name='ticket_user_email_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(django.db.models.functions.text.Upper('ticket_number'), name='ticket_number_upper_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def populate_event_stats(apps, schema_editor):
+    Event = apps.get_model("api", "Event")
+    EventStats = apps.get_model("api", "EventStats")
+    Ticket = apps.get_model("api", "Ticket")
+
+    counts = {
+        row.pop("event_id"): row
+        for row in Ticket.objects.values("event_id").annotate(
+            registered=Count("id"),
+            approved=Count("id", filter=Q(approval_status="approved")),
+            pending=Count("id", filter=Q(approval_status="pending")),
+            rejected=Count("id", filter=Q(approval_status="rejected")),
+            checked_in=Count("id", filter=Q(checked_in_at__isnull=False)),
+        )
+    }
+    EventStats.objects.bulk_create(
+        [
+            EventStats(event_id=event_id, **counts.get(event_id, {}))
+            for event_id in Event.objects.values_list("id", flat=True)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0025_ticket_roster_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventStats',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='api.event')),
+                ('registered', models.IntegerField(default=0)),
+                ('approved', models.IntegerField(default=0)),
+                ('pending', models.IntegerField(default=0)),
+                ('rejected', models.IntegerField(default=0)),
+                ('checked_in', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(populate_event_stats, migrations.RunPython.noop),
+    ]
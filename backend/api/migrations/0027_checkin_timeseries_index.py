@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0026_eventstats'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='checkin',
+            name='api_checkin_event_i_c8435c_idx',
+        ),
+        migrations.AddIndex(
+            model_name='checkin',
+            index=models.Index(fields=['event', 'day', 'scanned_at'], name='api_checkin_event_i_afe721_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0027_checkin_timeseries_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['verification_status', 'event_create_date'], name='api_event_verific_b857e6_idx'),
+        ),
+    ]
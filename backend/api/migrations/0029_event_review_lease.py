@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0028_event_verification_queue_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='review_claimed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='claimed_reviews', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='review_lease_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0031_user_email_upper_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='import_uid',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='event',
+            constraint=models.UniqueConstraint(condition=models.Q(('import_uid__isnull', False)), fields=('organizer', 'import_uid'), name='event_unique_import_uid'),
+        ),
+    ]
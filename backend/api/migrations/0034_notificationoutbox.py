@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0033_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('audience', models.CharField(choices=[('user', 'Single user'), ('admins', 'All admins')], default='user', max_length=10)),
+                ('message', models.TextField()),
+                ('notification_type', models.CharField(choices=[('registration', 'Registration Confirmation'), ('approval', 'Ticket Approved'), ('rejection', 'Ticket Rejected'), ('reminder_24h', '24 Hour Reminder'), ('reminder_1h', '1 Hour Reminder'), ('event_reminder', 'Event Reminder'), ('event_update', 'Event Update'), ('check_in', 'Check-in Confirmation'), ('event_pending_approval', 'Event Pending Approval'), ('event_approved', 'Event Approved'), ('event_rejected', 'Event Rejected')], max_length=50)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('related_event', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='api.event')),
+                ('related_ticket', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='api.ticket')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
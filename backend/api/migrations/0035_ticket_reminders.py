@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0034_notificationoutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reminder_type', models.CharField(max_length=50)),
+                ('day', models.DateField()),
+                ('run_id', models.UUIDField()),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='eventschedule',
+            index=models.Index(fields=['event_date', 'start_time_event'], name='api_eventsc_event_d_54a107_idx'),
+        ),
+        migrations.AddField(
+            model_name='ticketreminder',
+            name='ticket',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='api.ticket'),
+        ),
+        migrations.AddIndex(
+            model_name='ticketreminder',
+            index=models.Index(fields=['run_id'], name='api_ticketr_run_id_8d0b63_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='ticketreminder',
+            constraint=models.UniqueConstraint(fields=('ticket', 'reminder_type', 'day'), name='ticket_reminder_once'),
+        ),
+    ]
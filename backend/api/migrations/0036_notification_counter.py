@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+
+
+def populate_notification_counters(apps, schema_editor):
+    Notification = apps.get_model("api", "Notification")
+    NotificationCounter = apps.get_model("api", "NotificationCounter")
+
+    rows = (
+        Notification.objects.order_by()
+        .values("user_id")
+        .annotate(unread=Count("id", filter=Q(is_read=False)), latest_id=Max("id"))
+    )
+    NotificationCounter.objects.bulk_create(
+        [NotificationCounter(**row) for row in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0035_ticket_reminders'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unread', models.IntegerField(default=0)),
+                ('latest_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(populate_notification_counters, migrations.RunPython.noop),
+    ]
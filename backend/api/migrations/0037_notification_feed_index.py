@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0036_notification_counter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at', '-id'], include=('is_read', 'notification_type', 'related_event'), name='notification_feed_idx'),
+        ),
+    ]
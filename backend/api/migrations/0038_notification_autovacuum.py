@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:05
+
+from django.db import migrations
+
+# Vacuum the notification tables after 2% of their rows changed instead of the
+# default 20%, so space freed by retention deletes and the outbox is reused quickly.
+CHURN_TABLES = ("api_notification", "api_notificationoutbox")
+
+
+def set_autovacuum(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table in CHURN_TABLES:
+        schema_editor.execute(
+            f"ALTER TABLE {schema_editor.quote_name(table)} SET ("
+            "autovacuum_vacuum_scale_factor = 0.02, autovacuum_analyze_scale_factor = 0.01)"
+        )
+
+
+def reset_autovacuum(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table in CHURN_TABLES:
+        schema_editor.execute(
+            f"ALTER TABLE {schema_editor.quote_name(table)} RESET ("
+            "autovacuum_vacuum_scale_factor, autovacuum_analyze_scale_factor)"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0037_notification_feed_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(set_autovacuum, reset_autovacuum),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0038_notification_autovacuum'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'finished_at'], name='api_task_status_3599ab_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:18
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def drop_duplicate_task_keys(apps, schema_editor):
+    """Keep the oldest queued and running task of each key; the extra copies are the same work"""
+    Task = apps.get_model("api", "Task")
+    for status in ("queued", "running"):
+        duplicated = (
+            Task.objects.filter(status=status)
+            .exclude(key="")
+            .order_by()
+            .values("key")
+            .annotate(n=Count("id"))
+            .filter(n__gt=1)
+            .values_list("key", flat=True)
+        )
+        for key in duplicated:
+            first = Task.objects.filter(key=key, status=status).order_by("id").first()
+            Task.objects.filter(key=key, status=status).exclude(id=first.id).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0039_task_finished_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_task_keys, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'queued'), models.Q(('key', ''), _negated=True)), fields=('key',), name='unique_queued_task_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'running'), models.Q(('key', ''), _negated=True)), fields=('key',), name='unique_running_task_key'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:20
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_revoked_at(apps, schema_editor):
+    # rejection was the only removal gate deltas knew about so far
+    Ticket = apps.get_model("api", "Ticket")
+    Ticket.objects.filter(approval_status="rejected", rejected_at__isnull=False).update(revoked_at=F("rejected_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0040_task_key_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='tickets_deleted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='revoked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_revoked_at, migrations.RunPython.noop),
+    ]
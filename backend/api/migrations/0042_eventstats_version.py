@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0041_ticket_revoked_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventstats',
+            name='version',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0042_eventstats_version'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='event',
+            name='api_event_verific_b857e6_idx',
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('verification_status__in', ['approved', 'rejected']), _negated=True), fields=['event_create_date', 'id'], name='event_pending_review_idx'),
+        ),
+    ]
@@ -8,4 +8,11 @@ from .rating import Rating
 from .comment import Comment
 from .event_feedback import EventFeedback
 from .event_schedule import EventSchedule
-from .notification import Notification
\ No newline at end of file
+from .notification import Notification, NotificationOutbox
+from .check_in import CheckIn
+from .ticket_token import EventSigningKey, RevokedTicketToken
+from .event_stats import EventStats
+from .export_job import ExportJob
+from .task import Task
+from .ticket_reminder import TicketReminder
+from .notification_counter import NotificationCounter
@@ -0,0 +1,99 @@
+from django.core.cache import cache
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+from api.pubsub import publish_event_counters
+from .event import Event
+from .event_stats import update_event_stats
+from .ticket import Ticket
+
+TIMESERIES_BUCKETS = (1, 5, 10, 15, 30, 60)  # minutes
+
+# append-only ledger of per-day attendance, one row per ticket per event day
+class CheckIn(models.Model):
+    ticket = models.ForeignKey(Ticket, on_delete=models.CASCADE, related_name="check_ins")
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="check_ins")
+    day = models.DateField()
+    scanned_at = models.DateTimeField(default=timezone.now)
+    gate = models.CharField(max_length=100, blank=True, null=True)
+
+    class Meta:
+        ordering = ["day", "scanned_at"]
+        indexes = [
+            # covers the per-day arrival time series without touching the table
+            models.Index(fields=["event", "day", "scanned_at"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["ticket", "day"], name="unique_checkin_per_ticket_day"),
+        ]
+
+    def __str__(self):
+        return f"CheckIn(ticket={self.ticket_id}, day={self.day})"
+
+
+def record_check_in(ticket: Ticket, day, scanned_at=None, gate=None):
+    """
+    Record a check-in for one ticket and day.
+    Returns (check_in, created); created is False when the day was already recorded.
+    """
+    scanned_at = scanned_at or timezone.now()
+    # the check-in row and the stats version commit together, so a dashboard
+    # snapshot either counts both or neither
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                check_in = CheckIn.objects.create(
+                    ticket=ticket,
+                    event_id=ticket.event_id,
+                    day=day,
+                    scanned_at=scanned_at,
+                    gate=gate,
+                )
+        except IntegrityError:
+            existing = CheckIn.objects.filter(ticket=ticket, day=day).first()
+            if existing is None:
+                # not a repeat scan: the ticket row is gone
+                raise
+            return existing, False
+
+        first_check_in = Ticket.objects.filter(id=ticket.id, checked_in_at__isnull=True).update(
+            checked_in_at=scanned_at, status="present"
+        )
+        if not first_check_in:
+            Ticket.objects.filter(id=ticket.id).update(checked_in_at=scanned_at, status="present")
+        version = update_event_stats(ticket.event_id, {"checked_in": first_check_in})
+    ticket.checked_in_at = scanned_at
+    ticket.status = "present"
+
+    invalidate_attendance_timeseries(ticket.event_id, [check_in.day])
+    publish_event_counters(
+        ticket.event_id,
+        totals={"checked_in": first_check_in},
+        days={check_in.day.isoformat(): {"checked_in": 1}},
+        version=version,
+    )
+    return check_in, True
+
+
+def checked_in_dates_by_ticket(check_ins) -> dict:
+    """
+    Map ticket id -> {YYYY-MM-DD: ISO scan time} for a CheckIn queryset in one query
+    """
+    result: dict = {}
+    for ticket_id, day, scanned_at in check_ins.values_list("ticket_id", "day", "scanned_at"):
+        result.setdefault(ticket_id, {})[day.isoformat()] = scanned_at.isoformat()
+    return result
+
+
+def attendance_timeseries_cache_key(event_id: int, day, bucket: int) -> str:
+    return f"attendance-timeseries:{event_id}:{day}:{bucket}"
+
+
+def invalidate_attendance_timeseries(event_id: int, days):
+    """Drop cached arrival charts, e.g. when a gate uploads scans for a finished day"""
+    cache.delete_many(
+        [
+            attendance_timeseries_cache_key(event_id, day, bucket)
+            for day in set(days)
+            for bucket in TIMESERIES_BUCKETS
+        ]
+    )
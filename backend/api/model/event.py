@@ -2,6 +2,10 @@ from django.db import models
 from .socials import Social
 from .user import AttendeeUser
 
+# Anything not yet decided (including legacy NULL statuses) counts as pending
+DECIDED_STATUSES = ["approved", "rejected"]
+
+
 class Event(models.Model):
     schedule = models.JSONField(default=list, blank=True)
     organizer = models.ForeignKey(AttendeeUser, on_delete=models.CASCADE, related_name="events")
@@ -30,6 +34,15 @@ class Event(models.Model):
     terms_and_conditions = models.TextField(blank=True, null=True)
     event_updated_at = models.DateTimeField(auto_now=True)
     attendee = models.JSONField(default=list, blank=True)
+    # moderation lease: the admin currently reviewing this event and until when
+    review_claimed_by = models.ForeignKey(
+        AttendeeUser, on_delete=models.SET_NULL, null=True, blank=True, related_name="claimed_reviews"
+    )
+    review_lease_expires_at = models.DateTimeField(blank=True, null=True)
+    # UID of the ICS/CSV record this event was imported from; re-imports update it
+    import_uid = models.CharField(max_length=255, blank=True, null=True)
+    # last time one of its tickets was deleted; older gate manifests must be fetched in full
+    tickets_deleted_at = models.DateTimeField(blank=True, null=True)
 
     def save(self, *args, **kwargs):
         """
@@ -43,22 +56,24 @@ class Event(models.Model):
                 self.available_spots = 100  # Default fallback
         
         # ✅ FIX: Ensure verification_status is never None for new events
-        if self.pk is None and not self.verification_status:
+        is_new = self.pk is None
+        if is_new and not self.verification_status:
             # New event - set to pending
             self.verification_status = "pending"
         
         super().save(*args, **kwargs)
+
+        if is_new:
+            from .event_stats import EventStats
+            EventStats.objects.get_or_create(event=self)
     
     def get_current_capacity(self):
         """
         Calculate real-time capacity based on approved tickets
         Returns: (registered_count, available_spots, max_attendee)
         """
-        from .ticket import Ticket
-        registered = Ticket.objects.filter(
-            event=self,
-            approval_status='approved'
-        ).count()
+        from .event_stats import get_event_stats
+        registered = get_event_stats(self).approved
         
         available = self.max_attendee - registered if self.max_attendee else 0
         
@@ -68,4 +83,19 @@ class Event(models.Model):
         return self.event_title
     
     class Meta:
-        ordering = ['-event_create_date']
\ No newline at end of file
+        ordering = ['-event_create_date']
+        indexes = [
+            # admin verification queue: undecided events paged by (event_create_date, id)
+            models.Index(
+                fields=['event_create_date', 'id'],
+                condition=~models.Q(verification_status__in=DECIDED_STATUSES),
+                name='event_pending_review_idx',
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['organizer', 'import_uid'],
+                condition=models.Q(import_uid__isnull=False),
+                name='event_unique_import_uid',
+            ),
+        ]
\ No newline at end of file
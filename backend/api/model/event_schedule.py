@@ -10,5 +10,11 @@ class EventSchedule(models.Model):
     start_time_event = models.TimeField()
     end_time_event = models.TimeField()
 
+    class Meta:
+        indexes = [
+            # reminder scheduler: occurrences starting within the next day
+            models.Index(fields=["event_date", "start_time_event"]),
+        ]
+
     def __str__(self):
         return f"{self.event.event_title} on {self.event_date}"
@@ -0,0 +1,107 @@
+from django.db import models, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from api.pubsub import publish_event_counters, ticket_transition_deltas
+from .event import Event
+from .ticket import Ticket
+
+COUNTER_FIELDS = ("registered", "approved", "pending", "rejected", "checked_in")
+
+
+# registration and attendance counters of one event, kept current by every ticket transition
+class EventStats(models.Model):
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    registered = models.IntegerField(default=0)
+    approved = models.IntegerField(default=0)
+    pending = models.IntegerField(default=0)
+    rejected = models.IntegerField(default=0)
+    checked_in = models.IntegerField(default=0)
+    # bumped with every published counter change, so live dashboards can tell
+    # which deltas their snapshot already includes
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats for event {self.event_id}"
+
+    def as_dict(self) -> dict:
+        return {field: getattr(self, field) for field in COUNTER_FIELDS}
+
+
+def count_event_stats(event_ids) -> dict:
+    """
+    Recount the counters of the given events from the ticket table in one query.
+    Returns event id -> {counter: value}; events without tickets map to zeros.
+    """
+    counts = {event_id: dict.fromkeys(COUNTER_FIELDS, 0) for event_id in event_ids}
+    rows = (
+        Ticket.objects.filter(event_id__in=counts.keys())
+        .values("event_id")
+        .annotate(
+            registered=Count("id"),
+            approved=Count("id", filter=Q(approval_status="approved")),
+            pending=Count("id", filter=Q(approval_status="pending")),
+            rejected=Count("id", filter=Q(approval_status="rejected")),
+            checked_in=Count("id", filter=Q(checked_in_at__isnull=False)),
+        )
+    )
+    for row in rows:
+        counts[row.pop("event_id")] = row
+    return counts
+
+
+def refresh_event_stats(event_id: int) -> EventStats:
+    """Rebuild the stats row of one event from its tickets"""
+    stats = EventStats(event_id=event_id, **count_event_stats([event_id])[event_id])
+    EventStats.objects.bulk_create(
+        [stats],
+        update_conflicts=True,
+        unique_fields=["event"],
+        update_fields=[*COUNTER_FIELDS, "updated_at"],
+    )
+    return stats
+
+
+def get_event_stats(event: Event) -> EventStats:
+    """Counters of an event, rebuilt on the spot if its row is missing"""
+    try:
+        return event.stats
+    except EventStats.DoesNotExist:
+        return refresh_event_stats(event.id)
+
+
+def update_event_stats(event_id: int, deltas: dict) -> int:
+    """
+    Apply counter deltas such as {"approved": 1, "pending": -1} atomically in SQL
+    and bump the version. Call it after the ticket change is written, inside the
+    same transaction, so the version commits together with the change it counts.
+    Returns the new version to publish with the deltas.
+    """
+    deltas = {field: value for field, value in deltas.items() if field in COUNTER_FIELDS and value}
+    stats = EventStats.objects.filter(event_id=event_id)
+
+    with transaction.atomic():
+        updated = stats.update(
+            updated_at=timezone.now(),
+            version=F("version") + 1,
+            **{field: F(field) + value for field, value in deltas.items()},
+        )
+        if not updated:
+            # No row yet: the recount already includes the change being recorded
+            refresh_event_stats(event_id)
+            stats.update(version=F("version") + 1)
+        # the row stays locked by the update above until commit, so this is our version
+        return stats.values_list("version", flat=True).get()
+
+
+def record_ticket_transitions(event_id: int, transitions):
+    """
+    Apply approval status changes to EventStats and push them to live dashboards.
+    transitions is an iterable of (old_status, new_status, valid_days); use None
+    as old_status for a new registration.
+    """
+    totals, days = ticket_transition_deltas(transitions)
+    if not any(totals.values()) and not days:
+        return
+    version = update_event_stats(event_id, totals)
+    publish_event_counters(event_id, totals, days, version=version)
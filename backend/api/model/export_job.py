@@ -0,0 +1,105 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.db import models
+from django.utils import timezone
+from .user import AttendeeUser
+
+EXPORT_FORMATS = ("csv", "xlsx", "jsonl", "parquet")
+ARTIFACT_REUSE_WINDOW = timedelta(hours=6)
+
+# column name -> (ORM path on Ticket, type used by typed formats such as Parquet)
+EXPORT_COLUMNS = {
+    "event_id": ("event_id", "int"),
+    "event_title": ("event__event_title", "str"),
+    "event_start_date": ("event__event_start_date", "datetime"),
+    "organizer_username": ("event__organizer__username", "str"),
+    "ticket_number": ("ticket_number", "str"),
+    "approval_status": ("approval_status", "str"),
+    "purchase_date": ("purchase_date", "datetime"),
+    "approved_at": ("approved_at", "datetime"),
+    "rejected_at": ("rejected_at", "datetime"),
+    "checked_in_at": ("checked_in_at", "datetime"),
+    "attendee_username": ("attendee__username", "str"),
+    "attendee_first_name": ("attendee__first_name", "str"),
+    "attendee_last_name": ("attendee__last_name", "str"),
+    "attendee_email": ("attendee__email", "str"),
+    "attendee_role": ("attendee__role", "str"),
+}
+
+
+# a registration export built in the background and kept under MEDIA_ROOT/exports
+class ExportJob(models.Model):
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    requested_by = models.ForeignKey(AttendeeUser, on_delete=models.CASCADE, related_name="export_jobs")
+    spec = models.JSONField(default=dict)
+    spec_hash = models.CharField(max_length=64)
+    format = models.CharField(max_length=10)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="queued")
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    rows_written = models.PositiveIntegerField(default=0)
+    file = models.FileField(upload_to="exports/", blank=True)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["spec_hash", "status"]),
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"ExportJob {self.id} ({self.format}, {self.status})"
+
+
+def hash_export_spec(spec: dict) -> str:
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
+
+def submit_export_job(user: AttendeeUser, spec: dict, refresh: bool = False) -> ExportJob:
+    """
+    Queue an export, or hand back an identical one.
+    A queued/running job with the same spec is returned as is; a finished artifact
+    younger than ARTIFACT_REUSE_WINDOW is shared through a new, already done job.
+    """
+    spec_hash = hash_export_spec(spec)
+    same_spec = ExportJob.objects.filter(spec_hash=spec_hash)
+
+    if not refresh:
+        in_progress = same_spec.filter(requested_by=user, status__in=["queued", "running"]).first()
+        if in_progress:
+            return in_progress
+
+        cached = (
+            same_spec.filter(status="done", finished_at__gte=timezone.now() - ARTIFACT_REUSE_WINDOW)
+            .order_by("-finished_at")
+            .first()
+        )
+        if cached and cached.file and cached.file.storage.exists(cached.file.name):
+            return ExportJob.objects.create(
+                requested_by=user,
+                spec=spec,
+                spec_hash=spec_hash,
+                format=cached.format,
+                status="done",
+                total_rows=cached.total_rows,
+                rows_written=cached.rows_written,
+                file=cached.file.name,
+                started_at=cached.started_at,
+                finished_at=cached.finished_at,
+            )
+
+    return ExportJob.objects.create(
+        requested_by=user, spec=spec, spec_hash=spec_hash, format=spec["format"]
+    )
+
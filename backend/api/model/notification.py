@@ -1,7 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from .user import AttendeeUser  
 from .ticket import Ticket
 from .event import Event
+from api.pubsub import publish_unread_change
 from typing import Optional
 
 class Notification(models.Model):
@@ -49,15 +50,106 @@ class Notification(models.Model):
         indexes = [
             models.Index(fields=['user', 'is_read']),
             models.Index(fields=['created_at']),
+            # the notification feed: one range scan per page, filters checked in the index
+            models.Index(
+                fields=['user', '-created_at', '-id'],
+                include=['is_read', 'notification_type', 'related_event'],
+                name='notification_feed_idx',
+            ),
         ]
 
     def __str__(self):
         return f"{self.user.username} - {self.notification_type} - {self.created_at}"
 
-    def mark_as_read(self):
-        """Mark notification as read"""
+    def mark_as_read(self) -> bool:
+        """Mark notification as read; returns False if it already was"""
+        from .notification_counter import adjust_unread_count
+
+        with transaction.atomic():
+            changed = Notification.objects.filter(id=self.id, is_read=False).update(is_read=True)
+            if changed:
+                adjust_unread_count(self.user_id, -1)
         self.is_read = True
-        self.save()
+        return bool(changed)
+
+
+# notifications waiting to be written to the Notification table. Rows are added in the
+# caller's transaction and turned into Notifications in batches by the worker.
+class NotificationOutbox(models.Model):
+    AUDIENCE_CHOICES = [
+        ('user', 'Single user'),
+        ('admins', 'All admins'),
+    ]
+
+    user = models.ForeignKey(AttendeeUser, on_delete=models.CASCADE, null=True, blank=True)
+    audience = models.CharField(max_length=10, choices=AUDIENCE_CHOICES, default='user')
+    message = models.TextField()
+    notification_type = models.CharField(max_length=50, choices=Notification.NOTIFICATION_TYPES)
+    related_ticket = models.ForeignKey(Ticket, on_delete=models.CASCADE, null=True, blank=True)
+    related_event = models.ForeignKey(Event, on_delete=models.CASCADE, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Outbox {self.id} - {self.notification_type} -> {self.audience}"
+
+
+def queue_notifications(entries):
+    """Write outbox rows in one INSERT and make sure a dispatcher will pick them up."""
+    from api.tasks import dispatch_notifications
+
+    entries = NotificationOutbox.objects.bulk_create(entries, batch_size=1000)
+    if entries:
+        dispatch_notifications.delay(_key='notification-outbox', _coalesce_running=False)
+    return entries
+
+
+def dispatch_notification_outbox(batch_size: int = 1000) -> int:
+    """
+    Move up to batch_size outbox rows into Notification with one bulk INSERT and
+    return how many notifications were written. Concurrent dispatchers skip each
+    other's rows.
+    """
+    from .notification_counter import record_new_notifications
+
+    with transaction.atomic():
+        entries = list(
+            NotificationOutbox.objects.select_for_update(skip_locked=True).order_by('id')[:batch_size]
+        )
+        if not entries:
+            return 0
+
+        admin_ids = []
+        if any(entry.audience == 'admins' for entry in entries):
+            admin_ids = list(AttendeeUser.objects.filter(role='admin').values_list('id', flat=True))
+
+        notifications = []
+        for entry in entries:
+            recipients = admin_ids if entry.audience == 'admins' else [entry.user_id]
+            notifications.extend(
+                Notification(
+                    user_id=user_id,
+                    message=entry.message,
+                    notification_type=entry.notification_type,
+                    related_ticket_id=entry.related_ticket_id,
+                    related_event_id=entry.related_event_id,
+                )
+                for user_id in recipients
+                if user_id
+            )
+
+        Notification.objects.bulk_create(notifications, batch_size=1000)
+        NotificationOutbox.objects.filter(id__in=[entry.id for entry in entries]).delete()
+
+        per_user = {}
+        for notification in notifications:
+            count, latest = per_user.get(notification.user_id, (0, 0))
+            per_user[notification.user_id] = (count + 1, max(latest, notification.id or 0))
+        record_new_notifications(per_user)
+
+        # wake the recipients' open streams once the batch commits
+        for user_id, (count, latest) in per_user.items():
+            publish_unread_change(user_id, delta=count, latest_id=latest or None)
+    return len(notifications)
 
 
 def create_notification(
@@ -66,16 +158,38 @@ def create_notification(
     notification_type: str,
     related_ticket: Optional[Ticket] = None,
     related_event: Optional[Event] = None
-) -> Notification:
-    """Create a notification for a user"""
-    notification = Notification.objects.create(
-        user=user,
-        message=message,
-        notification_type=notification_type,
-        related_ticket=related_ticket,
-        related_event=related_event
+) -> NotificationOutbox:
+    """Queue a notification for a user; it is delivered by the outbox dispatcher"""
+    [entry] = queue_notifications(
+        [
+            NotificationOutbox(
+                user=user,
+                message=message,
+                notification_type=notification_type,
+                related_ticket=related_ticket,
+                related_event=related_event
+            )
+        ]
+    )
+    return entry
+
+def create_admin_notification(
+    message: str,
+    notification_type: str,
+    related_event: Optional[Event] = None
+) -> NotificationOutbox:
+    """Queue one notification for every admin as a single outbox row"""
+    [entry] = queue_notifications(
+        [
+            NotificationOutbox(
+                audience='admins',
+                message=message,
+                notification_type=notification_type,
+                related_event=related_event
+            )
+        ]
     )
-    return notification
+    return entry
 
 def send_registration_notification(ticket: Ticket):
     """Send notification when user registers for an event"""
@@ -88,6 +202,21 @@ def send_registration_notification(ticket: Ticket):
         related_event=ticket.event
     )
 
+def send_registration_notifications(tickets):
+    """Bulk version of send_registration_notification, one INSERT for all tickets"""
+    queue_notifications(
+        [
+            NotificationOutbox(
+                user_id=ticket.attendee_id,
+                message=f"Successfully registered for '{ticket.event.event_title}'. Your ticket is pending approval.",
+                notification_type='registration',
+                related_ticket=ticket,
+                related_event=ticket.event
+            )
+            for ticket in tickets
+        ]
+    )
+
 def send_approval_notification(ticket: Ticket):
     """Send notification when ticket is approved"""
     message = f"Great news! Your ticket for '{ticket.event.event_title}' has been approved."
@@ -99,6 +228,21 @@ def send_approval_notification(ticket: Ticket):
         related_event=ticket.event
     )
 
+def send_approval_notifications(tickets):
+    """Bulk version of send_approval_notification, one INSERT for all tickets"""
+    queue_notifications(
+        [
+            NotificationOutbox(
+                user_id=ticket.attendee_id,
+                message=f"Great news! Your ticket for '{ticket.event.event_title}' has been approved.",
+                notification_type='approval',
+                related_ticket=ticket,
+                related_event=ticket.event
+            )
+            for ticket in tickets
+        ]
+    )
+
 def send_rejection_notification(ticket: Ticket, reason: str = ""):
     """Send notification when ticket is rejected"""
     message = f"Your ticket for '{ticket.event.event_title}' was not approved."
@@ -112,10 +256,24 @@ def send_rejection_notification(ticket: Ticket, reason: str = ""):
         related_event=ticket.event
     )
 
-def send_reminder_notification(ticket: Ticket, hours_until: float):
-    """Send reminder notification before event starts"""
-    event = ticket.event
-    
+def send_rejection_notifications(tickets, reason: str = ""):
+    """Bulk version of send_rejection_notification, one INSERT for all tickets"""
+    suffix = f" Reason: {reason}" if reason else ""
+    queue_notifications(
+        [
+            NotificationOutbox(
+                user_id=ticket.attendee_id,
+                message=f"Your ticket for '{ticket.event.event_title}' was not approved.{suffix}",
+                notification_type='rejection',
+                related_ticket=ticket,
+                related_event=ticket.event
+            )
+            for ticket in tickets
+        ]
+    )
+
+def reminder_message(event: Event, hours_until: float) -> tuple[str, str]:
+    """(notification type, message) for a reminder sent hours_until before the start"""
     # Format the time message based on hours
     if hours_until < 1:
         time_msg = f"{int(hours_until * 60)} minutes"
@@ -134,8 +292,13 @@ def send_reminder_notification(ticket: Ticket, hours_until: float):
         time_msg = f"{days} days"
         notif_type = 'reminder_24h'
     
-    message = f"Reminder: '{event.event_title}' starts in {time_msg}!"
-    
+    return notif_type, f"Reminder: '{event.event_title}' starts in {time_msg}!"
+
+def send_reminder_notification(ticket: Ticket, hours_until: float):
+    """Send reminder notification before event starts"""
+    event = ticket.event
+    notif_type, message = reminder_message(event, hours_until)
+
     create_notification(
         user=ticket.attendee,
         message=message,
@@ -144,6 +307,22 @@ def send_reminder_notification(ticket: Ticket, hours_until: float):
         related_event=event
     )
 
+def send_reminder_notifications(tickets, event: Event, hours_until: float, notification_type: str):
+    """Bulk version of send_reminder_notification for tickets of one event"""
+    _, message = reminder_message(event, hours_until)
+    queue_notifications(
+        [
+            NotificationOutbox(
+                user_id=ticket.attendee_id,
+                message=message,
+                notification_type=notification_type,
+                related_ticket=ticket,
+                related_event=event
+            )
+            for ticket in tickets
+        ]
+    )
+
 def send_checkin_notification(ticket: Ticket):
     """Send notification when user is checked in"""
     message = f"You've been checked in to '{ticket.event.event_title}'. Enjoy the event!"
@@ -159,51 +338,74 @@ def send_event_creation_notification_to_admins(event):
     """
     Send notification to all admins when a new event is created
     """
-    from api.model.user import AttendeeUser
-    
-    # Get all admin users
-    admins = AttendeeUser.objects.filter(role='admin')
-    
-    for admin in admins:
-        try:
-            notification = Notification.objects.create(
-                user=admin,
-                message=f"New event '{event.event_title}' created by {event.organizer.username} requires approval.",
-                notification_type='event_pending_approval',
-                related_event=event
-            )
-            print(f"✅ Admin notification sent to {admin.username} for event {event.id}")
-        except Exception as e:
-            print(f"❌ Failed to send admin notification to {admin.username}: {e}")
+    create_admin_notification(
+        message=f"New event '{event.event_title}' created by {event.organizer.username} requires approval.",
+        notification_type='event_pending_approval',
+        related_event=event
+    )
+
+
+def send_event_import_notification_to_admins(organizer, created_count: int, updated_count: int):
+    """One notification per admin for a whole event import, instead of one per event"""
+    if not created_count and not updated_count:
+        return
+    create_admin_notification(
+        message=(
+            f"{organizer.username} imported {created_count} new event(s) requiring approval"
+            f" and updated {updated_count} existing event(s)."
+        ),
+        notification_type='event_pending_approval'
+    )
 
 
 def send_event_approval_notification(event):
     """
     Send notification to organizer when their event is approved
     """
-    try:
-        notification = Notification.objects.create(
-            user=event.organizer,
-            message=f"Great news! Your event '{event.event_title}' has been approved and is now live.",
-            notification_type='event_approved',
-            related_event=event
-        )
-        print(f"✅ Event approval notification sent to {event.organizer.username}")
-    except Exception as e:
-        print(f"❌ Failed to send event approval notification: {e}")
+    create_notification(
+        user=event.organizer,
+        message=f"Great news! Your event '{event.event_title}' has been approved and is now live.",
+        notification_type='event_approved',
+        related_event=event
+    )
 
 
 def send_event_rejection_notification(event):
     """
     Send notification to organizer when their event is rejected
     """
-    try:
-        notification = Notification.objects.create(
-            user=event.organizer,
-            message=f"Your event '{event.event_title}' was not approved. Please contact support for more information.",
-            notification_type='event_rejected',
-            related_event=event
-        )
-        print(f"✅ Event rejection notification sent to {event.organizer.username}")
-    except Exception as e:
-        print(f"❌ Failed to send event rejection notification: {e}")
\ No newline at end of file
+    create_notification(
+        user=event.organizer,
+        message=f"Your event '{event.event_title}' was not approved. Please contact support for more information.",
+        notification_type='event_rejected',
+        related_event=event
+    )
+
+def send_event_approval_notifications(events):
+    """Bulk version of send_event_approval_notification, one INSERT for all events"""
+    queue_notifications(
+        [
+            NotificationOutbox(
+                user_id=event.organizer_id,
+                message=f"Great news! Your event '{event.event_title}' has been approved and is now live.",
+                notification_type='event_approved',
+                related_event=event
+            )
+            for event in events
+        ]
+    )
+
+
+def send_event_rejection_notifications(events):
+    """Bulk version of send_event_rejection_notification, one INSERT for all events"""
+    queue_notifications(
+        [
+            NotificationOutbox(
+                user_id=event.organizer_id,
+                message=f"Your event '{event.event_title}' was not approved. Please contact support for more information.",
+                notification_type='event_rejected',
+                related_event=event
+            )
+            for event in events
+        ]
+    )
@@ -0,0 +1,109 @@
+from django.db import models
+from django.db.models import BigIntegerField, Case, Count, F, IntegerField, Max, Q, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .notification import Notification
+from .user import AttendeeUser
+
+# unread notifications of one user, kept current by every create, read and delete
+# so the bell never has to count. A missing row means the user has no notifications.
+class NotificationCounter(models.Model):
+    user = models.OneToOneField(
+        AttendeeUser,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="notification_counter",
+    )
+    unread = models.IntegerField(default=0)
+    latest_id = models.BigIntegerField(default=0)  # newest notification, the cursor of streams and polls
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Notification counter of user {self.user_id}: {self.unread} unread"
+
+
+def count_notifications(user_ids) -> dict:
+    """Recount {"unread", "latest_id"} for each user from the Notification table."""
+    counts = {user_id: {"unread": 0, "latest_id": 0} for user_id in user_ids}
+    rows = (
+        Notification.objects.filter(user_id__in=counts)
+        .order_by()
+        .values("user_id")
+        .annotate(unread=Count("id", filter=Q(is_read=False)), latest_id=Max("id"))
+    )
+    for row in rows:
+        counts[row.pop("user_id")] = row
+    return counts
+
+
+def get_unread_snapshot(user_id: int) -> dict:
+    """
+    {"unread_count", "latest_id"} of one user from the counter row, a primary-key
+    read, recounting only when the row does not exist yet.
+    """
+    row = NotificationCounter.objects.filter(user_id=user_id).values("unread", "latest_id").first()
+    if row is None:
+        row = count_notifications([user_id])[user_id]
+        if row["latest_id"]:
+            NotificationCounter.objects.bulk_create(
+                [NotificationCounter(user_id=user_id, **row)], ignore_conflicts=True
+            )
+
+    return {"unread_count": max(row["unread"], 0), "latest_id": row["latest_id"]}
+
+
+def record_new_notifications(per_user: dict):
+    """
+    Add notifications written in the current transaction to their recipients'
+    counters in one UPDATE. per_user maps user_id -> (count, newest notification id).
+    """
+    if not per_user:
+        return
+    user_ids = sorted(per_user)
+    NotificationCounter.objects.bulk_create(
+        [NotificationCounter(user_id=user_id) for user_id in user_ids], ignore_conflicts=True
+    )
+    # lock in a fixed order so dispatchers fanning out to the same admins cannot deadlock
+    list(
+        NotificationCounter.objects.select_for_update()
+        .filter(user_id__in=user_ids)
+        .order_by("user_id")
+        .values_list("user_id", flat=True)
+    )
+    NotificationCounter.objects.filter(user_id__in=user_ids).update(
+        unread=F("unread")
+        + Case(
+            *[When(user_id=user_id, then=Value(count)) for user_id, (count, _) in per_user.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        ),
+        latest_id=Greatest(
+            "latest_id",
+            Case(
+                *[When(user_id=user_id, then=Value(latest)) for user_id, (_, latest) in per_user.items()],
+                default=Value(0),
+                output_field=BigIntegerField(),
+            ),
+        ),
+        updated_at=timezone.now(),
+    )
+
+
+def adjust_unread_count(user_id: int, delta: int):
+    """Apply a change to one user's unread count, e.g. -1 when a notification is read."""
+    NotificationCounter.objects.filter(user_id=user_id).update(
+        unread=Greatest(F("unread") + delta, 0), updated_at=timezone.now()
+    )
+
+
+def lock_unread_count(user_id: int):
+    """
+    Hold the counter row until the transaction ends. Take it before marking or deleting
+    all of a user's notifications so a dispatcher adding to the count waits for us.
+    """
+    list(NotificationCounter.objects.select_for_update().filter(user_id=user_id).values_list("user_id"))
+
+
+def set_unread_count(user_id: int, unread: int):
+    NotificationCounter.objects.filter(user_id=user_id).update(unread=unread, updated_at=timezone.now())
@@ -0,0 +1,171 @@
+import random
+from datetime import timedelta
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+# a running task whose worker stopped renewing its lease for this long is retried
+TASK_LEASE = timedelta(minutes=10)
+LEASE_RENEW_INTERVAL = TASK_LEASE / 4
+# done and failed tasks are deleted after this long
+TASK_RETENTION = timedelta(days=7)
+PRUNE_BATCH_SIZE = 5000
+RETRY_BASE_DELAY = 10  # seconds, doubled after every failed attempt
+RETRY_MAX_DELAY = 60 * 60
+
+
+# a unit of background work picked up by `manage.py run_worker`
+class Task(models.Model):
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    name = models.CharField(max_length=100)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    # identifies equivalent work; a key is queued at most once and running at most once
+    key = models.CharField(max_length=200, blank=True, default="")
+    priority = models.SmallIntegerField(default=0)  # higher runs first
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="queued")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    locked_at = models.DateTimeField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # claim order of the worker; only pending rows are indexed
+            models.Index(
+                fields=["-priority", "run_at"],
+                name="task_claim_idx",
+                condition=Q(status="queued"),
+            ),
+            models.Index(fields=["key", "status"]),
+            models.Index(fields=["status", "locked_at"]),
+            models.Index(fields=["status", "finished_at"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["key"],
+                condition=Q(status="queued") & ~Q(key=""),
+                name="unique_queued_task_key",
+            ),
+            models.UniqueConstraint(
+                fields=["key"],
+                condition=Q(status="running") & ~Q(key=""),
+                name="unique_running_task_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Task {self.id} {self.name} ({self.status})"
+
+
+def enqueue_task(
+    name: str,
+    args=(),
+    kwargs=None,
+    priority: int = 0,
+    delay: timedelta = None,
+    max_attempts: int = 5,
+    key: str = "",
+    coalesce_running: bool = True,
+) -> Task:
+    """
+    Queue a task. The row is written in the caller's transaction, so workers only
+    see it once that transaction commits and never if it rolls back.
+    With a key, a queued task with the same key is returned instead, as is a running
+    one unless coalesce_running is False (for tasks that may already be past the
+    new work, such as draining a table). The unique constraints on key decide which
+    of two concurrent callers inserts; the other gets the winner's task.
+    """
+    fields = dict(
+        name=name,
+        args=list(args),
+        kwargs=kwargs or {},
+        priority=priority,
+        run_at=timezone.now() + delay if delay else timezone.now(),
+        max_attempts=max_attempts,
+        key=key,
+    )
+    if not key:
+        return Task.objects.create(**fields)
+
+    while True:
+        if coalesce_running:
+            running = Task.objects.filter(key=key, status="running").first()
+            if running:
+                return running
+        try:
+            with transaction.atomic():
+                return Task.objects.create(**fields)
+        except IntegrityError:
+            queued = Task.objects.filter(key=key, status="queued").first()
+            if queued:
+                return queued
+            # the queued task was claimed in the meantime; look again
+
+
+def claim_tasks(worker: str, limit: int = 1, min_priority: int = None) -> list[Task]:
+    """
+    Lock up to `limit` due tasks for one worker. Rows claimed by other workers are
+    skipped instead of waited on; running tasks past TASK_LEASE are taken over. A
+    queued task waits while another task with its key is still running.
+    """
+    now = timezone.now()
+    key_running = Task.objects.filter(key=OuterRef("key"), status="running").exclude(key="")
+    due = Q(status="queued", run_at__lte=now) & ~Q(Exists(key_running)) | Q(
+        status="running", locked_at__lt=now - TASK_LEASE
+    )
+    with transaction.atomic():
+        tasks = Task.objects.select_for_update(skip_locked=True).filter(due)
+        if min_priority is not None:
+            tasks = tasks.filter(priority__gte=min_priority)
+        tasks = list(tasks.order_by("-priority", "run_at", "id")[:limit])
+
+        for task in tasks:
+            task.status = "running"
+            task.locked_by = worker
+            task.locked_at = now
+            task.attempts += 1
+        Task.objects.bulk_update(tasks, ["status", "locked_by", "locked_at", "attempts"])
+    return tasks
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff with jitter: 10s, 20s, 40s, ... capped at an hour."""
+    delay = min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def renew_lease(task: Task) -> bool:
+    """Push the lease of a running task forward; False if another worker took it over."""
+    return bool(
+        Task.objects.filter(id=task.id, locked_by=task.locked_by, status="running").update(
+            locked_at=timezone.now()
+        )
+    )
+
+
+def prune_finished_tasks(retention: timedelta = TASK_RETENTION, batch_size: int = PRUNE_BATCH_SIZE) -> int:
+    """Delete done and failed tasks finished more than `retention` ago, in batches."""
+    cutoff = timezone.now() - retention
+    deleted = 0
+    while True:
+        ids = list(
+            Task.objects.filter(status__in=["done", "failed"], finished_at__lt=cutoff).values_list(
+                "id", flat=True
+            )[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += Task.objects.filter(id__in=ids).delete()[0]
@@ -1,4 +1,9 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
 from .user import AttendeeUser
 from .event import Event
 
@@ -37,8 +42,18 @@ class Ticket(models.Model):
     )
     approved_at = models.DateTimeField(null=True, blank=True) 
     rejected_at = models.DateTimeField(null=True, blank=True)
+    revoked_at = models.DateTimeField(null=True, blank=True)  # last move away from approved
     checked_in_at = models.DateTimeField(null=True, blank=True)
-    checked_in_dates = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["event", "approval_status"]),
+            models.Index(fields=["event", "purchase_date"]),
+            # roster search: icontains/iexact compare UPPER(column), so index the same expression
+            GinIndex(OpClass(Upper("user_name"), name="gin_trgm_ops"), name="ticket_user_name_trgm"),
+            GinIndex(OpClass(Upper("user_email"), name="gin_trgm_ops"), name="ticket_user_email_trgm"),
+            models.Index(Upper("ticket_number"), name="ticket_number_upper_idx"),
+        ]
 
     def __str__(self):
         return f"Ticket: {self.event_title} ({self.event.event_title})"
@@ -48,3 +63,9 @@ class Ticket(models.Model):
             import random
             self.ticket_number = f"T{random.randint(100000, 999999)}"
         super().save(*args, **kwargs)
+
+
+@receiver(post_delete, sender=Ticket)
+def record_ticket_deletion(sender, instance, **kwargs):
+    # a deleted row cannot be listed as removed in a gate manifest delta
+    Event.objects.filter(id=instance.event_id).update(tickets_deleted_at=timezone.now())
@@ -0,0 +1,25 @@
+from django.db import models
+from .ticket import Ticket
+
+
+# guard row: one reminder of each type per ticket and event day, however often the scheduler runs
+class TicketReminder(models.Model):
+    ticket = models.ForeignKey(Ticket, on_delete=models.CASCADE, related_name="reminders")
+    reminder_type = models.CharField(max_length=50)
+    day = models.DateField()
+    # the scheduler run that inserted the row, to tell its own inserts from a concurrent run's
+    run_id = models.UUIDField()
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ticket", "reminder_type", "day"], name="ticket_reminder_once"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["run_id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.reminder_type} for ticket {self.ticket_id} on {self.day}"
@@ -0,0 +1,261 @@
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db import models, transaction
+from django.utils import timezone
+from api import pubsub
+from .event import Event
+from .ticket import Ticket
+
+TOKEN_PREFIX = "UP1"
+SIGNATURE_BYTES = 16
+KEYRING_CACHE_TTL = 60  # seconds; only a backstop, every change is pushed on KEYRING_CHANNEL
+KEYRING_CHANNEL = "ticket_keyrings"
+
+
+# per-event HMAC keys used to sign ticket QR tokens, old keys keep verifying until retired
+class EventSigningKey(models.Model):
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="signing_keys")
+    key_id = models.CharField(max_length=16)
+    secret = models.CharField(max_length=64)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    retired_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["event", "key_id"], name="unique_signing_key_per_event"),
+        ]
+
+    def __str__(self):
+        return f"SigningKey {self.key_id} for event {self.event_id}"
+
+
+# tokens of a ticket issued before revoked_at are refused at the gate
+class RevokedTicketToken(models.Model):
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="revoked_tokens")
+    ticket = models.OneToOneField(Ticket, on_delete=models.CASCADE, related_name="token_revocation")
+    revoked_at = models.DateTimeField(default=timezone.now)
+    reason = models.CharField(max_length=255, blank=True, default="")
+
+    def __str__(self):
+        return f"Revoked tokens of ticket {self.ticket_id}"
+
+
+class TicketTokenError(Exception):
+    """Raised when a signed ticket token cannot be accepted"""
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(secret: str, message: str) -> str:
+    digest = hmac.new(secret.encode(), message.encode(), hashlib.sha256).digest()
+    return _b64encode(digest[:SIGNATURE_BYTES])
+
+
+def _keyring_cache_key(event_id: int) -> str:
+    return f"ticket-token-keyring:{event_id}"
+
+
+# bumped whenever an event's keyring is dropped, so a keyring read from the
+# database before the change is not cached after it
+_keyring_generations = defaultdict(int)
+_keyring_watch_lock = threading.Lock()
+_keyring_subscription = None
+
+
+def _drop_keyring(event_id: int):
+    _keyring_generations[event_id] += 1
+    cache.delete(_keyring_cache_key(event_id))
+
+
+def _drop_published_keyrings(subscription):
+    while True:
+        message = subscription.get()
+        if message is not None:
+            _drop_keyring(message["event_id"])
+
+
+def _watch_keyrings():
+    """
+    Subscribe this process to keyring changes made by any process, before it
+    caches its first keyring. Uses the pubsub broker, so deployments with several
+    processes need PUBSUB_BACKEND = "api.pubsub.PostgresBroker".
+    """
+    global _keyring_subscription
+    with _keyring_watch_lock:
+        if _keyring_subscription is None:
+            _keyring_subscription = pubsub.subscribe(KEYRING_CHANNEL)
+            threading.Thread(
+                target=_drop_published_keyrings, args=(_keyring_subscription,), daemon=True
+            ).start()
+
+
+def get_keyring(event_id: int) -> dict:
+    """
+    Everything a gate needs to verify tokens for one event, cached per worker:
+    verification keys, the active key, revocations and organizer/title
+    """
+    keyring = cache.get(_keyring_cache_key(event_id))
+    if keyring is not None:
+        return keyring
+
+    _watch_keyrings()
+    generation = _keyring_generations[event_id]
+    event = Event.objects.only("id", "organizer_id", "event_title").get(id=event_id)
+    keys = EventSigningKey.objects.filter(event_id=event_id, retired_at__isnull=True)
+    keyring = {
+        "organizer_id": event.organizer_id,
+        "event_title": event.event_title,
+        "keys": {key.key_id: key.secret for key in keys},
+        "active_key_id": next((key.key_id for key in keys if key.is_active), None),
+        "revoked": {
+            ticket_id: revoked_at.timestamp()
+            for ticket_id, revoked_at in RevokedTicketToken.objects.filter(
+                event_id=event_id
+            ).values_list("ticket_id", "revoked_at")
+        },
+    }
+    if _keyring_generations[event_id] == generation:
+        cache.set(_keyring_cache_key(event_id), keyring, KEYRING_CACHE_TTL)
+    return keyring
+
+
+def invalidate_keyring(event_id: int):
+    """Make every process drop its cached keyring of the event once the change commits."""
+    transaction.on_commit(lambda: _drop_keyring(event_id))
+    pubsub.publish(KEYRING_CHANNEL, {"event_id": event_id})
+
+
+def rotate_signing_key(event: Event, retire_previous: bool = False) -> EventSigningKey:
+    """
+    Create a new active key for the event.
+    Previous keys keep verifying already issued tokens unless retire_previous is set.
+    """
+    now = timezone.now()
+    previous = EventSigningKey.objects.filter(event=event, retired_at__isnull=True)
+    if retire_previous:
+        previous.update(is_active=False, retired_at=now)
+    else:
+        previous.update(is_active=False)
+
+    key = EventSigningKey.objects.create(
+        event=event,
+        key_id=secrets.token_hex(4),
+        secret=secrets.token_urlsafe(32),
+    )
+    invalidate_keyring(event.id)
+    return key
+
+
+def get_active_signing_key(event: Event) -> EventSigningKey:
+    key = EventSigningKey.objects.filter(event=event, is_active=True, retired_at__isnull=True).first()
+    return key or rotate_signing_key(event)
+
+
+def revoke_ticket_tokens(tickets, reason: str = ""):
+    """Refuse every token issued so far for the given tickets."""
+    now = timezone.now()
+    tickets = list(tickets)
+    RevokedTicketToken.objects.bulk_create(
+        [
+            RevokedTicketToken(event_id=t.event_id, ticket_id=t.id, revoked_at=now, reason=reason)
+            for t in tickets
+        ],
+        update_conflicts=True,
+        unique_fields=["ticket"],
+        update_fields=["revoked_at", "reason"],
+    )
+    for event_id in {t.event_id for t in tickets}:
+        invalidate_keyring(event_id)
+
+
+def issue_ticket_token(ticket: Ticket, valid_days: list[str], expires_at: datetime = None) -> tuple[str, datetime]:
+    """
+    Sign a QR payload carrying ticket id, event id, attendee name and valid days.
+    Returns (token, expires_at).
+    """
+    key = get_active_signing_key(ticket.event)
+    now = timezone.now()
+
+    if expires_at is None:
+        if ticket.event.event_end_date:
+            expires_at = ticket.event.event_end_date + timedelta(days=1)
+        else:
+            expires_at = now + timedelta(days=365)
+
+    payload = {
+        "t": ticket.id,
+        "e": ticket.event_id,
+        "n": ticket.user_name,
+        "d": valid_days,
+        "i": int(now.timestamp()),
+        "x": int(expires_at.timestamp()),
+    }
+    body = _b64encode(json.dumps(payload, separators=(",", ":")).encode())
+    message = f"{TOKEN_PREFIX}.{key.key_id}.{body}"
+    return f"{message}.{_sign(key.secret, message)}", expires_at
+
+
+def is_ticket_token(value: str) -> bool:
+    return value.startswith(f"{TOKEN_PREFIX}.")
+
+
+def verify_ticket_token(token: str, event_id: int = None, day: str = None) -> tuple[dict, dict]:
+    """
+    Verify a signed ticket token in memory, without reading the ticket row.
+    Returns (payload, keyring); raises TicketTokenError on forged, expired,
+    revoked, wrong-event or wrong-day tokens.
+    """
+    try:
+        prefix, key_id, body, signature = token.split(".")
+        payload = json.loads(_b64decode(body))
+        token_event_id = int(payload["e"])
+    except (ValueError, KeyError, TypeError):
+        raise TicketTokenError("Malformed ticket token")
+
+    if prefix != TOKEN_PREFIX:
+        raise TicketTokenError("Unsupported ticket token version")
+
+    if event_id and token_event_id != event_id:
+        raise TicketTokenError(
+            "This ticket belongs to a different event. Please scan the ticket from the correct event"
+        )
+
+    try:
+        keyring = get_keyring(token_event_id)
+    except Event.DoesNotExist:
+        raise TicketTokenError("Invalid ticket token")
+
+    secret = keyring["keys"].get(key_id)
+    if not secret or not hmac.compare_digest(_sign(secret, f"{prefix}.{key_id}.{body}"), signature):
+        raise TicketTokenError("Invalid ticket token")
+
+    if payload.get("x", 0) < datetime.now(dt_timezone.utc).timestamp():
+        raise TicketTokenError("Ticket token has expired")
+
+    revoked_at = keyring["revoked"].get(payload.get("t"))
+    if revoked_at is not None and payload.get("i", 0) <= revoked_at:
+        raise TicketTokenError("Ticket has been revoked")
+
+    valid_days = payload.get("d") or []
+    if day and valid_days and day not in valid_days:
+        raise TicketTokenError(
+            f"This ticket is not valid for {day}. Valid dates: {', '.join(valid_days)}"
+        )
+
+    return payload, keyring
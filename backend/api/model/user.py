@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth.models import AbstractUser
 
 class AttendeeUser(AbstractUser):
@@ -15,5 +16,11 @@ class AttendeeUser(AbstractUser):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # email__iexact lookups (bulk imports) compare UPPER(email)
+            models.Index(Upper("email"), name="user_email_upper_idx"),
+        ]
+
     def __str__(self):
         return f"{self.username} ({self.role})"
\ No newline at end of file
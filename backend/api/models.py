@@ -9,4 +9,13 @@ from .model import (
     EventSchedule,
     Social,
     Notification,
+    NotificationOutbox,
+    CheckIn,
+    EventSigningKey,
+    RevokedTicketToken,
+    EventStats,
+    ExportJob,
+    Task,
+    TicketReminder,
+    NotificationCounter,
 )
\ No newline at end of file
@@ -0,0 +1,326 @@
+"""
+Publish/subscribe used to push live updates to Server-Sent Events streams.
+
+The default backend keeps subscribers in process memory, which is enough for a
+single worker. Deployments running several workers set
+PUBSUB_BACKEND = "api.pubsub.PostgresBroker" so every worker receives every
+message through LISTEN/NOTIFY.
+"""
+
+import asyncio
+import json
+import os
+import queue
+import select
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.module_loading import import_string
+
+DEFAULT_BACKEND = "api.pubsub.InProcessBroker"
+
+
+class Subscription:
+    """
+    Messages published on one channel, buffered for a single stream.
+    Read with get() from a thread, or with aget() from an event loop; once aget()
+    has been awaited, messages are handed to that loop instead of a blocking queue.
+    """
+
+    def __init__(self, broker, channel: str, maxsize: int = 1000):
+        self.broker = broker
+        self.channel = channel
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._async_queue = None
+        self._loop = None
+        self._handover = threading.Lock()
+
+    def deliver(self, message):
+        with self._handover:
+            if self._loop is not None:
+                try:
+                    self._loop.call_soon_threadsafe(self._put_async, message)
+                except RuntimeError:
+                    # the stream's event loop is gone; close() will follow
+                    pass
+                return
+            try:
+                self._queue.put_nowait(message)
+            except queue.Full:
+                # A stalled client drops updates rather than growing memory without bound
+                pass
+
+    def _put_async(self, message):
+        try:
+            self._async_queue.put_nowait(message)
+        except asyncio.QueueFull:
+            pass
+
+    def get(self, timeout: float = None):
+        """Next message, or None when nothing arrived within timeout seconds"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    async def aget(self, timeout: float = None):
+        """Like get(), without holding a thread while waiting"""
+        if self._loop is None:
+            with self._handover:
+                self._async_queue = asyncio.Queue(maxsize=self._queue.maxsize)
+                self._loop = asyncio.get_running_loop()
+                # messages that arrived before the first await are still in the blocking queue
+                while True:
+                    try:
+                        self._async_queue.put_nowait(self._queue.get_nowait())
+                    except (queue.Empty, asyncio.QueueFull):
+                        break
+        try:
+            return await asyncio.wait_for(self._async_queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """Delivers messages to subscribers living in the same process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def publish(self, channel: str, message: dict):
+        self._deliver(channel, message)
+
+    def _deliver(self, channel: str, message: dict):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(message)
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+
+class PostgresBroker(InProcessBroker):
+    """
+    Shares messages between workers with Postgres LISTEN/NOTIFY.
+    Each worker keeps one listener connection, owned by a background thread,
+    and fans notifications out to its local subscribers. subscribe() returns once
+    the listener has run LISTEN, so nothing published afterwards is missed; the
+    channel is unlistened when its last local subscriber leaves.
+    """
+
+    prefix = "uniplus_"
+    listen_timeout = 5.0  # seconds subscribe() waits for the listener to confirm
+
+    def __init__(self):
+        super().__init__()
+        self._commands = queue.Queue()
+        # written to wake the listener out of select() when a command is queued
+        self._wakeup_read, self._wakeup_write = os.pipe()
+        os.set_blocking(self._wakeup_read, False)
+        os.set_blocking(self._wakeup_write, False)
+        self._listener = None
+
+    def publish(self, channel: str, message: dict):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.prefix + channel, json.dumps(message)])
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = super().subscribe(channel)
+        listened = threading.Event()
+        self._send("LISTEN", channel, listened)
+        self._ensure_listener()
+        if not listened.wait(self.listen_timeout):
+            self.unsubscribe(subscription)
+            raise RuntimeError(f"Timed out waiting for LISTEN on channel '{channel}'")
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        super().unsubscribe(subscription)
+        with self._lock:
+            last = subscription.channel not in self._subscribers
+        if last:
+            self._send("UNLISTEN", subscription.channel)
+
+    def _send(self, command: str, channel: str, done: threading.Event = None):
+        self._commands.put((command, channel, done))
+        try:
+            os.write(self._wakeup_write, b"\0")
+        except BlockingIOError:
+            # the pipe is full, so the listener is already due to wake up
+            pass
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, daemon=True)
+                self._listener.start()
+
+    def _run_commands(self, cursor, listening: set):
+        while True:
+            try:
+                command, channel, done = self._commands.get_nowait()
+            except queue.Empty:
+                return
+            if command == "LISTEN" and channel not in listening:
+                cursor.execute(f'LISTEN "{self.prefix}{channel}"')
+                listening.add(channel)
+            elif command == "UNLISTEN" and channel in listening:
+                # a subscriber may have joined since the unsubscribe queued this
+                with self._lock:
+                    unused = channel not in self._subscribers
+                if unused:
+                    cursor.execute(f'UNLISTEN "{self.prefix}{channel}"')
+                    listening.discard(channel)
+            if done is not None:
+                done.set()
+
+    def _listen(self):
+        import psycopg2
+
+        db = settings.DATABASES["default"]
+        conn = psycopg2.connect(
+            dbname=db["NAME"],
+            user=db["USER"],
+            password=db["PASSWORD"],
+            host=db["HOST"],
+            port=db["PORT"],
+        )
+        conn.autocommit = True
+        listening = set()
+
+        try:
+            with conn.cursor() as cursor:
+                # a restarted listener picks up the channels of existing subscribers
+                with self._lock:
+                    channels = list(self._subscribers)
+                for channel in channels:
+                    cursor.execute(f'LISTEN "{self.prefix}{channel}"')
+                    listening.add(channel)
+
+                while True:
+                    self._run_commands(cursor, listening)
+
+                    readable, _, _ = select.select([conn, self._wakeup_read], [], [], 60.0)
+                    if self._wakeup_read in readable:
+                        try:
+                            os.read(self._wakeup_read, 4096)
+                        except BlockingIOError:
+                            pass
+                    if conn not in readable:
+                        continue
+
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        channel = notify.channel[len(self.prefix):]
+                        self._deliver(channel, json.loads(notify.payload))
+        finally:
+            conn.close()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(getattr(settings, "PUBSUB_BACKEND", DEFAULT_BACKEND))()
+        return _broker
+
+
+def publish(channel: str, message: dict):
+    """Publish once the surrounding transaction commits, immediately outside one."""
+    transaction.on_commit(lambda: get_broker().publish(channel, message))
+
+
+def subscribe(channel: str) -> Subscription:
+    return get_broker().subscribe(channel)
+
+
+def event_channel(event_id: int) -> str:
+    return f"event_{event_id}"
+
+
+def user_channel(user_id: int) -> str:
+    return f"user_{user_id}"
+
+
+def publish_unread_change(user_id: int, delta: int = 0, count: int = None, latest_id: int = None):
+    """
+    Tell a user's open notification streams that their unread count changed,
+    either by delta or, after a bulk change, to an absolute count.
+    """
+    message = {"unread_delta": delta}
+    if count is not None:
+        message = {"unread_count": count}
+    if latest_id is not None:
+        message["latest_id"] = latest_id
+    publish(user_channel(user_id), message)
+
+
+def publish_event_counters(event_id: int, totals: dict = None, days: dict = None, version: int = None):
+    """
+    Push counter deltas to the live dashboard of one event, e.g.
+    totals={"approved": 1, "pending": -1}, days={"2025-11-06": {"checked_in": 1}}.
+    version is the EventStats version the change was committed with; dashboards
+    skip deltas whose version their snapshot already includes.
+    """
+    totals = {key: value for key, value in (totals or {}).items() if value}
+    days = {
+        day: {key: value for key, value in counters.items() if value}
+        for day, counters in (days or {}).items()
+    }
+    days = {day: counters for day, counters in days.items() if counters}
+
+    if totals or days:
+        publish(
+            event_channel(event_id),
+            {"event_id": event_id, "version": version, "totals": totals, "days": days},
+        )
+
+
+def ticket_transition_deltas(transitions) -> tuple[dict, dict]:
+    """
+    Counter deltas (totals, days) for approval status changes.
+    transitions is an iterable of (old_status, new_status, valid_days); use None
+    as old_status for a new registration.
+    """
+    totals = defaultdict(int)
+    days = defaultdict(lambda: defaultdict(int))
+
+    for old_status, new_status, valid_days in transitions:
+        if old_status == new_status:
+            continue
+        if old_status is None:
+            totals["registered"] += 1
+        else:
+            totals[old_status] -= 1
+        totals[new_status] += 1
+
+        for day in valid_days:
+            if old_status is not None:
+                days[day][old_status] -= 1
+            days[day][new_status] += 1
+
+    return dict(totals), {day: dict(counters) for day, counters in days.items()}
+
@@ -0,0 +1,105 @@
+"""
+Event reminders. `manage.py send_reminders` calls send_due_reminders every tick;
+TicketReminder guard rows keep each reminder to one per ticket, type and day,
+also when ticks overlap or several schedulers run.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from api.model.event_schedule import EventSchedule
+from api.model.notification import send_reminder_notifications
+from api.model.ticket import Ticket
+from api.model.ticket_reminder import TicketReminder
+from api.views.utils import extract_ticket_dates
+
+REMINDER_CHUNK_SIZE = 2000
+
+# reminder type -> (earliest, latest) time before the start it is sent in
+REMINDER_WINDOWS = {
+    "reminder_24h": (timedelta(hours=1), timedelta(hours=24)),
+    "reminder_1h": (timedelta(0), timedelta(hours=1)),
+}
+
+
+def upcoming_occurrences(now: datetime):
+    """
+    (schedule, start) for approved events starting within the widest window.
+    EventSchedule keeps UTC dates and times, as create_event stores them.
+    """
+    horizon = now + max(window[1] for window in REMINDER_WINDOWS.values())
+    schedules = EventSchedule.objects.filter(
+        event_date__gte=now.astimezone(dt_timezone.utc).date(),
+        event_date__lte=horizon.astimezone(dt_timezone.utc).date(),
+        event__verification_status="approved",
+    ).select_related("event")
+
+    for schedule in schedules:
+        start = datetime.combine(schedule.event_date, schedule.start_time_event, tzinfo=dt_timezone.utc)
+        if now < start <= horizon:
+            yield schedule, start
+
+
+def _remind(schedule: EventSchedule, reminder_type: str, hours_until: float, chunk_size: int) -> int:
+    """Send one reminder type for one occurrence, chunk by chunk; returns reminders sent."""
+    day = schedule.event_date
+    already_sent = TicketReminder.objects.filter(
+        ticket=OuterRef("pk"), reminder_type=reminder_type, day=day
+    )
+    tickets = (
+        Ticket.objects.filter(event_id=schedule.event_id, approval_status="approved", attendee__isnull=False)
+        .filter(~Exists(already_sent))
+        .only("id", "attendee_id", "event_dates")
+        .order_by("id")
+    )
+
+    sent = 0
+    last_id = 0
+    while True:
+        chunk = list(tickets.filter(id__gt=last_id)[:chunk_size])
+        if not chunk:
+            return sent
+        last_id = chunk[-1].id
+
+        # multi-day tickets may not cover this day
+        chunk = [
+            ticket for ticket in chunk
+            if not ticket.event_dates or day.isoformat() in extract_ticket_dates(ticket.event_dates)
+        ]
+        if not chunk:
+            continue
+
+        run_id = uuid.uuid4()
+        with transaction.atomic():
+            TicketReminder.objects.bulk_create(
+                [
+                    TicketReminder(ticket_id=ticket.id, reminder_type=reminder_type, day=day, run_id=run_id)
+                    for ticket in chunk
+                ],
+                ignore_conflicts=True,
+            )
+            # rows another run inserted first were ignored; remind only for our own
+            claimed = set(TicketReminder.objects.filter(run_id=run_id).values_list("ticket_id", flat=True))
+            chunk = [ticket for ticket in chunk if ticket.id in claimed]
+            send_reminder_notifications(chunk, schedule.event, hours_until, reminder_type)
+        sent += len(chunk)
+
+
+def send_due_reminders(now: datetime = None, chunk_size: int = REMINDER_CHUNK_SIZE) -> dict:
+    """Send every reminder that is due at `now`; returns counts per reminder type."""
+    now = now or timezone.now()
+    counts = dict.fromkeys(REMINDER_WINDOWS, 0)
+
+    for schedule, start in upcoming_occurrences(now):
+        lead = start - now
+        for reminder_type, (earliest, latest) in REMINDER_WINDOWS.items():
+            if earliest < lead <= latest:
+                counts[reminder_type] += _remind(
+                    schedule, reminder_type, lead.total_seconds() / 3600, chunk_size
+                )
+    return counts
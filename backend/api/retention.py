@@ -0,0 +1,84 @@
+"""
+Notification retention. `manage.py prune_notifications` deletes read notifications
+older than NOTIFICATION_RETENTION_DAYS in small batches, optionally writing them to
+a gzipped JSON Lines archive first. Unread notifications are kept, so the unread
+counters never change here.
+"""
+
+import gzip
+import json
+import os
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from api.model.notification import Notification
+
+PRUNE_BATCH_SIZE = 5000
+ARCHIVE_COLUMNS = (
+    "id",
+    "user_id",
+    "message",
+    "notification_type",
+    "related_ticket_id",
+    "related_event_id",
+    "is_read",
+    "created_at",
+)
+
+
+def retention_cutoff(days: int = None):
+    days = settings.NOTIFICATION_RETENTION_DAYS if days is None else days
+    return timezone.now() - timedelta(days=days)
+
+
+def prunable_notifications(cutoff):
+    return Notification.objects.filter(is_read=True, created_at__lt=cutoff)
+
+
+def _open_archive(archive_dir: str):
+    os.makedirs(archive_dir, exist_ok=True)
+    name = f"notifications-{timezone.now():%Y%m%d-%H%M%S}.jsonl.gz"
+    return gzip.open(os.path.join(archive_dir, name), "wt", encoding="utf-8")
+
+
+def prune_read_notifications(
+    cutoff,
+    batch_size: int = PRUNE_BATCH_SIZE,
+    archive_dir: str = None,
+    pause: float = 0,
+) -> int:
+    """
+    Delete read notifications created before cutoff, oldest first, one batch per
+    short transaction so locks and WAL bursts stay small and autovacuum can keep
+    up. Returns how many rows were deleted.
+    """
+    archive = None
+    deleted = 0
+    try:
+        while True:
+            batch = prunable_notifications(cutoff).order_by("created_at", "id")[:batch_size]
+            if archive_dir:
+                rows = list(batch.values(*ARCHIVE_COLUMNS))
+                ids = [row["id"] for row in rows]
+                if rows and archive is None:
+                    archive = _open_archive(archive_dir)
+                for row in rows:
+                    archive.write(json.dumps(row, cls=DjangoJSONEncoder) + "\n")
+                if archive:
+                    archive.flush()
+            else:
+                ids = list(batch.values_list("id", flat=True))
+            if not ids:
+                return deleted
+
+            count, _ = Notification.objects.filter(id__in=ids).delete()
+            deleted += count
+            if pause:
+                time.sleep(pause)
+    finally:
+        if archive:
+            archive.close()
@@ -309,6 +309,23 @@ class AttendeeSchema(Schema):
     checkedInDates: Dict[str, str] = {}
 
 
+class RosterAttendeeSchema(Schema):
+    """One row of the paginated attendee roster, limited to the table's columns"""
+    ticketId: str
+    displayTicketId: Optional[str] = None
+    name: str
+    email: str
+    username: Optional[str] = None
+    status: str  # 'present', 'pending', 'absent'
+    approvalStatus: str  # 'approved', 'pending', 'rejected'
+    registered: str
+    approvedAt: Optional[str] = None
+    rejectedAt: Optional[str] = None
+    checkedIn: str
+    eventDate: str
+    checkedInDates: Dict[str, str] = {}
+
+
 class ApprovalRequestSchema(Schema):
     """Request to approve/reject registrations"""
     ticket_ids: List[str]  # Support bulk actions
@@ -316,15 +333,64 @@ class ApprovalRequestSchema(Schema):
     reason: Optional[str] = None  # Optional reason for rejection
 
 
+class RegistrationImportErrorSchema(Schema):
+    row: int
+    email: str
+    error: str
+
+
+class RegistrationImportResultSchema(Schema):
+    """Outcome of a CSV pre-registration import"""
+    success: bool
+    message: str
+    total_rows: int
+    created: int
+    skipped: int  # already registered or repeated in the file
+    failed: int  # invalid email or no matching account
+    errors: List[RegistrationImportErrorSchema]
+    errors_truncated: bool = False
+
+
 class ApprovalResponseSchema(Schema):
     """Response after approval/rejection action"""
     success: bool
     message: str
-    ticket_id: str
+    ticket_id: Optional[str] = None
+    ticket_ids: Optional[List[str]] = None  # For bulk actions
     status: str  # 'approved' or 'rejected'
     processed_count: Optional[int] = None  # For bulk actions
 
 
+class RegistrationCriteriaSchema(Schema):
+    """Selects registrations of one event; every given field must match"""
+    status: str = "pending"
+    registered_before: Optional[datetime] = None
+    registered_after: Optional[datetime] = None
+    faculty: Optional[str] = None
+    year: Optional[str] = None
+    role: Optional[str] = None
+
+
+class CriteriaActionRequestSchema(Schema):
+    """Approve/reject every registration matching criteria, without sending ids"""
+    action: str  # 'approve' or 'reject'
+    criteria: RegistrationCriteriaSchema
+    reason: Optional[str] = None
+    dry_run: bool = False  # only count the matches
+    operation_id: Optional[str] = None  # client-chosen id to poll progress with
+
+
+class CriteriaActionProgressSchema(Schema):
+    operation_id: str
+    state: str  # 'preview', 'queued', 'running', 'done' or 'failed'
+    action: str
+    matched: int
+    processed: int
+    chunks: int
+    progress: float
+    error: Optional[str] = None
+
+
 class ScheduleDaySchema(Schema):
     """Single day in event schedule"""
     date: str
@@ -398,6 +464,75 @@ class CheckInResponseSchema(Schema):
     approval_status: str
 
 
+# ============================================================================
+# OFFLINE GATE SCHEMAS
+# ============================================================================
+
+class GateManifestSchema(Schema):
+    """Compact list of ticket codes a gate device may admit for one event day"""
+    event_id: int
+    day: str
+    version: int  # Pass back as `since` to receive only the changes
+    since: Optional[int] = None  # Set when this manifest is a delta
+    encoding: str
+    count: int
+    qr_codes: List[str]  # Delta-encoded, see api.views.gate.encode_qr_codes
+    ticket_numbers: List[int]  # Delta-encoded numeric part of "T123456"
+    removed_qr_codes: List[str] = []
+    removed_ticket_numbers: List[int] = []
+    generated_at: datetime
+
+
+class GateScanSchema(Schema):
+    """Single scan recorded by a gate while offline"""
+    code: str  # QR code or ticket number
+    event_date: str  # YYYY-MM-DD
+    scanned_at: datetime
+
+
+class GateScanUploadSchema(Schema):
+    """Batch of offline scans uploaded by one gate"""
+    gate: Optional[str] = None
+    scans: List[GateScanSchema]
+
+
+class GateScanResultSchema(Schema):
+    code: str
+    event_date: str
+    result: str  # accepted / duplicate / unknown / not_approved / wrong_day / invalid_date
+    checked_in_at: Optional[str] = None
+
+
+class GateScanUploadResponseSchema(Schema):
+    success: bool
+    accepted: int
+    duplicates: int
+    rejected: int
+    results: List[GateScanResultSchema]
+
+
+class TicketTokenSchema(Schema):
+    """Signed QR payload that gates can verify without a database lookup"""
+    token: str
+    valid_days: List[str]
+    expires_at: datetime
+
+
+class SigningKeyRotateSchema(Schema):
+    retire_previous: bool = False  # True invalidates every token issued so far
+
+
+class SigningKeyRotateResponseSchema(Schema):
+    success: bool
+    message: str
+    key_id: str
+
+
+class TokenRevocationSchema(Schema):
+    ticket_ids: List[str]  # Ticket numbers or qr codes
+    reason: Optional[str] = None
+
+
 # ============================================================================
 # GENERIC RESPONSE SCHEMAS
 # ============================================================================
@@ -433,6 +568,12 @@ class PaginatedEventsSchema(Schema):
     pagination: PaginationSchema
 
 
+class AttendeeRosterSchema(Schema):
+    """Paginated attendee roster response"""
+    attendees: List[RosterAttendeeSchema]
+    pagination: PaginationSchema
+
+
 # ============================================================================
 # STATISTICS SCHEMAS
 # ============================================================================
@@ -460,6 +601,112 @@ class UserStatisticsSchema(Schema):
     total_attendees: Optional[int] = None
 
 
+class AttendanceTimeseriesSchema(Schema):
+    """Check-in arrivals per time bucket for one event day"""
+    event_id: int
+    day: str
+    bucket_minutes: int
+    timezone: str
+    buckets: List[str]  # ISO start of each bucket, local time
+    counts: List[int]  # arrivals in each bucket
+    cumulative: List[int]  # arrivals up to and including each bucket
+    total: int
+    peak_at: Optional[str] = None
+    peak_count: int = 0
+    is_final: bool  # the day is over, so the series is cached
+    generated_at: datetime
+
+
+class FunnelTotalsSchema(Schema):
+    """Registration funnel summed over an organizer's events, rates in percent"""
+    events: int
+    finished_events: int
+    registered: int
+    approved: int
+    pending: int
+    rejected: int
+    checked_in: int
+    approval_rate: float
+    rejection_rate: float
+    attendance_rate: float  # finished events only
+    no_show_rate: float  # finished events only
+
+
+class RegistrationPeriodSchema(Schema):
+    period: datetime
+    registrations: int
+    approved: int
+    cumulative: int
+
+
+class RepeatAttendeeSchema(Schema):
+    unique: int
+    repeat: int  # approved for two or more of the organizer's events
+    repeat_ratio: float
+
+
+class EventFunnelSchema(Schema):
+    event_id: int
+    event_title: str
+    event_start_date: Optional[datetime] = None
+    registered: int
+    approved: int
+    rejected: int
+    checked_in: int
+    approval_rate: float
+    no_show_rate: Optional[float] = None  # None until the event has ended
+
+
+class OrganizerAnalyticsSchema(Schema):
+    """Funnel analytics across all events of one organizer"""
+    organizer_id: int
+    interval: str
+    totals: FunnelTotalsSchema
+    registrations_over_time: List[RegistrationPeriodSchema]
+    attendees: RepeatAttendeeSchema
+    events: List[EventFunnelSchema]
+    generated_at: datetime
+
+
+class EventImportErrorSchema(Schema):
+    record: int  # CSV line number or position of the VEVENT in the file
+    error: str
+
+
+class EventImportResultSchema(Schema):
+    """Outcome of an ICS/CSV event import"""
+    success: bool
+    message: str
+    total: int
+    created: int
+    updated: int
+    unchanged: int
+    failed: int
+    errors: List[EventImportErrorSchema]
+
+
+class ExportJobCreateSchema(Schema):
+    """Spec of a background registration export"""
+    format: str = "csv"  # csv, xlsx, jsonl or parquet
+    columns: Optional[List[str]] = None  # defaults to every exportable column
+    event_ids: List[int] = []  # empty: every event the caller may export
+    refresh: bool = False  # rebuild even if an identical recent artifact exists
+
+
+class ExportJobSchema(Schema):
+    id: int
+    status: str  # queued, running, done, failed
+    format: str
+    columns: List[str]
+    total_rows: Optional[int] = None
+    rows_written: int
+    progress: float  # percent
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    download_url: Optional[str] = None
+
+
 class CommentCreateSchema(Schema):
     content: str
 
@@ -490,6 +737,7 @@ class EventFeedbackAggregateSchema(Schema):
 class EventFeedbackReportSchema(Schema):
     aggregates: EventFeedbackAggregateSchema
     ai_summary: str
+    ai_summary_pending: bool = False
     feedback: List[EventFeedbackOutSchema]
     
 class CommentResponseSchema(Schema):
@@ -534,6 +782,67 @@ class AdminEventSchema(Schema):
     organizer_id: int
     status_registration: str
     verification_status: str
+
+
+class AdminEventQueueItemSchema(Schema):
+    """Admin event row without the description"""
+    id: int
+    title: str
+    event_title: str
+    event_create_date: str
+    organizer_name: str
+    organizer_username: str
+    organizer_id: int
+    status_registration: str
+    verification_status: str
+
+
+class AdminEventQueueSchema(Schema):
+    """One keyset page of the admin event queue"""
+    events: List[AdminEventQueueItemSchema]
+    next_cursor: Optional[str] = None  # pass back as cursor to fetch the next page
+    has_more: bool
+
+
+class ModerationEventSchema(AdminEventQueueItemSchema):
+    """Event claimed for review, with what the reviewer needs to decide"""
+    event_description: str
+    lease_expires_at: datetime
+
+
+class ModerationClaimSchema(Schema):
+    count: int = 10
+    lease_seconds: int = 600
+
+
+class ModerationClaimResponseSchema(Schema):
+    events: List[ModerationEventSchema]
+
+
+class ModerationReleaseSchema(Schema):
+    event_ids: List[int]
+
+
+class ModerationDecisionSchema(Schema):
+    event_id: int
+    action: str  # 'approve' or 'reject'
+
+
+class ModerationBatchSchema(Schema):
+    decisions: List[ModerationDecisionSchema]
+
+
+class ModerationDecisionResultSchema(Schema):
+    event_id: int
+    result: str  # approved, rejected, claimed_by_other, already_decided, not_found, invalid_action
+
+
+class ModerationBatchResultSchema(Schema):
+    success: bool
+    approved: int
+    rejected: int
+    skipped: int
+    results: List[ModerationDecisionResultSchema]
       
       
 class NotificationSchema(Schema):
@@ -576,6 +885,17 @@ class NotificationOut(Schema):
     related_event_id: Optional[int] = None
     event_title: Optional[str] = None
 
+class NotificationFeedOut(Schema):
+    """One keyset page of a user's notifications, newest first"""
+    notifications: list[NotificationOut]
+    next_cursor: Optional[str] = None  # pass back as cursor to fetch the next page
+    has_more: bool
+
+class NotificationPollOut(Schema):
+    unread_count: int
+    latest_id: int
+    notifications: list[NotificationOut]
+
 class NotificationMarkReadIn(Schema):
     notification_id: int
 
@@ -0,0 +1,160 @@
+"""
+Background tasks run by `manage.py run_worker` from the Task table.
+
+Register a function with @task and queue it with `func.delay(*args, **kwargs)`.
+Arguments are stored as JSON, so pass ids rather than model instances.
+"""
+
+import threading
+import traceback
+
+from django.conf import settings
+from django.db import IntegrityError, connection
+from django.utils import timezone
+
+from api.model.task import LEASE_RENEW_INTERVAL, Task, enqueue_task, renew_lease, retry_delay
+
+TASKS = {}
+
+
+def task(priority: int = 0, max_attempts: int = 5):
+    """Register a background task under its function name."""
+
+    def decorator(func):
+        name = func.__name__
+        TASKS[name] = func
+
+        def delay(*args, _delay=None, _key: str = "", _coalesce_running: bool = True, **kwargs) -> Task:
+            return enqueue_task(
+                name,
+                args,
+                kwargs,
+                priority=priority,
+                delay=_delay,
+                max_attempts=max_attempts,
+                key=_key,
+                coalesce_running=_coalesce_running,
+            )
+
+        func.delay = delay
+        return func
+
+    return decorator
+
+
+def _keep_lease(task: Task, finished: threading.Event):
+    """Renew the lease of a long task so other workers do not take it over."""
+    try:
+        while not finished.wait(LEASE_RENEW_INTERVAL.total_seconds()):
+            if not renew_lease(task):
+                return
+    finally:
+        connection.close()
+
+
+def _record_failure(task: Task, error: str, retry: bool):
+    Task.objects.filter(id=task.id, locked_by=task.locked_by).update(
+        status="queued" if retry else "failed",
+        run_at=timezone.now() + retry_delay(task.attempts) if retry else task.run_at,
+        last_error=error,
+        locked_by="",
+        locked_at=None,
+        finished_at=None if retry else timezone.now(),
+    )
+
+
+def run_task(task: Task):
+    """Run a claimed task and record the outcome; failures are retried with backoff."""
+    func = TASKS.get(task.name)
+    finished = threading.Event()
+    threading.Thread(target=_keep_lease, args=(task, finished), daemon=True).start()
+    try:
+        if func is None:
+            raise LookupError(f"Unknown task '{task.name}'")
+        result = func(*task.args, **task.kwargs)
+    except Exception as e:
+        finished.set()
+        retry = func is not None and task.attempts < task.max_attempts
+        error = f"{e}\n{traceback.format_exc()}"
+        try:
+            _record_failure(task, error, retry)
+        except IntegrityError:
+            # the same key was queued again while this ran; that task covers the retry
+            _record_failure(task, error, retry=False)
+        raise
+
+    finished.set()
+    Task.objects.filter(id=task.id, locked_by=task.locked_by).update(
+        status="done",
+        result=result,
+        locked_by="",
+        locked_at=None,
+        finished_at=timezone.now(),
+    )
+
+
+@task(priority=5)
+def dispatch_notifications() -> dict:
+    """Drain the notification outbox in batches."""
+    from api.model.notification import dispatch_notification_outbox
+
+    written = 0
+    while True:
+        count = dispatch_notification_outbox()
+        if not count:
+            return {"notifications": written}
+        written += count
+
+
+@task(max_attempts=3)
+def apply_criteria_action(event_id: int, new_status: str, criteria: dict, reason: str, progress: dict) -> dict:
+    """Approve or reject every registration of an event matching criteria."""
+    from api.approvals import run_criteria_action
+
+    return run_criteria_action(event_id, new_status, criteria, reason, progress)
+
+
+@task(max_attempts=3)
+def build_export(job_id: int):
+    from api.exports import run_export_job
+    from api.model.export_job import ExportJob
+
+    job = ExportJob.objects.filter(id=job_id).first()
+    if job is None or job.status == "done":
+        return
+    ExportJob.objects.filter(id=job.id).update(status="running", started_at=timezone.now(), error="")
+    run_export_job(job)
+
+
+@task(priority=-5, max_attempts=3)
+def summarize_feedback(event_id: int) -> dict:
+    """Ask the n8n workflow for a summary of an event's feedback comments."""
+    import requests
+
+    from api.model.event import Event
+    from api.model.event_feedback import EventFeedback
+
+    n8n_url = getattr(settings, "N8N_FEEDBACK_SUMMARY_URL", None)
+    event = Event.objects.filter(id=event_id).first()
+    if not n8n_url or event is None:
+        return {"summary": ""}
+
+    payload = {
+        "event_title": event.event_title,
+        "feedback": [
+            {"rating": rating, "comment": comment or ""}
+            for rating, comment in EventFeedback.objects.filter(event=event)
+            .order_by("-created_at")
+            .values_list("rating", "comment")
+        ],
+    }
+    resp = requests.post(n8n_url, json=payload, timeout=20)
+    resp.raise_for_status()
+
+    data = resp.json()
+    summary = ""
+    if isinstance(data, dict):
+        summary = (data.get("output") or "").strip()
+    elif isinstance(data, list) and data and isinstance(data[0], dict):
+        summary = (data[0].get("output") or "").strip()
+    return {"summary": summary}
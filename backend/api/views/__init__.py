@@ -8,6 +8,9 @@ from . import feedback
 from . import notifications
 from . import public_profile
 from . import verification
+from . import gate
+from . import analytics
+from . import exports
 
 __all__ = [
     "auth",
@@ -20,4 +23,7 @@ __all__ = [
     "notifications",
     "public_profile",
     "verification",
+    "gate",
+    "analytics",
+    "exports",
 ]
@@ -0,0 +1,296 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+import traceback
+
+from ninja import Router
+from ninja.security import django_auth
+from django.core.cache import cache
+from django.db.models import Count, DateTimeField, DurationField, F, Func, Q, Sum, Value
+from django.db.models.functions import Coalesce, Trunc
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+
+from api import schemas
+from api.model.event import Event
+from api.model.event_schedule import EventSchedule
+from api.model.ticket import Ticket
+from api.model.check_in import (
+    TIMESERIES_BUCKETS,
+    CheckIn,
+    attendance_timeseries_cache_key,
+)
+
+router = Router(tags=["analytics"])
+
+FINISHED_DAY_CACHE_TTL = 60 * 60 * 24  # seconds; late gate uploads invalidate explicitly
+ORGANIZER_ANALYTICS_CACHE_TTL = 300  # seconds
+ANALYTICS_INTERVALS = ("day", "week", "month")
+
+
+class DateBin(Func):
+    """Postgres date_bin(stride, source, origin): start of the bucket a timestamp falls in"""
+
+    function = "date_bin"
+    output_field = DateTimeField()
+
+    def __init__(self, stride: timedelta, expression, origin: datetime, **extra):
+        super().__init__(
+            Value(stride, output_field=DurationField()),
+            expression,
+            Value(origin, output_field=DateTimeField()),
+            **extra,
+        )
+
+
+def _attendance_timeseries(event: Event, day, bucket: int) -> dict:
+    stride = timedelta(minutes=bucket)
+    midnight = timezone.make_aware(datetime.combine(day, time.min))
+
+    rows = (
+        CheckIn.objects.filter(event=event, day=day)
+        .annotate(bucket_start=DateBin(stride, F("scanned_at"), midnight))
+        .values("bucket_start")
+        .annotate(count=Count("id"))
+        .order_by("bucket_start")
+    )
+    counts = {timezone.localtime(row["bucket_start"]): row["count"] for row in rows}
+
+    # Plot the whole scheduled window even where nobody arrived. EventSchedule keeps
+    # UTC dates and times, so the local day can start on the previous UTC date.
+    window = list(counts)
+    next_midnight = timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+    schedules = EventSchedule.objects.filter(
+        event=event, event_date__range=(day - timedelta(days=1), day + timedelta(days=1))
+    )
+    for schedule in schedules:
+        opens = datetime.combine(schedule.event_date, schedule.start_time_event, tzinfo=dt_timezone.utc)
+        closes = datetime.combine(schedule.event_date, schedule.end_time_event, tzinfo=dt_timezone.utc)
+        if closes < opens:
+            closes += timedelta(days=1)
+        if opens < next_midnight and closes >= midnight:
+            window += [opens, closes]
+
+    buckets, series, cumulative = [], [], []
+    if window:
+        # never leave the day: a gate with a skewed clock can upload any scanned_at,
+        # so such scans are counted in the first or last bucket instead
+        def bucket_in_day(moment):
+            moment = min(max(moment, midnight), next_midnight - stride)
+            return midnight + (moment - midnight) // stride * stride
+
+        first, last = bucket_in_day(min(window)), bucket_in_day(max(window))
+        clamped = defaultdict(int)
+        for start, count in counts.items():
+            clamped[min(max(start, first), last)] += count
+
+        current = first
+        running = 0
+        while current <= last:
+            arrivals = clamped.get(current, 0)
+            running += arrivals
+            buckets.append(current.isoformat())
+            series.append(arrivals)
+            cumulative.append(running)
+            current += stride
+
+    peak = max(range(len(series)), key=series.__getitem__) if series else None
+
+    return {
+        "event_id": event.id,
+        "day": day.isoformat(),
+        "bucket_minutes": bucket,
+        "timezone": timezone.get_current_timezone_name(),
+        "buckets": buckets,
+        "counts": series,
+        "cumulative": cumulative,
+        "total": cumulative[-1] if cumulative else 0,
+        "peak_at": buckets[peak] if peak is not None and series[peak] else None,
+        "peak_count": series[peak] if peak is not None else 0,
+        "is_final": day < timezone.localdate(),
+        "generated_at": timezone.now(),
+    }
+
+
+@router.get(
+    "/events/{event_id}/attendance/timeseries",
+    auth=django_auth,
+    response={
+        200: schemas.AttendanceTimeseriesSchema,
+        400: schemas.ErrorSchema,
+        403: schemas.ErrorSchema,
+        404: schemas.ErrorSchema,
+    },
+)
+def get_attendance_timeseries(request, event_id: int, day: str, bucket: int = 5):
+    """
+    Check-in arrivals per bucket of minutes for one event day, as dense arrays ready to plot.
+    Finished days are cached.
+    """
+    try:
+        event = get_object_or_404(Event, id=event_id)
+
+        if event.organizer != request.user:
+            return 403, {"error": "You are not authorized to view this event's attendance"}
+
+        try:
+            day = datetime.strptime(day, "%Y-%m-%d").date()
+        except ValueError:
+            return 400, {"error": "Invalid date format. Use YYYY-MM-DD."}
+
+        if bucket not in TIMESERIES_BUCKETS:
+            return 400, {
+                "error": f"Invalid bucket. Use one of: {', '.join(map(str, TIMESERIES_BUCKETS))} minutes"
+            }
+
+        cache_key = attendance_timeseries_cache_key(event.id, day, bucket)
+        result = cache.get(cache_key)
+        if result is None:
+            result = _attendance_timeseries(event, day, bucket)
+            if result["is_final"]:
+                cache.set(cache_key, result, FINISHED_DAY_CACHE_TTL)
+
+        return 200, result
+    except Exception as e:
+        print(f"Error building attendance time series: {e}")
+        traceback.print_exc()
+        return 400, {"error": str(e)}
+
+
+def _rate(part, whole):
+    return round(part / whole * 100, 1) if whole else 0.0
+
+
+def _organizer_analytics(organizer, interval: str) -> dict:
+    now = timezone.now()
+    events = Event.objects.filter(organizer=organizer)
+    tickets = Ticket.objects.filter(event__organizer=organizer)
+
+    # Counters come from EventStats, so this is one pass over the organizer's events
+    finished = Q(event_end_date__lt=now)
+    totals = events.aggregate(
+        events=Count("id"),
+        finished_events=Count("id", filter=finished),
+        registered=Coalesce(Sum("stats__registered"), 0),
+        approved=Coalesce(Sum("stats__approved"), 0),
+        pending=Coalesce(Sum("stats__pending"), 0),
+        rejected=Coalesce(Sum("stats__rejected"), 0),
+        checked_in=Coalesce(Sum("stats__checked_in"), 0),
+        finished_approved=Coalesce(Sum("stats__approved", filter=finished), 0),
+        finished_checked_in=Coalesce(Sum("stats__checked_in", filter=finished), 0),
+    )
+
+    period = Trunc("purchase_date", interval, tzinfo=timezone.get_current_timezone())
+    over_time = (
+        tickets.annotate(period=period)
+        .values("period")
+        .annotate(
+            registrations=Count("id"),
+            approved=Count("id", filter=Q(approval_status="approved")),
+        )
+        .order_by("period")
+    )
+
+    registrations_over_time = []
+    running = 0
+    for row in over_time:
+        running += row["registrations"]
+        registrations_over_time.append({**row, "cumulative": running})
+
+    # Aggregating over the per-attendee annotation runs as a single grouped subquery
+    attendees = (
+        tickets.filter(approval_status="approved", attendee__isnull=False)
+        .values("attendee_id")
+        .annotate(event_count=Count("event_id", distinct=True))
+        .aggregate(
+            unique=Count("attendee_id"),
+            repeat=Count("attendee_id", filter=Q(event_count__gte=2)),
+        )
+    )
+
+    event_rows = events.order_by("-event_start_date").values(
+        "id",
+        "event_title",
+        "event_start_date",
+        "event_end_date",
+        "stats__registered",
+        "stats__approved",
+        "stats__rejected",
+        "stats__checked_in",
+    )
+
+    per_event = []
+    for row in event_rows:
+        registered = row["stats__registered"] or 0
+        approved = row["stats__approved"] or 0
+        checked_in = row["stats__checked_in"] or 0
+        ended = row["event_end_date"] is not None and row["event_end_date"] < now
+        per_event.append(
+            {
+                "event_id": row["id"],
+                "event_title": row["event_title"],
+                "event_start_date": row["event_start_date"],
+                "registered": registered,
+                "approved": approved,
+                "rejected": row["stats__rejected"] or 0,
+                "checked_in": checked_in,
+                "approval_rate": _rate(approved, registered),
+                "no_show_rate": _rate(approved - checked_in, approved) if ended else None,
+            }
+        )
+
+    return {
+        "organizer_id": organizer.id,
+        "interval": interval,
+        "totals": {
+            "events": totals["events"],
+            "finished_events": totals["finished_events"],
+            "registered": totals["registered"],
+            "approved": totals["approved"],
+            "pending": totals["pending"],
+            "rejected": totals["rejected"],
+            "checked_in": totals["checked_in"],
+            "approval_rate": _rate(totals["approved"], totals["registered"]),
+            "rejection_rate": _rate(totals["rejected"], totals["registered"]),
+            "attendance_rate": _rate(totals["finished_checked_in"], totals["finished_approved"]),
+            "no_show_rate": _rate(
+                totals["finished_approved"] - totals["finished_checked_in"],
+                totals["finished_approved"],
+            ),
+        },
+        "registrations_over_time": registrations_over_time,
+        "attendees": {
+            "unique": attendees["unique"],
+            "repeat": attendees["repeat"],
+            "repeat_ratio": _rate(attendees["repeat"], attendees["unique"]),
+        },
+        "events": per_event,
+        "generated_at": now,
+    }
+
+
+@router.get(
+    "/events/my-events/analytics",
+    auth=django_auth,
+    response={200: schemas.OrganizerAnalyticsSchema, 400: schemas.ErrorSchema},
+)
+def get_organizer_analytics(request, interval: str = "month"):
+    """
+    Registration funnel across all of the organizer's events: registrations over
+    time, approval, attendance and no-show rates, and repeat attendees.
+    No-show and attendance rates only count events that have ended.
+    """
+    try:
+        if interval not in ANALYTICS_INTERVALS:
+            return 400, {"error": f"Invalid interval. Use one of: {', '.join(ANALYTICS_INTERVALS)}"}
+
+        cache_key = f"organizer-analytics:{request.user.id}:{interval}"
+        result = cache.get(cache_key)
+        if result is None:
+            result = _organizer_analytics(request.user, interval)
+            cache.set(cache_key, result, ORGANIZER_ANALYTICS_CACHE_TTL)
+
+        return 200, result
+    except Exception as e:
+        print(f"Error building organizer analytics: {e}")
+        traceback.print_exc()
+        return 400, {"error": str(e)}
@@ -1,17 +1,29 @@
 from datetime import datetime
+import uuid
 
 from ninja import Router
 from ninja.security import django_auth
+from django.db import transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
 from api import schemas
+from api.approvals import (
+    TICKET_ACTION_FIELDS,
+    TICKET_STATUSES,
+    apply_ticket_status,
+    criteria_queryset,
+    criteria_task_key,
+)
 from api.model.event import Event
+from api.model.task import Task
 from api.model.ticket import Ticket
-from api.model.notification import (
-    send_approval_notification,
-    send_rejection_notification,
-)
+from api.model.ticket_token import revoke_ticket_tokens
+from api.model.event_stats import record_ticket_transitions
+from api.tasks import apply_criteria_action
+
+from .utils import extract_ticket_dates
 
 router = Router(tags=["approval"])
 
@@ -29,65 +41,31 @@ def bulk_approve_reject(request, event_id: int, payload: schemas.ApprovalRequest
     try:
         event = get_object_or_404(Event, id=event_id)
 
-        if event.organizer != request.user:
+        if event.organizer_id != request.user.id:
             return 403, {"error": "You are not authorized to perform this action"}
 
         if payload.action not in ["approve", "reject"]:
             return 400, {"error": "Invalid action. Must be 'approve' or 'reject'"}
 
-        tickets = Ticket.objects.filter(
-            event=event,
-            ticket_number__in=payload.ticket_ids,
-        ).select_related("attendee", "event")
-
-        if tickets.count() == 0:
-            tickets = Ticket.objects.filter(
-                event=event,
-                qr_code__in=payload.ticket_ids,
-            ).select_related("attendee", "event")
+        new_status = "approved" if payload.action == "approve" else "rejected"
 
-        if tickets.count() == 0:
+        # tickets are addressed by ticket number or QR code; both resolve in one query
+        tickets = list(
+            Ticket.objects.filter(event=event)
+            .filter(Q(ticket_number__in=payload.ticket_ids) | Q(qr_code__in=payload.ticket_ids))
+            .only(*TICKET_ACTION_FIELDS)
+        )
+        if not tickets:
             return 400, {"error": "No tickets found"}
 
-        new_status = "approved" if payload.action == "approve" else "rejected"
-
-        if payload.action == "reject":
-            removed_count = 0
-            if isinstance(event.attendee, list):
-                for ticket in tickets:
-                    if ticket.attendee and ticket.attendee.id in event.attendee:
-                        event.attendee.remove(ticket.attendee.id)
-                        removed_count += 1
-                        print(
-                            f"DEBUG: Removed attendee {ticket.attendee.id} from event {event.id}"
-                        )
-
-            if removed_count > 0:
-                event.save()
-                print(f"DEBUG: Freed up {removed_count} spots for event {event.id}")
-
-        updated_count = 0
-        for ticket in tickets:
-            ticket.approval_status = new_status
-            if new_status == "approved":
-                ticket.approved_at = timezone.now()
-            else:
-                ticket.rejected_at = timezone.now()
-            ticket.save()
-
-            if new_status == "approved":
-                send_approval_notification(ticket)
-            else:
-                send_rejection_notification(ticket)
-
-            updated_count += 1
+        changed = apply_ticket_status(event, tickets, new_status, payload.reason or "")
 
         return 200, {
             "success": True,
-            "message": f"{updated_count} registration(s) {new_status}",
+            "message": f"{len(changed)} registration(s) {new_status}",
             "ticket_ids": payload.ticket_ids,
             "status": new_status,
-            "processed_count": updated_count,
+            "processed_count": len(changed),
         }
     except Exception as e:
         print(f"Error in bulk action: {e}")
@@ -97,6 +75,96 @@ def bulk_approve_reject(request, event_id: int, payload: schemas.ApprovalRequest
         return 400, {"error": str(e)}
 
 
+@router.post(
+    "/events/{event_id}/registrations/criteria-action",
+    auth=django_auth,
+    response={200: schemas.CriteriaActionProgressSchema, 403: schemas.ErrorSchema, 400: schemas.ErrorSchema},
+)
+def criteria_approve_reject(request, event_id: int, payload: schemas.CriteriaActionRequestSchema):
+    """
+    Approve or reject every registration matching criteria. The matches are counted
+    here and applied by a background task in chunks; poll the operation_id for
+    progress. Submitting the same operation_id again returns the existing run.
+    """
+    try:
+        event = get_object_or_404(Event, id=event_id)
+
+        if event.organizer_id != request.user.id:
+            return 403, {"error": "You are not authorized to perform this action"}
+
+        if payload.action not in ["approve", "reject"]:
+            return 400, {"error": "Invalid action. Must be 'approve' or 'reject'"}
+
+        criteria = payload.criteria.model_dump(mode="json")
+        if criteria["status"] not in TICKET_STATUSES:
+            return 400, {"error": f"Invalid status. Use one of: {', '.join(TICKET_STATUSES)}"}
+
+        new_status = "approved" if payload.action == "approve" else "rejected"
+        if criteria["status"] == new_status:
+            return 400, {"error": f"Registrations that are already {new_status} cannot be {new_status} again"}
+
+        operation_id = payload.operation_id or uuid.uuid4().hex
+        key = criteria_task_key(event.id, operation_id)
+        if not payload.dry_run:
+            existing = Task.objects.filter(key=key).order_by("-id").first()
+            if existing:
+                return 200, _criteria_progress(existing)
+
+        progress = {
+            "operation_id": operation_id,
+            "state": "preview" if payload.dry_run else "queued",
+            "action": payload.action,
+            "matched": criteria_queryset(event, criteria).count(),
+            "processed": 0,
+            "chunks": 0,
+            "progress": 0.0,
+            "error": None,
+        }
+        if payload.dry_run:
+            return 200, progress
+
+        with transaction.atomic():
+            task = apply_criteria_action.delay(
+                event.id, new_status, criteria, payload.reason or "", progress, _key=key
+            )
+            Task.objects.filter(id=task.id, result__isnull=True).update(result=progress)
+        return 200, progress
+    except Exception as e:
+        print(f"Error in criteria action: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 400, {"error": str(e)}
+
+
+def _criteria_progress(task: Task) -> dict:
+    """Progress of a criteria action from its task row, which the worker updates per chunk"""
+    progress = dict(task.result or {})
+    if task.status == "failed":
+        progress.update(state="failed", error=task.last_error.splitlines()[0] if task.last_error else None)
+    elif task.status == "queued" and progress.get("state") == "running":
+        # waiting for a retry after a failed attempt
+        progress["state"] = "queued"
+    return progress
+
+
+@router.get(
+    "/events/{event_id}/registrations/criteria-action/{operation_id}",
+    auth=django_auth,
+    response={200: schemas.CriteriaActionProgressSchema, 403: schemas.ErrorSchema, 404: schemas.ErrorSchema},
+)
+def get_criteria_action_progress(request, event_id: int, operation_id: str):
+    """Progress of a criteria action."""
+    event = get_object_or_404(Event, id=event_id)
+    if event.organizer_id != request.user.id:
+        return 403, {"error": "You are not authorized to perform this action"}
+
+    task = Task.objects.filter(key=criteria_task_key(event.id, operation_id)).order_by("-id").first()
+    if task is None or not task.result:
+        return 404, {"error": "Unknown operation"}
+    return 200, _criteria_progress(task)
+
+
 @router.post(
     "/events/{event_id}/registrations/{ticket_id}/approve",
     auth=django_auth,
@@ -119,11 +187,7 @@ def approve_registration(request, event_id: int, ticket_id: str):
                 qr_code=ticket_id, event=event
             )
 
-        ticket.approval_status = "approved"
-        ticket.approved_at = timezone.now()
-        ticket.save()
-
-        send_approval_notification(ticket)
+        apply_ticket_status(event, [ticket], "approved")
 
         return 200, {
             "success": True,
@@ -160,17 +224,8 @@ def reject_registration(request, event_id: int, ticket_id: str):
                 qr_code=ticket_id, event=event
             )
 
-        if ticket.attendee and isinstance(event.attendee, list):
-            if ticket.attendee.id in event.attendee:
-                event.attendee.remove(ticket.attendee.id)
-                event.save()
-                print(f"DEBUG: Removed attendee {ticket.attendee.id} from event {event.id}")
-
-        ticket.approval_status = "rejected"
-        ticket.rejected_at = timezone.now()
-        ticket.save()
-
-        send_rejection_notification(ticket)
+        # also removes the attendee from the event to free the spot
+        apply_ticket_status(event, [ticket], "rejected")
 
         return 200, {
             "success": True,
@@ -211,8 +266,21 @@ def approve_ticket(request, event_id: int, ticket_id: str, approval_status: str)
             )
             ticket = get_object_or_404(Ticket, id=ticket_id_num, event=event)
 
-        ticket.approval_status = approval_status
-        ticket.save()
+        with transaction.atomic():
+            # re-read under a row lock so a concurrent action is not counted twice
+            ticket = Ticket.objects.select_for_update().get(id=ticket.id)
+            if ticket.approval_status != approval_status:
+                transition = (ticket.approval_status, approval_status, extract_ticket_dates(ticket.event_dates))
+                ticket.approval_status = approval_status
+                if approval_status == "approved":
+                    ticket.approved_at = timezone.now()
+                else:
+                    ticket.revoked_at = timezone.now()
+                ticket.save()
+                record_ticket_transitions(event.id, [transition])
+
+        if approval_status != "approved":
+            revoke_ticket_tokens([ticket], reason=f"Registration {approval_status}")
 
         return 200, {
             "success": True,
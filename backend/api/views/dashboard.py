@@ -1,18 +1,25 @@
+from collections import defaultdict
 from datetime import datetime
 import traceback
 
-import pytz
 from ninja import Router
 from ninja.security import django_auth
 from django.shortcuts import get_object_or_404
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from api import schemas
 from api.model.event import Event
 from api.model.event_schedule import EventSchedule
 from api.model.ticket import Ticket
+from api.model.event_stats import get_event_stats
+from api.model.check_in import CheckIn, checked_in_dates_by_ticket, record_check_in
+from api.model.ticket_token import TicketTokenError, is_ticket_token, verify_ticket_token
+from api.pubsub import event_channel
 
-from .utils import convert_to_bangkok_time
+from .utils import convert_to_bangkok_time, extract_ticket_dates, sse_response
 
 router = Router(tags=["dashboard"])
 
@@ -30,45 +37,38 @@ def get_organizer_dashboard(request):
         return 401, {"error": "Not authenticated"}
 
     user = request.user
+    now = timezone.now()
 
     events = Event.objects.filter(organizer=user)
 
-    total_events = events.count()
-    upcoming_events = events.filter(event_end_date__gte=datetime.now()).count()
-    past_events = events.filter(event_end_date__lt=datetime.now()).count()
-
-    total_registrations = Ticket.objects.filter(event__organizer=user).count()
-
-    pending_approvals = Ticket.objects.filter(
-        event__organizer=user,
-        approval_status="pending",
-    ).count()
-
-    events_with_pending = []
-    for event in events:
-        pending_count = Ticket.objects.filter(
-            event=event,
-            approval_status="pending",
-        ).count()
-
-        if pending_count > 0:
-            events_with_pending.append(
-                {
-                    "event_id": event.id,
-                    "event_title": event.event_title,
-                    "pending_count": pending_count,
-                    "event_date": event.event_start_date.isoformat()
-                    if event.event_start_date
-                    else None,
-                }
-            )
+    summary = events.aggregate(
+        total_events=Count("id"),
+        upcoming_events=Count("id", filter=Q(event_end_date__gte=now)),
+        past_events=Count("id", filter=Q(event_end_date__lt=now)),
+        total_registrations=Coalesce(Sum("stats__registered"), 0),
+        pending_approvals=Coalesce(Sum("stats__pending"), 0),
+    )
+
+    pending_by_event = events.filter(stats__pending__gt=0).values(
+        "id", "event_title", "event_start_date", pending_count=F("stats__pending")
+    )
+
+    events_with_pending = [
+        {
+            "event_id": row["id"],
+            "event_title": row["event_title"],
+            "pending_count": row["pending_count"],
+            "event_date": row["event_start_date"].isoformat() if row["event_start_date"] else None,
+        }
+        for row in pending_by_event
+    ]
 
     return 200, {
-        "total_events": total_events,
-        "upcoming_events": upcoming_events,
-        "past_events": past_events,
-        "total_registrations": total_registrations,
-        "pending_approvals": pending_approvals,
+        "total_events": summary["total_events"],
+        "upcoming_events": summary["upcoming_events"],
+        "past_events": summary["past_events"],
+        "total_registrations": summary["total_registrations"],
+        "pending_approvals": summary["pending_approvals"],
         "events_with_pending": events_with_pending,
     }
 
@@ -83,8 +83,12 @@ def get_organizer_dashboard(request):
         400: schemas.ErrorSchema,
     },
 )
-def get_event_dashboard(request, event_id: int):
-    """Get dashboard data for event organizer"""
+def get_event_dashboard(request, event_id: int, include_attendees: bool = True):
+    """
+    Get dashboard data for event organizer.
+    Pass include_attendees=false and page through /events/{id}/attendees instead
+    of loading the whole roster here.
+    """
     try:
         event = get_object_or_404(Event, id=event_id)
 
@@ -92,6 +96,8 @@ def get_event_dashboard(request, event_id: int):
             return 403, {"error": "You are not authorized to view this dashboard"}
 
         tickets = Ticket.objects.filter(event=event).select_related("attendee")
+        if not include_attendees:
+            tickets = tickets.none()
 
         schedules = EventSchedule.objects.filter(event=event).order_by(
             "event_date", "start_time_event"
@@ -115,6 +121,12 @@ def get_event_dashboard(request, event_id: int):
                 }
             )
 
+        checked_in_dates = (
+            checked_in_dates_by_ticket(CheckIn.objects.filter(event=event))
+            if include_attendees
+            else {}
+        )
+
         attendees = []
         for ticket in tickets:
             user = ticket.attendee
@@ -141,17 +153,7 @@ def get_event_dashboard(request, event_id: int):
 
             about_me = user.about_me if isinstance(user.about_me, dict) else {}
 
-            checked_in_dates_dict = {}
-            if isinstance(ticket.checked_in_dates, dict):
-                checked_in_dates_dict = ticket.checked_in_dates
-            elif isinstance(ticket.checked_in_dates, list):
-                for date_str in ticket.checked_in_dates:
-                    if isinstance(date_str, str) and len(date_str) >= 10:
-                        checked_in_dates_dict[date_str[:10]] = (
-                            ticket.checked_in_at.isoformat()
-                            if ticket.checked_in_at
-                            else timezone.now().isoformat()
-                        )
+            checked_in_dates_dict = checked_in_dates.get(ticket.id, {})
 
             attendees.append(
                 {
@@ -180,11 +182,12 @@ def get_event_dashboard(request, event_id: int):
                 }
             )
 
-        total_registered = tickets.count()
-        checked_in = tickets.filter(checked_in_at__isnull=False).count()
-        approved = tickets.filter(approval_status="approved").count()
-        pending = tickets.filter(approval_status="pending").count()
-        rejected = tickets.filter(approval_status="rejected").count()
+        stats = get_event_stats(event)
+        total_registered = stats.registered
+        checked_in = stats.checked_in
+        approved = stats.approved
+        pending = stats.pending
+        rejected = stats.rejected
 
         attendance_rate = (checked_in / approved * 100) if approved > 0 else 0
 
@@ -219,10 +222,289 @@ def get_event_dashboard(request, event_id: int):
         return 400, {"error": str(e)}
 
 
+ROSTER_SORT_FIELDS = {
+    "registered": "purchase_date",
+    "name": "user_name",
+    "email": "user_email",
+    "ticket": "ticket_number",
+    "status": "approval_status",
+    "checked_in": "checked_in_at",
+}
+ROSTER_MAX_PAGE_SIZE = 200
+
+
+def _valid_on_day(tickets, day: str) -> Q:
+    """
+    Filter for tickets valid on day, read through extract_ticket_dates like the
+    dashboard counts. Tickets share a handful of date lists, so each distinct list
+    is checked once and the roster keeps paging in SQL.
+    Tickets without stored dates are valid on every day of the event.
+    """
+    matching = Q(pk__in=[])
+    for event_dates in tickets.order_by().values_list("event_dates", flat=True).distinct():
+        if not event_dates or day in extract_ticket_dates(event_dates):
+            matching |= Q(event_dates=event_dates)
+    return matching
+
+
+@router.get(
+    "/events/{event_id}/attendees",
+    auth=django_auth,
+    response={
+        200: schemas.AttendeeRosterSchema,
+        400: schemas.ErrorSchema,
+        403: schemas.ErrorSchema,
+        404: schemas.ErrorSchema,
+    },
+)
+def get_event_attendees(
+    request,
+    event_id: int,
+    page: int = 1,
+    page_size: int = 50,
+    status: str = None,
+    day: str = None,
+    checked_in: bool = None,
+    search: str = None,
+    sort: str = "-registered",
+):
+    """
+    Paginated attendee roster for the organizer dashboard.
+    status filters on approval status, day on a YYYY-MM-DD event day, checked_in
+    on attendance (for that day when day is given). search matches name, email or
+    ticket code; sort is one of ROSTER_SORT_FIELDS, prefixed with "-" for descending.
+    """
+    try:
+        event = get_object_or_404(Event, id=event_id)
+
+        if event.organizer != request.user:
+            return 403, {"error": "You are not authorized to view this dashboard"}
+
+        tickets = Ticket.objects.filter(event=event)
+
+        if status:
+            if status not in ("approved", "pending", "rejected"):
+                return 400, {"error": "Invalid status. Use approved, pending or rejected."}
+            tickets = tickets.filter(approval_status=status)
+
+        if day:
+            try:
+                day = datetime.strptime(day, "%Y-%m-%d").date()
+            except ValueError:
+                return 400, {"error": "Invalid date format. Use YYYY-MM-DD."}
+            tickets = tickets.filter(_valid_on_day(tickets, day.isoformat()))
+
+        if checked_in is not None:
+            if day:
+                attended = Exists(CheckIn.objects.filter(ticket=OuterRef("pk"), day=day))
+                tickets = tickets.filter(attended if checked_in else ~attended)
+            else:
+                tickets = tickets.filter(checked_in_at__isnull=not checked_in)
+
+        if search and search.strip():
+            term = search.strip()
+            tickets = tickets.filter(
+                Q(user_name__icontains=term)
+                | Q(user_email__icontains=term)
+                | Q(ticket_number__iexact=term)
+                | Q(qr_code=term)
+            )
+
+        descending = sort.startswith("-")
+        sort_field = ROSTER_SORT_FIELDS.get(sort.lstrip("-"))
+        if not sort_field:
+            return 400, {
+                "error": f"Invalid sort. Use one of: {', '.join(ROSTER_SORT_FIELDS)}"
+            }
+        prefix = "-" if descending else ""
+        tickets = tickets.order_by(f"{prefix}{sort_field}", f"{prefix}id")
+
+        page_size = max(1, min(page_size, ROSTER_MAX_PAGE_SIZE))
+        page = max(1, page)
+        total_items = tickets.count()
+        offset = (page - 1) * page_size
+
+        rows = list(
+            tickets.values(
+                "id",
+                "qr_code",
+                "ticket_number",
+                "user_name",
+                "user_email",
+                "approval_status",
+                "purchase_date",
+                "approved_at",
+                "rejected_at",
+                "checked_in_at",
+                "event_dates",
+                "attendee__first_name",
+                "attendee__last_name",
+                "attendee__email",
+                "attendee__username",
+            )[offset : offset + page_size]
+        )
+
+        checked_in_dates = checked_in_dates_by_ticket(
+            CheckIn.objects.filter(ticket_id__in=[row["id"] for row in rows])
+        )
+        default_day = event.event_start_date.date().isoformat() if event.event_start_date else ""
+
+        attendees = []
+        for row in rows:
+            if row["checked_in_at"]:
+                row_status = "present"
+            elif row["approval_status"] == "pending":
+                row_status = "pending"
+            else:
+                row_status = "absent"
+
+            ticket_dates = extract_ticket_dates(row["event_dates"])
+            name = f"{row['attendee__first_name'] or ''} {row['attendee__last_name'] or ''}".strip()
+
+            attendees.append(
+                {
+                    "ticketId": row["qr_code"],
+                    "displayTicketId": row["ticket_number"] or f"T{row['id']}",
+                    "name": name or row["user_name"],
+                    "email": row["attendee__email"] or row["user_email"],
+                    "username": row["attendee__username"],
+                    "status": row_status,
+                    "approvalStatus": row["approval_status"],
+                    "registered": row["purchase_date"].isoformat(),
+                    "approvedAt": row["approved_at"].isoformat() if row["approved_at"] else "",
+                    "rejectedAt": row["rejected_at"].isoformat() if row["rejected_at"] else "",
+                    "checkedIn": row["checked_in_at"].isoformat() if row["checked_in_at"] else "",
+                    "eventDate": ticket_dates[0] if ticket_dates else default_day,
+                    "checkedInDates": checked_in_dates.get(row["id"], {}),
+                }
+            )
+
+        return 200, {
+            "attendees": attendees,
+            "pagination": {
+                "page": page,
+                "page_size": page_size,
+                "total_items": total_items,
+                "total_pages": (total_items + page_size - 1) // page_size,
+            },
+        }
+    except Exception as e:
+        print(f"Error fetching attendees: {e}")
+        traceback.print_exc()
+        return 400, {"error": str(e)}
+
+
+def _live_counter_snapshot(event: Event) -> dict:
+    """
+    Full counters the live dashboard starts from before applying pushed deltas.
+    All counts are read in one database snapshot together with the stats version.
+    """
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+
+        stats = get_event_stats(event)
+
+        days = defaultdict(lambda: {"approved": 0, "pending": 0, "rejected": 0, "checked_in": 0})
+        # tickets of an event share a handful of date lists, so count them per list in SQL
+        per_dates = (
+            Ticket.objects.filter(event=event)
+            .values("approval_status", "event_dates")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        for row in per_dates:
+            for day in extract_ticket_dates(row["event_dates"]):
+                days[day][row["approval_status"]] += row["count"]
+
+        per_day = CheckIn.objects.filter(event=event).values("day").annotate(count=Count("id")).order_by()
+        for row in per_day:
+            days[row["day"].isoformat()]["checked_in"] = row["count"]
+
+    return {"event_id": event.id, "version": stats.version, "totals": stats.as_dict(), "days": dict(days)}
+
+
+@router.get(
+    "/events/{event_id}/dashboard/stream",
+    auth=django_auth,
+    response={403: schemas.ErrorSchema},
+)
+def stream_event_dashboard(request, event_id: int):
+    """
+    Server-Sent Events stream of attendance counters for the organizer dashboard.
+    Sends a `snapshot` event first, then `delta` events as check-ins and approvals happen.
+    The stream subscribes before the snapshot is read, so a change can arrive both
+    in the snapshot and as a delta: clients apply only deltas whose `version` is
+    greater than the snapshot's.
+    """
+    event = get_object_or_404(Event, id=event_id)
+
+    if event.organizer != request.user:
+        return 403, {"error": "You are not authorized to view this dashboard"}
+
+    return sse_response(request, event_channel(event.id), snapshot=lambda: _live_counter_snapshot(event))
+
+
+def _check_in_with_signed_token(request, token: str, payload: schemas.CheckInRequestSchema):
+    """
+    Check in from a signed QR token. Forged, expired, revoked, wrong-event and
+    wrong-day tokens are refused from the cached keyring. Moving a ticket away from
+    approved revokes its tokens in every process, so the database is only touched to
+    record the check-in; the CheckIn unique constraint catches repeat scans and the
+    ticket foreign key catches deleted tickets.
+    """
+    check_in_day = timezone.localdate()
+    event_date_str = None
+    if payload.event_date:
+        try:
+            check_in_day = datetime.strptime(payload.event_date, "%Y-%m-%d").date()
+            event_date_str = check_in_day.isoformat()
+        except ValueError:
+            return 400, {"error": "Invalid date format. Use YYYY-MM-DD."}
+
+    try:
+        claims, keyring = verify_ticket_token(token, event_id=payload.event_id, day=event_date_str)
+    except TicketTokenError as e:
+        return 400, {"error": str(e)}
+
+    if keyring["organizer_id"] != request.user.id:
+        return 403, {"error": "You are not authorized to check in attendees for this event"}
+
+    ticket = Ticket(id=claims["t"], event_id=claims["e"])
+    try:
+        check_in, created = record_check_in(ticket, check_in_day)
+    except IntegrityError:
+        return 400, {"error": "Ticket not found"}
+
+    if created:
+        message = f"Check-in successful for {event_date_str or 'event'}"
+    else:
+        formatted_time = convert_to_bangkok_time(check_in.scanned_at).strftime("%d/%m/%Y %H:%M")
+        message = f"Already checked in for {check_in_day.isoformat()} at {formatted_time}"
+
+    return 200, {
+        "success": created,
+        "message": message,
+        "ticket_id": str(claims["t"]),
+        "attendee_name": claims.get("n") or "",
+        "event_title": keyring["event_title"],
+        "event_date": event_date_str,
+        "already_checked_in": not created,
+        "checked_in_at": check_in.scanned_at.isoformat(),
+        "approval_status": "approved",
+    }
+
+
 @router.post(
     "/checkin",
     auth=django_auth,
-    response={200: schemas.CheckInResponseSchema, 400: schemas.ErrorSchema, 403: schemas.ErrorSchema},
+    response={
+        200: schemas.CheckInResponseSchema,
+        400: schemas.ErrorSchema,
+        403: schemas.ErrorSchema,
+        500: schemas.ErrorSchema,
+    },
 )
 def check_in_attendee(request, payload: schemas.CheckInRequestSchema):
     """
@@ -232,6 +514,9 @@ def check_in_attendee(request, payload: schemas.CheckInRequestSchema):
     try:
         ticket_identifier = payload.qr_code.strip()
 
+        if is_ticket_token(ticket_identifier):
+            return _check_in_with_signed_token(request, ticket_identifier, payload)
+
         ticket = None
         if len(ticket_identifier) > 20 and "-" in ticket_identifier:
             try:
@@ -292,20 +577,7 @@ def check_in_attendee(request, payload: schemas.CheckInRequestSchema):
                 return 400, {"error": "Invalid date format. Use YYYY-MM-DD."}
 
         if event_date_str:
-            valid_dates = []
-            for d in ticket.event_dates or []:
-                if isinstance(d, dict):
-                    date_val = d.get("date")
-                    if date_val:
-                        if len(str(date_val)) >= 10:
-                            valid_dates.append(str(date_val)[:10])
-                elif isinstance(d, str):
-                    try:
-                        dt = datetime.fromisoformat(d)
-                        valid_dates.append(dt.date().isoformat())
-                    except ValueError:
-                        if len(d) >= 10:
-                            valid_dates.append(d[:10])
+            valid_dates = extract_ticket_dates(ticket.event_dates)
 
             if valid_dates and event_date_str not in valid_dates:
                 return 400, {
@@ -313,47 +585,26 @@ def check_in_attendee(request, payload: schemas.CheckInRequestSchema):
                     f"Valid dates: {', '.join(valid_dates)}"
                 }
 
-        if not isinstance(ticket.checked_in_dates, dict):
-            ticket.checked_in_dates = {}
-
-        if event_date_str and event_date_str in ticket.checked_in_dates:
-            checked_time = ticket.checked_in_dates[event_date_str]
-            try:
-                if isinstance(checked_time, str):
-                    checked_time_str = checked_time.replace("Z", "+00:00")
-                    dt = datetime.fromisoformat(checked_time_str)
-                else:
-                    dt = checked_time
-
-                if dt.tzinfo is None:
-                    dt = pytz.UTC.localize(dt)
+        check_in_day = parsed_date if event_date_str else timezone.localdate()
+        check_in, created = record_check_in(ticket, check_in_day)
 
-                bangkok_dt = convert_to_bangkok_time(dt)
-                formatted_time = bangkok_dt.strftime("%d/%m/%Y %H:%M")
-            except Exception:
-                formatted_time = str(checked_time)
+        if not created:
+            checked_time = check_in.scanned_at
+            bangkok_dt = convert_to_bangkok_time(checked_time)
+            formatted_time = bangkok_dt.strftime("%d/%m/%Y %H:%M")
 
             return 200, {
                 "success": False,
-                "message": f"Already checked in for {event_date_str} at {formatted_time}",
+                "message": f"Already checked in for {check_in_day.isoformat()} at {formatted_time}",
                 "ticket_id": ticket.qr_code,
                 "attendee_name": ticket.user_name or ticket.attendee.username,
                 "event_title": ticket.event_title or ticket.event.event_title,
                 "event_date": event_date_str,
                 "already_checked_in": True,
-                "checked_in_at": checked_time,
+                "checked_in_at": checked_time.isoformat(),
                 "approval_status": ticket.approval_status,
             }
 
-        now = timezone.now()
-
-        if event_date_str:
-            ticket.checked_in_dates[event_date_str] = now.isoformat()
-
-        ticket.checked_in_at = now
-        ticket.status = "present"
-        ticket.save()
-
         return 200, {
             "success": True,
             "message": f"Check-in successful for {event_date_str or 'event'}",
@@ -362,13 +613,14 @@ def check_in_attendee(request, payload: schemas.CheckInRequestSchema):
             "event_title": ticket.event_title or ticket.event.event_title,
             "event_date": event_date_str,
             "already_checked_in": False,
-            "checked_in_at": now.isoformat(),
+            "checked_in_at": check_in.scanned_at.isoformat(),
             "approval_status": ticket.approval_status,
         }
     except Exception as e:
+        # refused scans return 400 above; anything raised here is a server failure
         print(f"Error during check-in: {e}")
         traceback.print_exc()
-        return 400, {"error": str(e)}
+        return 500, {"error": str(e)}
 
 
 @router.post(
@@ -420,54 +672,20 @@ def check_in_attendee_legacy(request, event_id: int, ticket_id: str, checkin_dat
 
         date_str = parsed_date.isoformat()
 
-        valid_dates: list[str] = []
-        for d in ticket.event_dates or []:
-            if isinstance(d, dict):
-                date_val = d.get("date")
-                if date_val and len(str(date_val)) >= 10:
-                    valid_dates.append(str(date_val)[:10])
-            elif isinstance(d, str):
-                try:
-                    dt = datetime.fromisoformat(d)
-                    valid_dates.append(dt.date().isoformat())
-                except ValueError:
-                    if len(d) >= 10:
-                        valid_dates.append(d[:10])
-            else:
-                try:
-                    if hasattr(d, "date"):
-                        valid_dates.append(d.date().isoformat())
-                    elif hasattr(d, "isoformat"):
-                        valid_dates.append(d.isoformat())
-                except Exception:
-                    pass
+        valid_dates = extract_ticket_dates(ticket.event_dates)
 
         if valid_dates and date_str not in valid_dates:
             return 400, {"error": f"Ticket '{ticket_id}' not found for this event."}
 
-        if not isinstance(ticket.checked_in_dates, dict):
-            ticket.checked_in_dates = {}
-
-        if date_str in ticket.checked_in_dates:
-            return 200, {
-                "success": True,
-                "message": "Attendee already checked in for this date",
-                "ticket_id": ticket_id,
-                "status": "present",
-                "checked_in_dates": ticket.checked_in_dates,
-            }
-
-        ticket.checked_in_dates[date_str] = timezone.now().isoformat()
-        ticket.checked_in_at = timezone.now()
-        ticket.status = "present"
-        ticket.save()
+        _, created = record_check_in(ticket, parsed_date)
+        checked_in_dates = checked_in_dates_by_ticket(ticket.check_ins.all()).get(ticket.id, {})
 
         return 200, {
             "success": True,
-            "message": "Attendee checked in",
+            "message": "Attendee checked in" if created else "Attendee already checked in for this date",
             "ticket_id": ticket_id,
             "status": "present",
-            "checked_in_dates": ticket.checked_in_dates,
+            "checked_in_dates": checked_in_dates,
         }
 
     except Exception as e:
@@ -12,7 +12,11 @@ from api import schemas
 from api.model.ticket import Ticket
 from api.model.event import Event
 from api.model.event_schedule import EventSchedule
-from api.model.notification import send_event_creation_notification_to_admins
+from api.model.notification import (
+    send_event_creation_notification_to_admins,
+    send_event_import_notification_to_admins,
+)
+from api.event_import import import_events
 
 router = Router(tags=["events"])
 
@@ -226,6 +230,54 @@ def create_event(
         return 400, {"error": str(e)}
 
 
+@router.post(
+    "/events/import",
+    auth=django_auth,
+    response={200: schemas.EventImportResultSchema, 400: schemas.ErrorSchema},
+)
+def import_events_file(
+    request,
+    file: UploadedFile = File(...),
+    end_date_register: str = Form(default=""),
+):
+    """
+    Create events in bulk from an .ics or .csv file. Records are matched on
+    their UID, so importing an updated calendar again updates those events.
+    Registration closes at each event's start unless end_date_register is given.
+    """
+    try:
+        extension = (file.name or "").rsplit(".", 1)[-1].lower()
+        if extension not in ("ics", "csv"):
+            return 400, {"error": "Upload an .ics or .csv file"}
+
+        registration_end = None
+        if end_date_register.strip():
+            registration_end = datetime.fromisoformat(end_date_register.replace("Z", "+00:00"))
+
+        summary = import_events(request.user, file, extension, registration_end)
+        send_event_import_notification_to_admins(
+            request.user, summary["created"], summary["updated"]
+        )
+
+        return 200, {
+            "success": True,
+            "message": (
+                f"{summary['created']} event(s) created, {summary['updated']} updated, "
+                f"{summary['failed']} failed"
+            ),
+            **summary,
+        }
+
+    except ValueError as e:
+        return 400, {"error": str(e)}
+    except Exception as e:
+        print(f"ERROR: Failed to import events: {str(e)}")
+        import traceback
+
+        traceback.print_exc()
+        return 400, {"error": str(e)}
+
+
 @router.get("/events/{event_id}", response=schemas.EventDetailSchema)
 def get_event_detail(request, event_id: int):
     """
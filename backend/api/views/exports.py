@@ -0,0 +1,124 @@
+from ninja import Router
+from ninja.security import django_auth
+from django.http import FileResponse, HttpResponse
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+
+from api import schemas
+from api.exports import format_available
+from api.model.event import Event
+from api.model.export_job import EXPORT_COLUMNS, EXPORT_FORMATS, ExportJob, submit_export_job
+from api.tasks import build_export
+
+from .utils import stream_content
+
+router = Router(tags=["exports"])
+
+DOWNLOAD_BLOCKS_PER_STEP = 64  # FileResponse blocks of 4 KB
+
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _job_response(job: ExportJob) -> dict:
+    progress = 100.0 if job.status == "done" else 0.0
+    if job.status != "done" and job.total_rows:
+        progress = round(job.rows_written / job.total_rows * 100, 1)
+
+    return {
+        "id": job.id,
+        "status": job.status,
+        "format": job.format,
+        "columns": job.spec.get("columns", []),
+        "total_rows": job.total_rows,
+        "rows_written": job.rows_written,
+        "progress": progress,
+        "error": job.error or None,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+        "download_url": f"/api/exports/{job.id}/download" if job.status == "done" else None,
+    }
+
+
+@router.post(
+    "/exports",
+    auth=django_auth,
+    response={200: schemas.ExportJobSchema, 400: schemas.ErrorSchema, 403: schemas.ErrorSchema},
+)
+def create_export_job(request, payload: schemas.ExportJobCreateSchema):
+    """
+    Queue a registration export across events. Admins may export any event,
+    everyone else the events they organize. Poll GET /exports/{id} until status is done.
+    """
+    try:
+        user = request.user
+        if payload.format not in EXPORT_FORMATS:
+            return 400, {"error": f"Invalid format. Use one of: {', '.join(EXPORT_FORMATS)}"}
+        if not format_available(payload.format):
+            return 400, {"error": f"{payload.format} exports are not available on this server"}
+
+        columns = payload.columns or list(EXPORT_COLUMNS)
+        unknown = [name for name in columns if name not in EXPORT_COLUMNS]
+        if unknown:
+            return 400, {"error": f"Unknown columns: {', '.join(unknown)}"}
+
+        event_ids = sorted(set(payload.event_ids))
+        organizer_id = None if user.role == "admin" else user.id
+        if organizer_id and event_ids:
+            owned = Event.objects.filter(id__in=event_ids, organizer_id=organizer_id).count()
+            if owned != len(event_ids):
+                return 403, {"error": "You can only export your own events"}
+
+        spec = {
+            "format": payload.format,
+            "columns": columns,
+            "event_ids": event_ids,
+            "organizer_id": organizer_id,
+        }
+        with transaction.atomic():
+            job = submit_export_job(user, spec, refresh=payload.refresh)
+            if job.status == "queued":
+                build_export.delay(job.id, _key=f"export:{job.id}")
+
+        return 200, _job_response(job)
+    except Exception as e:
+        print(f"Error creating export job: {e}")
+        return 400, {"error": str(e)}
+
+
+@router.get(
+    "/exports/{job_id}",
+    auth=django_auth,
+    response={200: schemas.ExportJobSchema, 404: schemas.ErrorSchema},
+)
+def get_export_job(request, job_id: int):
+    """Progress of an export job."""
+    job = get_object_or_404(ExportJob, id=job_id, requested_by=request.user)
+    return 200, _job_response(job)
+
+
+@router.get("/exports/{job_id}/download", auth=django_auth)
+def download_export(request, job_id: int):
+    """Download the artifact of a finished export job."""
+    job = get_object_or_404(ExportJob, id=job_id, requested_by=request.user)
+
+    if job.status != "done" or not job.file:
+        return HttpResponse("Export is not ready", status=409)
+
+    filename = f"registrations_{job.id}.{job.format}"
+    response = FileResponse(
+        job.file.open("rb"),
+        as_attachment=True,
+        filename=filename,
+        content_type=CONTENT_TYPES[job.format],
+    )
+    # read the artifact in DOWNLOAD_BLOCKS_PER_STEP blocks at a time under ASGI
+    # instead of loading it whole; the file is still closed with the response
+    response.streaming_content = stream_content(
+        request, response.streaming_content, items_per_step=DOWNLOAD_BLOCKS_PER_STEP
+    )
+    return response
@@ -1,12 +1,13 @@
 import json
 import traceback
+from datetime import timedelta
 from typing import List
 
 from ninja import Router
 from ninja.security import django_auth
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.db.models import Avg, Count
+from django.db.models import Avg, Count, Max
 
 from api import schemas
 from api.model.event import Event
@@ -14,9 +15,14 @@ from api.model.comment import Comment
 from api.model.rating import Rating
 from api.model.ticket import Ticket
 from api.model.event_feedback import EventFeedback
+from api.model.task import Task
+from api.tasks import summarize_feedback
 
 router = Router(tags=["feedback"])
 
+# a failed n8n summary is not retried for the same feedback before this has passed
+FEEDBACK_SUMMARY_RETRY_AFTER = timedelta(minutes=30)
+
 
 @router.post(
     "/events/{event_id}/comments",
@@ -307,7 +313,8 @@ def get_event_feedback_list(request, event_id: int):
 def get_event_feedback_report(request, event_id: int):
     """
     Full feedback report for an event (organizer/admin only).
-    Includes aggregates + all feedback + optional AI summary via n8n.
+    Includes aggregates + all feedback + optional AI summary via n8n,
+    built in the background (ai_summary_pending until it is ready).
     """
     try:
         event = get_object_or_404(Event, id=event_id)
@@ -353,32 +360,27 @@ def get_event_feedback_report(request, event_id: int):
                 }
             )
 
+        # the n8n summary runs on the worker; it is keyed by the feedback it saw,
+        # so new or edited feedback queues a fresh summary
         ai_summary = ""
-        try:
-            from django.conf import settings
-            import requests
-
-            n8n_url = getattr(settings, "N8N_FEEDBACK_SUMMARY_URL", None)
-
-            if n8n_url and comments_exist:
-                payload = {
-                    "event_title": event.event_title,
-                    "feedback": [
-                        {"rating": fb.rating, "comment": fb.comment or ""} for fb in qs
-                    ],
-                }
-
-                resp = requests.post(n8n_url, json=payload, timeout=20)
-                resp.raise_for_status()
-
-                data = resp.json()
-
-                if isinstance(data, dict):
-                    ai_summary = (data.get("output") or "").strip()
-                elif isinstance(data, list) and data and isinstance(data[0], dict):
-                    ai_summary = (data[0].get("output") or "").strip()
-        except Exception:
-            ai_summary = ""
+        ai_summary_pending = False
+        if comments_exist:
+            latest = qs.aggregate(latest=Max("updated_at"))["latest"]
+            key = f"feedback-summary:{event.id}:{total}:{latest.timestamp() if latest else 0}"
+            summary_task = (
+                Task.objects.filter(key=key, status__in=["done", "failed"]).order_by("-finished_at").first()
+            )
+            retry_failed = (
+                summary_task is not None
+                and summary_task.status == "failed"
+                and summary_task.finished_at < timezone.now() - FEEDBACK_SUMMARY_RETRY_AFTER
+            )
+            if summary_task is None or retry_failed:
+                summarize_feedback.delay(event.id, _key=key)
+                ai_summary_pending = True
+            elif summary_task.status == "done":
+                ai_summary = (summary_task.result or {}).get("summary", "")
+            # after a recent failure the summary stays empty instead of queueing a task per view
 
         return 200, {
             "aggregates": {
@@ -388,6 +390,7 @@ def get_event_feedback_report(request, event_id: int):
                 "anonymous_count": anonymous_count,
             },
             "ai_summary": ai_summary,
+            "ai_summary_pending": ai_summary_pending,
             "feedback": feedback_list,
         }
 
@@ -0,0 +1,356 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone as dt_timezone
+import re
+import traceback
+import uuid
+
+from ninja import Router
+from ninja.security import django_auth
+from django.db import transaction
+from django.db.models import Max, Q
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+
+from api import schemas
+from api.model.event import Event
+from api.model.ticket import Ticket
+from api.model.check_in import CheckIn, invalidate_attendance_timeseries
+from api.model.event_stats import update_event_stats
+from api.model.ticket_token import revoke_ticket_tokens, rotate_signing_key
+from api.pubsub import publish_event_counters
+
+from .utils import extract_ticket_dates
+
+router = Router(tags=["gate"])
+
+MANIFEST_ENCODING = "uuid-hex-delta-v1"
+TICKET_NUMBER_RE = re.compile(r"^T(\d+)$")
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def encode_qr_codes(codes) -> list[str]:
+    """
+    Sort UUID qr codes by their integer value and delta-encode them as hex.
+    The first entry is absolute, every following entry is the gap to the previous one.
+    """
+    values = sorted({uuid.UUID(code).int for code in codes})
+    encoded = []
+    previous = 0
+    for value in values:
+        encoded.append(format(value - previous, "x"))
+        previous = value
+    return encoded
+
+
+def encode_ticket_numbers(numbers) -> list[int]:
+    """Sort the numeric part of ticket numbers and delta-encode them."""
+    values = sorted(set(numbers))
+    return [value - previous for previous, value in zip([0] + values, values)]
+
+
+def _split_codes(rows):
+    qr_codes, ticket_numbers = [], []
+    for row in rows:
+        try:
+            qr_codes.append(str(uuid.UUID(row["qr_code"])))
+        except (TypeError, ValueError):
+            pass
+        match = TICKET_NUMBER_RE.match(row["ticket_number"] or "")
+        if match:
+            ticket_numbers.append(int(match.group(1)))
+    return qr_codes, ticket_numbers
+
+
+def _version_to_datetime(version: int):
+    return EPOCH + timedelta(microseconds=version)
+
+
+def _datetime_to_version(dt) -> int:
+    """Manifest versions are the latest approval, revocation or deletion time in epoch microseconds."""
+    return (dt - EPOCH) // timedelta(microseconds=1) if dt else 0
+
+
+@router.get(
+    "/events/{event_id}/gate/manifest",
+    auth=django_auth,
+    response={200: schemas.GateManifestSchema, 400: schemas.ErrorSchema, 403: schemas.ErrorSchema},
+)
+def get_gate_manifest(request, event_id: int, day: str, since: int = None):
+    """
+    Export the approved ticket codes valid on one event day for offline gates.
+    Pass the previous manifest's `version` as `since` to receive only the changes;
+    a manifest without `since` is complete and replaces what the gate holds.
+    """
+    try:
+        event = get_object_or_404(Event, id=event_id)
+
+        if event.organizer != request.user:
+            return 403, {"error": "You are not authorized to export this event's manifest"}
+
+        try:
+            day = datetime.strptime(day, "%Y-%m-%d").date().isoformat()
+        except ValueError:
+            return 400, {"error": "Invalid date format. Use YYYY-MM-DD."}
+
+        tickets = Ticket.objects.filter(event=event)
+
+        latest = tickets.aggregate(approved=Max("approved_at"), revoked=Max("revoked_at"))
+        version = max(
+            _datetime_to_version(latest["approved"]),
+            _datetime_to_version(latest["revoked"]),
+            _datetime_to_version(event.tickets_deleted_at),
+        )
+
+        # deleted tickets cannot be listed as removed, so such a gate gets everything again
+        deleted_at = event.tickets_deleted_at
+        if since is not None and deleted_at and _version_to_datetime(since) < deleted_at:
+            since = None
+
+        added = tickets.filter(approval_status="approved")
+        removed = Ticket.objects.none()
+        if since is not None:
+            since_dt = _version_to_datetime(since)
+            added = added.filter(approved_at__gt=since_dt)
+            removed = tickets.exclude(approval_status="approved").filter(revoked_at__gt=since_dt)
+
+        def rows_for_day(queryset):
+            rows = queryset.values("qr_code", "ticket_number", "event_dates")
+            return [
+                row
+                for row in rows
+                if not row["event_dates"] or day in extract_ticket_dates(row["event_dates"])
+            ]
+
+        added_rows = rows_for_day(added)
+        qr_codes, ticket_numbers = _split_codes(added_rows)
+        removed_qr_codes, removed_ticket_numbers = _split_codes(rows_for_day(removed))
+
+        return 200, {
+            "event_id": event.id,
+            "day": day,
+            "version": version,
+            "since": since,
+            "encoding": MANIFEST_ENCODING,
+            "count": len(added_rows),
+            "qr_codes": encode_qr_codes(qr_codes),
+            "ticket_numbers": encode_ticket_numbers(ticket_numbers),
+            "removed_qr_codes": encode_qr_codes(removed_qr_codes),
+            "removed_ticket_numbers": encode_ticket_numbers(removed_ticket_numbers),
+            "generated_at": timezone.now(),
+        }
+    except Exception as e:
+        print(f"Error exporting gate manifest: {e}")
+        traceback.print_exc()
+        return 400, {"error": str(e)}
+
+
+@router.post(
+    "/events/{event_id}/gate/scans",
+    auth=django_auth,
+    response={
+        200: schemas.GateScanUploadResponseSchema,
+        400: schemas.ErrorSchema,
+        403: schemas.ErrorSchema,
+    },
+)
+def upload_gate_scans(request, event_id: int, payload: schemas.GateScanUploadSchema):
+    """
+    Reconcile scans recorded offline into the CheckIn ledger.
+    The earliest scan for a ticket and day wins, later ones are reported as duplicates.
+    """
+    try:
+        event = get_object_or_404(Event, id=event_id)
+
+        if event.organizer != request.user:
+            return 403, {"error": "You are not authorized to check in attendees for this event"}
+
+        scans = sorted(payload.scans, key=lambda s: s.scanned_at)
+        codes = {scan.code.strip() for scan in scans}
+
+        results = []
+        with transaction.atomic():
+            tickets = (
+                Ticket.objects.select_for_update()
+                .filter(event=event)
+                .filter(Q(qr_code__in=codes) | Q(ticket_number__in=codes))
+            )
+            by_code = {}
+            for ticket in tickets:
+                by_code[ticket.qr_code] = ticket
+                if ticket.ticket_number:
+                    by_code[ticket.ticket_number] = ticket
+
+            ledger = {
+                (check_in.ticket_id, check_in.day): check_in
+                for check_in in CheckIn.objects.filter(
+                    ticket_id__in={ticket.id for ticket in by_code.values()}
+                )
+            }
+
+            new_check_ins, moved_check_ins, changed_tickets = [], {}, {}
+            first_check_ins = set()
+            for scan in scans:
+                code = scan.code.strip()
+                scanned_at = scan.scanned_at
+                if timezone.is_naive(scanned_at):
+                    scanned_at = timezone.make_aware(scanned_at)
+
+                result = {"code": code, "event_date": scan.event_date}
+                results.append(result)
+
+                try:
+                    day = datetime.strptime(scan.event_date, "%Y-%m-%d").date()
+                except ValueError:
+                    result["result"] = "invalid_date"
+                    continue
+
+                ticket = by_code.get(code)
+                if not ticket:
+                    result["result"] = "unknown"
+                    continue
+
+                if ticket.approval_status != "approved":
+                    result["result"] = "not_approved"
+                    continue
+
+                valid_dates = extract_ticket_dates(ticket.event_dates)
+                if valid_dates and day.isoformat() not in valid_dates:
+                    result["result"] = "wrong_day"
+                    continue
+
+                existing = ledger.get((ticket.id, day))
+                if existing and existing.scanned_at <= scanned_at:
+                    result["result"] = "duplicate"
+                    result["checked_in_at"] = existing.scanned_at.isoformat()
+                    continue
+
+                if existing:
+                    # An online check-in was recorded after this gate had already admitted the ticket
+                    existing.scanned_at = scanned_at
+                    existing.gate = payload.gate
+                    moved_check_ins[existing.id] = existing
+                else:
+                    check_in = CheckIn(
+                        ticket=ticket,
+                        event=event,
+                        day=day,
+                        scanned_at=scanned_at,
+                        gate=payload.gate,
+                    )
+                    ledger[(ticket.id, day)] = check_in
+                    new_check_ins.append(check_in)
+
+                if not ticket.checked_in_at:
+                    first_check_ins.add(ticket.id)
+                if not ticket.checked_in_at or ticket.checked_in_at < scanned_at:
+                    ticket.checked_in_at = scanned_at
+                ticket.status = "present"
+                changed_tickets[ticket.id] = ticket
+
+                result["result"] = "accepted"
+                result["checked_in_at"] = scanned_at.isoformat()
+
+            CheckIn.objects.bulk_create(new_check_ins, ignore_conflicts=True)
+            CheckIn.objects.bulk_update(moved_check_ins.values(), ["scanned_at", "gate"])
+            Ticket.objects.bulk_update(changed_tickets.values(), ["checked_in_at", "status"])
+
+            version = None
+            if new_check_ins:
+                version = update_event_stats(event.id, {"checked_in": len(first_check_ins)})
+            invalidate_attendance_timeseries(
+                event.id,
+                [c.day for c in new_check_ins] + [c.day for c in moved_check_ins.values()],
+            )
+            checked_in_per_day = Counter(check_in.day.isoformat() for check_in in new_check_ins)
+            publish_event_counters(
+                event.id,
+                totals={"checked_in": len(first_check_ins)},
+                days={day: {"checked_in": count} for day, count in checked_in_per_day.items()},
+                version=version,
+            )
+
+        accepted = sum(1 for r in results if r["result"] == "accepted")
+        duplicates = sum(1 for r in results if r["result"] == "duplicate")
+
+        print(
+            f"DEBUG: Gate {payload.gate or 'unknown'} uploaded {len(results)} scans for event "
+            f"{event.id}: {accepted} accepted, {duplicates} duplicates"
+        )
+
+        return 200, {
+            "success": True,
+            "accepted": accepted,
+            "duplicates": duplicates,
+            "rejected": len(results) - accepted - duplicates,
+            "results": results,
+        }
+    except Exception as e:
+        print(f"Error reconciling gate scans: {e}")
+        traceback.print_exc()
+        return 400, {"error": str(e)}
+
+
+@router.post(
+    "/events/{event_id}/gate/keys/rotate",
+    auth=django_auth,
+    response={
+        200: schemas.SigningKeyRotateResponseSchema,
+        400: schemas.ErrorSchema,
+        403: schemas.ErrorSchema,
+    },
+)
+def rotate_gate_signing_key(request, event_id: int, payload: schemas.SigningKeyRotateSchema):
+    """
+    Start signing QR tokens with a new key.
+    Tokens signed with older keys keep working unless retire_previous is set.
+    """
+    try:
+        event = get_object_or_404(Event, id=event_id)
+
+        if event.organizer != request.user:
+            return 403, {"error": "You are not authorized to manage this event's keys"}
+
+        key = rotate_signing_key(event, retire_previous=payload.retire_previous)
+
+        return 200, {
+            "success": True,
+            "message": "Signing key rotated"
+            + (" and previous tokens invalidated" if payload.retire_previous else ""),
+            "key_id": key.key_id,
+        }
+    except Exception as e:
+        print(f"Error rotating signing key: {e}")
+        return 400, {"error": str(e)}
+
+
+@router.post(
+    "/events/{event_id}/gate/revocations",
+    auth=django_auth,
+    response={200: schemas.SuccessSchema, 400: schemas.ErrorSchema, 403: schemas.ErrorSchema},
+)
+def revoke_gate_tokens(request, event_id: int, payload: schemas.TokenRevocationSchema):
+    """Revoke every QR token issued so far for the given tickets."""
+    try:
+        event = get_object_or_404(Event, id=event_id)
+
+        if event.organizer != request.user:
+            return 403, {"error": "You are not authorized to manage this event's tickets"}
+
+        tickets = Ticket.objects.filter(event=event).filter(
+            Q(ticket_number__in=payload.ticket_ids) | Q(qr_code__in=payload.ticket_ids)
+        )
+        tickets = list(tickets.only("id", "event_id"))
+
+        if not tickets:
+            return 400, {"error": "No tickets found"}
+
+        revoke_ticket_tokens(tickets, reason=payload.reason or "")
+
+        return 200, {
+            "success": True,
+            "message": f"Revoked QR tokens for {len(tickets)} ticket(s)",
+            "event_id": event.id,
+        }
+    except Exception as e:
+        print(f"Error revoking tokens: {e}")
+        return 400, {"error": str(e)}
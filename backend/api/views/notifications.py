@@ -1,57 +1,149 @@
+from django.db import transaction
+from django.db.models import Q
 from ninja import Router
 from ninja.security import django_auth
 
+from api import pubsub
 from api.schemas import (
-    NotificationOut,
+    ErrorSchema,
+    NotificationFeedOut,
     NotificationMarkReadIn,
+    NotificationPollOut,
 )
 from api.model.notification import Notification
+from api.model.notification_counter import (
+    adjust_unread_count,
+    get_unread_snapshot,
+    lock_unread_count,
+    set_unread_count,
+)
+
+from .utils import decode_keyset_cursor, encode_keyset_cursor, sse_response
 
 router = Router(tags=["notifications"])
 
+LONG_POLL_TIMEOUT = 25  # seconds; stays below common proxy idle timeouts
+NOTIFICATION_PAGE_MAX_LIMIT = 100
+NOTIFICATION_COLUMNS = (
+    "id",
+    "message",
+    "notification_type",
+    "is_read",
+    "created_at",
+    "related_ticket_id",
+    "related_event_id",
+    "related_event__event_title",
+)
+
 
-@router.get("/notifications", response=list[NotificationOut], auth=django_auth)
-def get_notifications(request):
-    """Get all notifications for the logged-in user."""
+def _notification_rows(notifications) -> list[dict]:
+    """NotificationOut dicts, with the event title joined in the same query"""
+    rows = list(notifications.values(*NOTIFICATION_COLUMNS))
+    for row in rows:
+        row["event_title"] = row.pop("related_event__event_title")
+    return rows
+
+
+@router.get(
+    "/notifications",
+    response={200: NotificationFeedOut, 400: ErrorSchema},
+    auth=django_auth,
+)
+def get_notifications(
+    request,
+    cursor: str = None,
+    limit: int = 50,
+    notification_type: str = None,
+    is_read: bool = None,
+    event_id: int = None,
+):
+    """
+    Keyset-paginated notifications of the logged-in user, newest first, optionally
+    filtered by type, read state and related event. Pass next_cursor back as cursor
+    for the following page.
+    """
     user = request.user
 
     try:
-        notifications = Notification.objects.filter(user=user).select_related(
-            "related_ticket",
-            "related_event",
-        )[:50]
-
-        result: list[NotificationOut] = []
-        for notif in notifications:
-            event_title = None
-            if notif.related_event:
-                event_title = notif.related_event.event_title
-
-            result.append(
-                NotificationOut(
-                    id=notif.id,
-                    message=notif.message,
-                    notification_type=notif.notification_type,
-                    is_read=notif.is_read,
-                    created_at=notif.created_at,
-                    related_ticket_id=notif.related_ticket_id,
-                    related_event_id=notif.related_event_id,
-                    event_title=event_title,
-                )
+        notifications = Notification.objects.filter(user=user)
+        if notification_type:
+            if notification_type not in dict(Notification.NOTIFICATION_TYPES):
+                return 400, {"error": f"Unknown notification type '{notification_type}'"}
+            notifications = notifications.filter(notification_type=notification_type)
+        if is_read is not None:
+            notifications = notifications.filter(is_read=is_read)
+        if event_id is not None:
+            notifications = notifications.filter(related_event_id=event_id)
+
+        if cursor:
+            try:
+                created, notification_id = decode_keyset_cursor(cursor)
+            except ValueError:
+                return 400, {"error": "Invalid cursor"}
+            notifications = notifications.filter(
+                Q(created_at__lt=created) | Q(created_at=created, id__lt=notification_id)
             )
 
-        return result
+        limit = max(1, min(limit, NOTIFICATION_PAGE_MAX_LIMIT))
+        rows = _notification_rows(notifications.order_by("-created_at", "-id")[: limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        next_cursor = None
+        if has_more:
+            next_cursor = encode_keyset_cursor(rows[-1]["created_at"], rows[-1]["id"])
+
+        return 200, {"notifications": rows, "next_cursor": next_cursor, "has_more": has_more}
     except Exception as e:
         print(f"Error loading notifications: {e}")
-        return []
+        return 400, {"error": str(e)}
 
 
 @router.get("/notifications/unread-count", auth=django_auth)
 def get_unread_count(request):
     """Get count of unread notifications."""
+    return {"count": get_unread_snapshot(request.user.id)["unread_count"]}
+
+
+@router.get("/notifications/stream", auth=django_auth)
+def stream_notifications(request):
+    """
+    Server-Sent Events for the notification bell: a snapshot with the unread
+    count, then a message whenever it changes ({"unread_delta": n} or
+    {"unread_count": n}, plus latest_id when new notifications arrived).
+    """
+    user = request.user
+    return sse_response(
+        request,
+        pubsub.user_channel(user.id),
+        snapshot=lambda: get_unread_snapshot(user.id),
+        event_name="notification",
+    )
+
+
+@router.get("/notifications/poll", response=NotificationPollOut, auth=django_auth)
+def poll_notifications(request, since: int = 0, timeout: int = LONG_POLL_TIMEOUT):
+    """
+    Long-poll fallback for clients without EventSource. Returns at once when there
+    are notifications newer than `since`, otherwise when the unread count changes
+    or after `timeout` seconds.
+    """
     user = request.user
-    count = Notification.objects.filter(user=user, is_read=False).count()
-    return {"count": count}
+    timeout = min(max(timeout, 0), LONG_POLL_TIMEOUT)
+
+    # subscribe before checking so a change in between still wakes us
+    subscription = pubsub.subscribe(pubsub.user_channel(user.id))
+    try:
+        if not Notification.objects.filter(user=user, id__gt=since).exists():
+            subscription.get(timeout=timeout)
+    finally:
+        subscription.close()
+
+    newer = Notification.objects.filter(user=user, id__gt=since)[:20]
+    return {
+        **get_unread_snapshot(user.id),
+        "notifications": _notification_rows(newer),
+    }
 
 
 @router.post("/notifications/mark-read", auth=django_auth)
@@ -61,7 +153,8 @@ def mark_notification_read(request, data: NotificationMarkReadIn):
 
     try:
         notification = Notification.objects.get(id=data.notification_id, user=user)
-        notification.mark_as_read()
+        if notification.mark_as_read():
+            pubsub.publish_unread_change(user.id, delta=-1)
         return {"success": True, "message": "Notification marked as read"}
     except Notification.DoesNotExist:
         return {"success": False, "error": "Notification not found"}
@@ -71,27 +164,40 @@ def mark_notification_read(request, data: NotificationMarkReadIn):
 def mark_all_notifications_read(request):
     """Mark all notifications as read for the user."""
     user = request.user
-    Notification.objects.filter(user=user, is_read=False).update(is_read=True)
+    with transaction.atomic():
+        lock_unread_count(user.id)
+        updated = Notification.objects.filter(user=user, is_read=False).update(is_read=True)
+        set_unread_count(user.id, 0)
+    if updated:
+        pubsub.publish_unread_change(user.id, count=0)
     return {"success": True, "message": "All notifications marked as read"}
 
 
-@router.delete("/notifications/{notification_id}", auth=django_auth)
-def delete_notification(request, notification_id: int):
-    """Delete a specific notification."""
-    user = request.user
-
-    try:
-        notification = Notification.objects.get(id=notification_id, user=user)
-        notification.delete()
-        return {"success": True, "message": "Notification deleted"}
-    except Notification.DoesNotExist:
-        return {"success": False, "error": "Notification not found"}
-
-
 @router.delete("/notifications/clear-all", auth=django_auth)
 def clear_all_notifications(request):
     """Delete all notifications for the user."""
+    # registered before /notifications/{notification_id} so "clear-all" is not read as an id
     user = request.user
-    count = Notification.objects.filter(user=user).count()
-    Notification.objects.filter(user=user).delete()
+    with transaction.atomic():
+        lock_unread_count(user.id)
+        count, _ = Notification.objects.filter(user=user).delete()
+        set_unread_count(user.id, 0)
+    if count:
+        pubsub.publish_unread_change(user.id, count=0)
     return {"success": True, "message": f"{count} notifications cleared"}
+
+
+@router.delete("/notifications/{notification_id}", auth=django_auth)
+def delete_notification(request, notification_id: int):
+    """Delete a specific notification."""
+    user = request.user
+
+    with transaction.atomic():
+        unread_deleted, _ = Notification.objects.filter(id=notification_id, user=user, is_read=False).delete()
+        if unread_deleted:
+            adjust_unread_count(user.id, -1)
+        elif not Notification.objects.filter(id=notification_id, user=user).delete()[0]:
+            return {"success": False, "error": "Notification not found"}
+    if unread_deleted:
+        pubsub.publish_unread_change(user.id, delta=-1)
+    return {"success": True, "message": "Notification deleted"}
@@ -10,6 +10,7 @@ from api.model.user import AttendeeUser
 from api.model.event import Event
 from api.model.ticket import Ticket
 from api.model.rating import Rating
+from api.model.event_stats import get_event_stats
 from django.db.models import Avg, Count
 
 
@@ -97,7 +98,7 @@ def get_public_user_created_events(request, username: str):
 
         created_events = (
             Event.objects.filter(organizer=user, verification_status="approved")
-            .select_related("organizer")
+            .select_related("organizer", "stats")
             .order_by("-event_start_date")
         )
 
@@ -120,10 +121,7 @@ def get_public_user_created_events(request, username: str):
 
             event_date_str = event.event_start_date.isoformat() if event.event_start_date else None
 
-            attendee_count = Ticket.objects.filter(
-                event=event,
-                approval_status="approved",
-            ).count()
+            attendee_count = get_event_stats(event).approved
 
             events_data.append(
                 {
@@ -1,28 +1,86 @@
+from collections import defaultdict
 from datetime import datetime
+from itertools import islice
 
 import csv
+import io
 import json
+import random
 import traceback
 import pytz
 import uuid
 
-from ninja import Router
+from ninja import File, Form, Router
+from ninja.files import UploadedFile
 from ninja.security import django_auth
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Upper
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 
 from api import schemas
 from api.model.event import Event
 from api.model.event_schedule import EventSchedule
 from api.model.ticket import Ticket
-from api.model.notification import send_registration_notification
+from api.model.check_in import CheckIn
+from api.model.user import AttendeeUser
+from api.model.notification import (
+    send_approval_notifications,
+    send_registration_notification,
+    send_registration_notifications,
+)
+from api.model.ticket_token import issue_ticket_token
+from api.model.event_stats import EventStats, get_event_stats, record_ticket_transitions
 
-from .utils import convert_to_bangkok_time
+from .utils import convert_to_bangkok_time, extract_ticket_dates, stream_content, stream_csv
 
 router = Router(tags=["tickets"])
 
 
+def _ticket_schedule(event: Event) -> list:
+    """Per-day schedule stored on a new ticket, from EventSchedule or the event start"""
+    event_schedules = EventSchedule.objects.filter(event=event).order_by(
+        "event_date", "start_time_event"
+    )
+
+    schedule = []
+    for sched in event_schedules:
+        schedule.append(
+            {
+                "date": sched.event_date.isoformat(),
+                "time": sched.start_time_event.isoformat(),
+                "endTime": sched.end_time_event.isoformat(),
+                "location": event.event_address or "TBA",
+                "is_online": event.is_online,
+                "meeting_link": event.event_meeting_link,
+            }
+        )
+
+    print(f"DEBUG: Event {event.id} has {len(schedule)} EventSchedule entries")
+
+    if not schedule:
+        print("DEBUG: No EventSchedule entries found, creating fallback")
+        schedule = [
+            {
+                "date": event.event_start_date.date().isoformat()
+                if event.event_start_date
+                else timezone.now().date().isoformat(),
+                "time": event.event_start_date.time().isoformat()
+                if event.event_start_date
+                else "00:00:00",
+                "endTime": "23:59:59",
+                "location": event.event_address or "TBA",
+                "is_online": event.is_online,
+                "meeting_link": event.event_meeting_link,
+            }
+        ]
+
+    return schedule
+
+
 @router.post(
     "/events/{event_id}/register",
     auth=django_auth,
@@ -33,66 +91,37 @@ def register_for_event(request, event_id: int):
         event = get_object_or_404(Event, id=event_id)
         user = request.user
 
-        if Ticket.objects.filter(event=event, attendee=user).exists():
-            return 400, {"error": "You are already registered for this event"}
-
-        event_schedules = EventSchedule.objects.filter(event=event).order_by(
-            "event_date", "start_time_event"
-        )
-
-        schedule = []
-        for sched in event_schedules:
-            schedule.append(
-                {
-                    "date": sched.event_date.isoformat(),
-                    "time": sched.start_time_event.isoformat(),
-                    "endTime": sched.end_time_event.isoformat(),
-                    "location": event.event_address or "TBA",
-                    "is_online": event.is_online,
-                    "meeting_link": event.event_meeting_link,
-                }
+        schedule = _ticket_schedule(event)
+
+        with transaction.atomic():
+            # serialises with other registrations and imports of this event
+            attendees = Event.objects.select_for_update().values_list("attendee", flat=True).get(id=event.id)
+            if Ticket.objects.filter(event=event, attendee=user).exists():
+                return 400, {"error": "You are already registered for this event"}
+
+            ticket = Ticket.objects.create(
+                event=event,
+                attendee=user,
+                qr_code=str(uuid.uuid4()),
+                user_name=f"{user.first_name} {user.last_name}".strip() or user.username,
+                user_email=user.email,
+                event_title=event.event_title,
+                start_date=event.event_start_date,
+                location=event.event_address or "TBA",
+                is_online=event.is_online,
+                meeting_link=event.event_meeting_link,
+                event_dates=schedule,
             )
+            record_ticket_transitions(
+                event.id, [(None, ticket.approval_status, extract_ticket_dates(schedule))]
+            )
+            send_registration_notification(ticket)
 
-        print(f"DEBUG: Event {event_id} has {len(schedule)} EventSchedule entries")
-
-        if not schedule:
-            print("DEBUG: No EventSchedule entries found, creating fallback")
-            schedule = [
-                {
-                    "date": event.event_start_date.date().isoformat()
-                    if event.event_start_date
-                    else timezone.now().date().isoformat(),
-                    "time": event.event_start_date.time().isoformat()
-                    if event.event_start_date
-                    else "00:00:00",
-                    "endTime": "23:59:59",
-                    "location": event.event_address or "TBA",
-                    "is_online": event.is_online,
-                    "meeting_link": event.event_meeting_link,
-                }
-            ]
-
-        ticket = Ticket.objects.create(
-            event=event,
-            attendee=user,
-            qr_code=str(uuid.uuid4()),
-            user_name=f"{user.first_name} {user.last_name}".strip() or user.username,
-            user_email=user.email,
-            event_title=event.event_title,
-            start_date=event.event_start_date,
-            location=event.event_address or "TBA",
-            is_online=event.is_online,
-            meeting_link=event.event_meeting_link,
-            event_dates=schedule,
-        )
-
-        send_registration_notification(ticket)
-
-        attendees = event.attendee if isinstance(event.attendee, list) else []
-        if user.id not in attendees:
-            attendees.append(user.id)
-        event.attendee = attendees
-        event.save()
+            attendees = attendees if isinstance(attendees, list) else []
+            if user.id not in attendees:
+                attendees.append(user.id)
+            event.attendee = attendees
+            event.save(update_fields=["attendee"])
 
         print(
             f"DEBUG: Ticket {ticket.qr_code} created with {len(schedule)} dates, "
@@ -112,6 +141,216 @@ def register_for_event(request, event_id: int):
         return 400, {"error": str(e)}
 
 
+IMPORT_BATCH_SIZE = 1000
+IMPORT_ERROR_LIMIT = 500
+IMPORT_EMAIL_HEADERS = ("email", "e-mail", "email address")
+DUPLICATE_IN_FILE = "Duplicate email in file"
+EVENT_FULL = "Event is full"
+
+
+def _ticket_number_generator(event: Event):
+    """Yield T###### ticket numbers not yet used by any ticket of the event"""
+    taken = set(
+        Ticket.objects.filter(event=event, ticket_number__isnull=False).values_list("ticket_number", flat=True)
+    )
+    while True:
+        number = f"T{random.randint(100000, 999999)}"
+        if number not in taken:
+            taken.add(number)
+            yield number
+
+
+def _read_import_emails(upload):
+    """
+    Validate an uploaded CSV in one streaming pass.
+    Yields (row_number, email, error) with error None for rows worth resolving.
+    """
+    reader = csv.reader(io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline=""))
+    header = [name.strip().lower() for name in next(reader, [])]
+    column = next((header.index(name) for name in IMPORT_EMAIL_HEADERS if name in header), None)
+    if column is None:
+        raise ValueError("CSV must have an 'email' column")
+
+    seen = set()
+    for row_number, row in enumerate(reader, start=2):
+        if not any(cell.strip() for cell in row):
+            continue
+        email = row[column].strip() if column < len(row) else ""
+        try:
+            validate_email(email)
+        except ValidationError:
+            yield row_number, email, "Invalid email address"
+            continue
+        if email.upper() in seen:
+            yield row_number, email, DUPLICATE_IN_FILE
+            continue
+        seen.add(email.upper())
+        yield row_number, email, None
+
+
+@router.post(
+    "/events/{event_id}/registrations/import",
+    auth=django_auth,
+    response={
+        200: schemas.RegistrationImportResultSchema,
+        400: schemas.ErrorSchema,
+        403: schemas.ErrorSchema,
+    },
+)
+def import_registrations(
+    request,
+    event_id: int,
+    file: UploadedFile = File(...),
+    approve: bool = Form(False),
+):
+    """
+    Pre-register existing users from a CSV with an 'email' column.
+    Emails are resolved and tickets inserted in batches; rows that cannot be
+    registered are reported with their line number instead of failing the import.
+    With approve, rows beyond the event's max_attendee are reported as failed.
+    """
+    try:
+        event = get_object_or_404(Event, id=event_id)
+
+        if event.organizer != request.user:
+            return 403, {"error": "You are not authorized to perform this action"}
+
+        errors = []
+        failed = 0
+        skipped = 0
+        total_rows = 0
+        pending = []
+
+        def report(row_number, email, error):
+            if len(errors) < IMPORT_ERROR_LIMIT:
+                errors.append({"row": row_number, "email": email, "error": error})
+
+        schedule = _ticket_schedule(event)
+        valid_days = extract_ticket_dates(schedule)
+        status = "approved" if approve else "pending"
+        now = timezone.now()
+        tickets = []
+        ticket_rows = []  # (row_number, email) of each ticket, for capacity errors
+        ticket_numbers = _ticket_number_generator(event)
+
+        def resolve(batch):
+            # one query for the users per batch
+            nonlocal failed
+            users = {
+                user.email.upper(): user
+                for user in AttendeeUser.objects.alias(email_upper=Upper("email")).filter(
+                    email_upper__in=[email.upper() for _, email in batch]
+                )
+            }
+
+            for row_number, email in batch:
+                user = users.get(email.upper())
+                if user is None:
+                    failed += 1
+                    report(row_number, email, "No account with this email")
+                else:
+                    ticket_rows.append((row_number, email))
+                    tickets.append(
+                        Ticket(
+                            event=event,
+                            attendee=user,
+                            qr_code=str(uuid.uuid4()),
+                            ticket_number=next(ticket_numbers),
+                            user_name=f"{user.first_name} {user.last_name}".strip() or user.username,
+                            user_email=user.email,
+                            event_title=event.event_title,
+                            start_date=event.event_start_date,
+                            location=event.event_address or "TBA",
+                            is_online=event.is_online,
+                            meeting_link=event.event_meeting_link,
+                            event_dates=schedule,
+                            approval_status=status,
+                            approved_at=now if approve else None,
+                        )
+                    )
+
+        for row_number, email, error in _read_import_emails(file):
+            total_rows += 1
+            if error:
+                if error == DUPLICATE_IN_FILE:
+                    skipped += 1
+                else:
+                    failed += 1
+                report(row_number, email, error)
+                continue
+            pending.append((row_number, email))
+            if len(pending) >= IMPORT_BATCH_SIZE:
+                resolve(pending)
+                pending = []
+        if pending:
+            resolve(pending)
+
+        with transaction.atomic():
+            # registrations of this event lock its row, so nobody can register one of
+            # these attendees between the check below and the insert
+            attendees = Event.objects.select_for_update().values_list("attendee", flat=True).get(id=event.id)
+            registered = set()
+            for start in range(0, len(tickets), IMPORT_BATCH_SIZE):
+                registered.update(
+                    Ticket.objects.filter(
+                        event=event,
+                        attendee_id__in=[t.attendee_id for t in tickets[start : start + IMPORT_BATCH_SIZE]],
+                    ).values_list("attendee_id", flat=True)
+                )
+            if registered:
+                for (row_number, email), ticket in zip(ticket_rows, tickets):
+                    if ticket.attendee_id in registered:
+                        skipped += 1
+                        report(row_number, email, "Already registered")
+                kept = [i for i, ticket in enumerate(tickets) if ticket.attendee_id not in registered]
+                tickets = [tickets[i] for i in kept]
+                ticket_rows = [ticket_rows[i] for i in kept]
+
+            if approve and event.max_attendee:
+                # lock the counters so two approving imports cannot fill the same spots
+                get_event_stats(event)
+                approved = EventStats.objects.select_for_update().get(event=event).approved
+                room = max(event.max_attendee - approved, 0)
+                for row_number, email in ticket_rows[room:]:
+                    failed += 1
+                    report(row_number, email, EVENT_FULL)
+                tickets = tickets[:room]
+
+            Ticket.objects.bulk_create(tickets, batch_size=IMPORT_BATCH_SIZE)
+            record_ticket_transitions(event.id, [(None, status, valid_days)] * len(tickets))
+
+            if tickets:
+                attendees = attendees if isinstance(attendees, list) else []
+                known = set(attendees)
+                attendees.extend(t.attendee_id for t in tickets if t.attendee_id not in known)
+                event.attendee = attendees
+                event.save(update_fields=["attendee"])
+
+        if approve:
+            send_approval_notifications(tickets)
+        else:
+            send_registration_notifications(tickets)
+
+        errors.sort(key=lambda error: error["row"])
+        return 200, {
+            "success": True,
+            "message": f"{len(tickets)} attendee(s) registered",
+            "total_rows": total_rows,
+            "created": len(tickets),
+            "skipped": skipped,
+            "failed": failed,
+            "errors": errors,
+            "errors_truncated": skipped + failed > len(errors),
+        }
+
+    except ValueError as e:
+        return 400, {"error": str(e)}
+    except Exception as e:
+        print(f"Error importing registrations: {str(e)}")
+        traceback.print_exc()
+        return 400, {"error": str(e)}
+
+
 @router.get(
     "/tickets/{ticket_id}",
     auth=django_auth,
@@ -140,6 +379,29 @@ def get_ticket_detail(request, ticket_id: int):
     }
 
 
+@router.get(
+    "/tickets/{ticket_id}/qr-token",
+    auth=django_auth,
+    response={200: schemas.TicketTokenSchema, 400: schemas.ErrorSchema},
+)
+def get_ticket_qr_token(request, ticket_id: int):
+    """
+    Issue a signed QR token for an approved ticket.
+    The token carries ticket id, event id and valid days so gates can verify it in memory.
+    """
+    ticket = get_object_or_404(
+        Ticket.objects.select_related("event"), id=ticket_id, attendee=request.user
+    )
+
+    if ticket.approval_status != "approved":
+        return 400, {"error": f"Ticket is {ticket.approval_status}. Only approved tickets have a QR token."}
+
+    valid_days = extract_ticket_dates(ticket.event_dates)
+    token, expires_at = issue_ticket_token(ticket, valid_days)
+
+    return 200, {"token": token, "valid_days": valid_days, "expires_at": expires_at}
+
+
 @router.get(
     "/user/event-history",
     auth=django_auth,
@@ -463,6 +725,58 @@ def get_user_tickets(request, status: str = None):
         return 400, {"error": str(e)}
 
 
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _registration_export_rows(tickets):
+    """
+    CSV rows for an export, read with a server-side cursor in chunks.
+    Check-in times are fetched once per chunk, so memory stays flat however large the event.
+    """
+    columns = (
+        "id",
+        "ticket_number",
+        "approval_status",
+        "purchase_date",
+        "attendee__username",
+        "attendee__first_name",
+        "attendee__last_name",
+        "attendee__email",
+        "attendee__phone_number",
+    )
+    rows = tickets.order_by("id").values(*columns).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    while True:
+        chunk = list(islice(rows, EXPORT_CHUNK_SIZE))
+        if not chunk:
+            return
+
+        scans = defaultdict(list)
+        for ticket_id, scanned_at in (
+            CheckIn.objects.filter(ticket_id__in=[row["id"] for row in chunk])
+            .order_by("day", "scanned_at")
+            .values_list("ticket_id", "scanned_at")
+        ):
+            scans[ticket_id].append(
+                convert_to_bangkok_time(scanned_at).strftime("%Y-%m-%d %H:%M:%S")
+            )
+
+        for row in chunk:
+            attendee_name = f"{row['attendee__first_name'] or ''} {row['attendee__last_name'] or ''}".strip()
+            yield [
+                row["ticket_number"],
+                row["attendee__username"],
+                attendee_name or row["attendee__username"],
+                row["attendee__email"],
+                row["attendee__phone_number"] or "N/A",
+                row["purchase_date"].strftime("%Y-%m-%d %H:%M:%S")
+                if row["purchase_date"]
+                else "N/A",
+                row["approval_status"],
+                ", ".join(scans[row["id"]]) or "Didn't check in yet",
+            ]
+
+
 @router.get("/events/{event_id}/export", auth=django_auth)
 def export_event_registrations(request, event_id: int):
     try:
@@ -471,77 +785,27 @@ def export_event_registrations(request, event_id: int):
         if event.organizer != request.user:
             return HttpResponse("Unauthorized", status=403)
 
-        tickets = Ticket.objects.filter(event=event).select_related("attendee")
+        tickets = Ticket.objects.filter(event=event)
 
         if not tickets.exists():
             return HttpResponse("No registrations found", status=404)
 
-        response = HttpResponse(content_type="text/csv")
+        header = [
+            "Ticket ID",
+            "Username",
+            "Attendee Name",
+            "Attendee Email",
+            "Phone",
+            "Registration Date",
+            "Status",
+            "Checked In Dates",
+        ]
+        response = StreamingHttpResponse(
+            stream_content(request, stream_csv(header, _registration_export_rows(tickets))),
+            content_type="text/csv",
+        )
         filename = f"{event.event_title}_registrations_{timezone.now().date()}.csv"
         response["Content-Disposition"] = f'attachment; filename="{filename}"'
-
-        writer = csv.writer(response)
-
-        writer.writerow(
-            [
-                "Ticket ID",
-                "Username",
-                "Attendee Name",
-                "Attendee Email",
-                "Phone",
-                "Registration Date",
-                "Status",
-                "Checked In Dates",
-            ]
-        )
-
-        for ticket in tickets:
-            attendee = ticket.attendee
-            attendee_name = f"{attendee.first_name} {attendee.last_name}".strip()
-            if not attendee_name:
-                attendee_name = attendee.username
-
-            checked_in_dates = "Didn't check in yet"
-
-            if ticket.checked_in_dates:
-                raw_dates = ticket.checked_in_dates
-                formatted_dates = []
-
-                if isinstance(raw_dates, dict):
-                    iterable = raw_dates.values()
-                elif isinstance(raw_dates, list):
-                    iterable = raw_dates
-                else:
-                    iterable = [raw_dates]
-
-                for date_str in iterable:
-                    try:
-                        date_str = str(date_str)
-                        dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                        bangkok_dt = convert_to_bangkok_time(dt)
-                        formatted_dates.append(
-                            bangkok_dt.strftime("%Y-%m-%d %H:%M:%S")
-                        )
-                    except Exception:
-                        formatted_dates.append(date_str)
-
-                checked_in_dates = ", ".join(formatted_dates)
-
-            writer.writerow(
-                [
-                    ticket.ticket_number,
-                    attendee.username,
-                    attendee_name,
-                    attendee.email,
-                    attendee.phone_number or "N/A",
-                    ticket.purchase_date.strftime("%Y-%m-%d %H:%M:%S")
-                    if ticket.purchase_date
-                    else "N/A",
-                    ticket.approval_status,
-                    checked_in_dates,
-                ]
-            )
-
         return response
 
     except Event.DoesNotExist:
@@ -10,6 +10,7 @@ from api.model.user import AttendeeUser
 from api.model.ticket import Ticket
 from api.model.event import Event
 from api.model.event_schedule import EventSchedule
+from api.model.event_stats import get_event_stats
 from django.utils import timezone
 
 from .utils import DEFAULT_PROFILE_PIC, convert_to_bangkok_time
@@ -262,7 +263,7 @@ def get_my_created_events(request):
     try:
         created_events = (
             Event.objects.filter(organizer=request.user, verification_status="approved")
-            .select_related("organizer")
+            .select_related("organizer", "stats")
             .order_by("-event_start_date")
         )
 
@@ -285,10 +286,7 @@ def get_my_created_events(request):
 
             event_date_str = event.event_start_date.isoformat() if event.event_start_date else None
 
-            attendee_count = Ticket.objects.filter(
-                event=event,
-                approval_status="approved",
-            ).count()
+            attendee_count = get_event_stats(event).approved
 
             events_data.append(
                 {
@@ -1,7 +1,17 @@
+import csv
+import json
 import pytz
-from datetime import datetime
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+from api import pubsub
 
 DEFAULT_PROFILE_PIC = "/images/logo.png"
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
 
 
 def convert_to_bangkok_time(dt: datetime | None):
@@ -18,3 +28,139 @@ def convert_to_bangkok_time(dt: datetime | None):
         dt = pytz.UTC.localize(dt)
 
     return dt.astimezone(bangkok_tz)
+
+
+def extract_ticket_dates(event_dates) -> list[str]:
+    """
+    Normalise a ticket's event_dates JSON into a list of YYYY-MM-DD strings
+    Accepts schedule dicts, ISO strings and date/datetime objects
+    """
+    valid_dates: list[str] = []
+    for d in event_dates or []:
+        if isinstance(d, dict):
+            date_val = d.get("date")
+            if date_val and len(str(date_val)) >= 10:
+                valid_dates.append(str(date_val)[:10])
+        elif isinstance(d, str):
+            try:
+                valid_dates.append(datetime.fromisoformat(d).date().isoformat())
+            except ValueError:
+                if len(d) >= 10:
+                    valid_dates.append(d[:10])
+        elif hasattr(d, "date"):
+            valid_dates.append(d.date().isoformat())
+        elif hasattr(d, "isoformat"):
+            valid_dates.append(d.isoformat())
+    return valid_dates
+
+
+class _EchoBuffer:
+    """File-like object whose write() hands the text back, so csv.writer output can be streamed"""
+
+    def write(self, value):
+        return value
+
+
+def encode_keyset_cursor(created: datetime, row_id: int) -> str:
+    """Opaque cursor for keyset pages ordered by (timestamp, id)"""
+    return f"{(created - EPOCH) // timedelta(microseconds=1)}_{row_id}"
+
+
+def decode_keyset_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of encode_keyset_cursor; raises ValueError for malformed cursors"""
+    micros, row_id = cursor.split("_")
+    return EPOCH + timedelta(microseconds=int(micros)), int(row_id)
+
+
+def stream_csv(header, rows, lines_per_chunk: int = 500):
+    """Yield CSV text for StreamingHttpResponse: the header at once, then rows in chunks"""
+    writer = csv.writer(_EchoBuffer())
+    yield writer.writerow(header)
+
+    chunk = []
+    for row in rows:
+        chunk.append(writer.writerow(row))
+        if len(chunk) >= lines_per_chunk:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def stream_content(request, iterable, items_per_step: int = 1):
+    """
+    Content for a streaming response. Under ASGI a sync iterable would be read
+    into a list before the first byte is sent, so wrap it in an async generator
+    that advances it items_per_step at a time in the request's thread (where its
+    DB cursor lives). Under WSGI the iterable is returned as is.
+    """
+    if not isinstance(request, ASGIRequest):
+        return iterable
+
+    iterator = iter(iterable)
+
+    def step():
+        return list(islice(iterator, items_per_step))
+
+    async def astream():
+        try:
+            while True:
+                items = await sync_to_async(step)()
+                if not items:
+                    return
+                for item in items:
+                    yield item
+        finally:
+            # a client that disconnects early must not leave a server-side cursor open
+            if hasattr(iterator, "close"):
+                await sync_to_async(iterator.close)()
+
+    return astream()
+
+
+def sse_response(request, channel: str, snapshot=None, heartbeat: int = 15, event_name: str = "delta"):
+    """
+    Stream messages published on a pub/sub channel as Server-Sent Events.
+    snapshot is called after subscribing so no update between the two is lost.
+    Under ASGI (uvicorn) the stream is an async generator and waits for messages on
+    the event loop; under WSGI each open stream keeps a request thread busy.
+    """
+    subscription = pubsub.subscribe(channel)
+    try:
+        initial = snapshot() if snapshot else None
+    except Exception:
+        subscription.close()
+        raise
+
+    def opening():
+        yield "retry: 3000\n\n"
+        if initial is not None:
+            yield f"event: snapshot\ndata: {json.dumps(initial, default=str)}\n\n"
+
+    def frame(message):
+        if message is None:
+            return ": keepalive\n\n"
+        return f"event: {event_name}\ndata: {json.dumps(message, default=str)}\n\n"
+
+    def stream():
+        try:
+            yield from opening()
+            while True:
+                yield frame(subscription.get(timeout=heartbeat))
+        finally:
+            subscription.close()
+
+    async def astream():
+        try:
+            for chunk in opening():
+                yield chunk
+            while True:
+                yield frame(await subscription.aget(timeout=heartbeat))
+        finally:
+            subscription.close()
+
+    content = astream() if isinstance(request, ASGIRequest) else stream()
+    response = StreamingHttpResponse(content, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -1,16 +1,32 @@
+from datetime import datetime, timedelta
+
 from ninja import Router
 from ninja.security import django_auth
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
 from api import schemas
-from api.model.event import Event
+from api.model.event import DECIDED_STATUSES, Event
 from api.model.notification import (
     send_event_approval_notification,
+    send_event_approval_notifications,
     send_event_rejection_notification,
+    send_event_rejection_notifications,
 )
 
+from .utils import decode_keyset_cursor, encode_keyset_cursor
+
 router = Router(tags=["verification"])
 
+ADMIN_STATISTICS_CACHE_KEY = "admin-event-statistics"
+ADMIN_STATISTICS_CACHE_TTL = 30  # seconds; verify/reject clear it immediately
+ADMIN_QUEUE_MAX_LIMIT = 200
+MODERATION_MAX_CLAIM = 50
+MODERATION_MAX_LEASE = 60 * 60  # seconds
+
 
 @router.post(
     "/events/{event_id}/verify",
@@ -26,7 +42,10 @@ def verify_event(request, event_id: int):
             return 403, {"error": "You are not authorized to verify events"}
 
         event.verification_status = "approved"
+        event.review_claimed_by = None
+        event.review_lease_expires_at = None
         event.save()
+        cache.delete(ADMIN_STATISTICS_CACHE_KEY)
         send_event_approval_notification(event)
         return 200, {
             "success": True,
@@ -53,7 +72,10 @@ def reject_event(request, event_id: int):
             return 403, {"error": "You are not authorized to reject events"}
 
         event.verification_status = "rejected"
+        event.review_claimed_by = None
+        event.review_lease_expires_at = None
         event.save()
+        cache.delete(ADMIN_STATISTICS_CACHE_KEY)
 
         send_event_rejection_notification(event)
 
@@ -79,19 +101,17 @@ def get_admin_statistics(request):
         if request.user.role != "admin":
             return 403, {"error": "Admin privileges required"}
 
-        total_events = Event.objects.count()
-        approved_events = Event.objects.filter(verification_status="approved").count()
-        rejected_events = Event.objects.filter(verification_status="rejected").count()
-        pending_events = Event.objects.exclude(
-            verification_status__in=["approved", "rejected"]
-        ).count()
+        statistics = cache.get(ADMIN_STATISTICS_CACHE_KEY)
+        if statistics is None:
+            statistics = Event.objects.aggregate(
+                total_events=Count("id"),
+                approved_events=Count("id", filter=Q(verification_status="approved")),
+                pending_events=Count("id", filter=~Q(verification_status__in=DECIDED_STATUSES)),
+                rejected_events=Count("id", filter=Q(verification_status="rejected")),
+            )
+            cache.set(ADMIN_STATISTICS_CACHE_KEY, statistics, ADMIN_STATISTICS_CACHE_TTL)
 
-        return 200, {
-            "total_events": total_events,
-            "approved_events": approved_events,
-            "pending_events": pending_events,
-            "rejected_events": rejected_events,
-        }
+        return 200, statistics
     except Exception as e:
         print(f"Error fetching admin statistics: {e}")
         return 400, {"error": str(e)}
@@ -141,3 +161,271 @@ def get_admin_events(request):
     except Exception as e:
         print(f"Error fetching admin events: {e}")
         return 400, {"error": str(e)}
+
+
+ADMIN_EVENT_COLUMNS = (
+    "id",
+    "event_title",
+    "event_create_date",
+    "status_registration",
+    "verification_status",
+    "organizer_id",
+    "organizer__username",
+    "organizer__email",
+    "organizer__first_name",
+    "organizer__last_name",
+)
+
+
+def _admin_event_row(row: dict) -> dict:
+    organizer_name = f"{row['organizer__first_name']} {row['organizer__last_name']}".strip()
+    return {
+        "id": row["id"],
+        "title": row["event_title"],
+        "event_title": row["event_title"],
+        "event_create_date": row["event_create_date"].isoformat(),
+        "organizer_name": organizer_name or row["organizer__username"] or row["organizer__email"],
+        "organizer_username": row["organizer__username"],
+        "organizer_id": row["organizer_id"],
+        "status_registration": row["status_registration"],
+        "verification_status": row["verification_status"] or "pending",
+    }
+
+
+@router.get(
+    "/admin/events/queue",
+    auth=django_auth,
+    response={200: schemas.AdminEventQueueSchema, 400: schemas.ErrorSchema, 403: schemas.ErrorSchema},
+)
+def get_admin_event_queue(
+    request,
+    status: str = None,
+    created_from: str = None,
+    created_to: str = None,
+    organizer: str = None,
+    search: str = None,
+    cursor: str = None,
+    limit: int = 50,
+):
+    """
+    Keyset-paginated admin event listing, newest first.
+    status is approved, pending or rejected; created_from/created_to are
+    YYYY-MM-DD; organizer is a username or user id. Pass next_cursor back as
+    cursor for the following page.
+    """
+    try:
+        if request.user.role != "admin":
+            return 403, {"error": "Admin privileges required"}
+
+        events = Event.objects.all()
+
+        if status == "pending":
+            events = events.exclude(verification_status__in=DECIDED_STATUSES)
+        elif status in DECIDED_STATUSES:
+            events = events.filter(verification_status=status)
+        elif status:
+            return 400, {"error": "Invalid status. Use approved, pending or rejected."}
+
+        try:
+            if created_from:
+                start = datetime.strptime(created_from, "%Y-%m-%d")
+                events = events.filter(event_create_date__gte=timezone.make_aware(start))
+            if created_to:
+                end = datetime.strptime(created_to, "%Y-%m-%d") + timedelta(days=1)
+                events = events.filter(event_create_date__lt=timezone.make_aware(end))
+        except ValueError:
+            return 400, {"error": "Invalid date format. Use YYYY-MM-DD."}
+
+        if organizer:
+            if organizer.isdigit():
+                events = events.filter(organizer_id=int(organizer))
+            else:
+                events = events.filter(organizer__username=organizer)
+
+        if search and search.strip():
+            events = events.filter(event_title__icontains=search.strip())
+
+        if cursor:
+            try:
+                created, event_id = decode_keyset_cursor(cursor)
+            except ValueError:
+                return 400, {"error": "Invalid cursor"}
+            events = events.filter(
+                Q(event_create_date__lt=created) | Q(event_create_date=created, id__lt=event_id)
+            )
+
+        limit = max(1, min(limit, ADMIN_QUEUE_MAX_LIMIT))
+        rows = list(
+            events.order_by("-event_create_date", "-id").values(*ADMIN_EVENT_COLUMNS)[: limit + 1]
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        events_data = [_admin_event_row(row) for row in rows]
+
+        next_cursor = None
+        if has_more:
+            next_cursor = encode_keyset_cursor(rows[-1]["event_create_date"], rows[-1]["id"])
+
+        return 200, {"events": events_data, "next_cursor": next_cursor, "has_more": has_more}
+    except Exception as e:
+        print(f"Error fetching admin event queue: {e}")
+        return 400, {"error": str(e)}
+
+
+def _claimable_by(admin, now) -> Q:
+    """Unclaimed, lease expired, or already held by this admin"""
+    return (
+        Q(review_claimed_by__isnull=True)
+        | Q(review_lease_expires_at__lte=now)
+        | Q(review_claimed_by=admin)
+    )
+
+
+@router.post(
+    "/admin/moderation/claim",
+    auth=django_auth,
+    response={200: schemas.ModerationClaimResponseSchema, 400: schemas.ErrorSchema, 403: schemas.ErrorSchema},
+)
+def claim_moderation_events(request, payload: schemas.ModerationClaimSchema):
+    """
+    Claim up to `count` pending events, oldest first, for `lease_seconds`.
+    Events another admin is claiming right now are skipped rather than waited on,
+    and events under someone else's live lease are never handed out twice.
+    Claims this admin already holds are renewed and returned first.
+    """
+    try:
+        if request.user.role != "admin":
+            return 403, {"error": "Admin privileges required"}
+
+        count = max(1, min(payload.count, MODERATION_MAX_CLAIM))
+        lease_seconds = max(30, min(payload.lease_seconds, MODERATION_MAX_LEASE))
+        now = timezone.now()
+        expires_at = now + timedelta(seconds=lease_seconds)
+
+        with transaction.atomic():
+            claimed_ids = list(
+                Event.objects.select_for_update(skip_locked=True)
+                .exclude(verification_status__in=DECIDED_STATUSES)
+                .filter(_claimable_by(request.user, now))
+                .order_by("event_create_date", "id")
+                .values_list("id", flat=True)[:count]
+            )
+            Event.objects.filter(id__in=claimed_ids).update(
+                review_claimed_by=request.user, review_lease_expires_at=expires_at
+            )
+
+        rows = Event.objects.filter(id__in=claimed_ids).order_by("event_create_date", "id")
+        events_data = [
+            {
+                **_admin_event_row(row),
+                "event_description": row["event_description"],
+                "lease_expires_at": expires_at,
+            }
+            for row in rows.values(*ADMIN_EVENT_COLUMNS, "event_description")
+        ]
+
+        return 200, {"events": events_data}
+    except Exception as e:
+        print(f"Error claiming moderation events: {e}")
+        return 400, {"error": str(e)}
+
+
+@router.post(
+    "/admin/moderation/release",
+    auth=django_auth,
+    response={200: schemas.SuccessSchema, 400: schemas.ErrorSchema, 403: schemas.ErrorSchema},
+)
+def release_moderation_events(request, payload: schemas.ModerationReleaseSchema):
+    """Hand claimed events back to the queue without deciding them."""
+    try:
+        if request.user.role != "admin":
+            return 403, {"error": "Admin privileges required"}
+
+        released = Event.objects.filter(
+            id__in=payload.event_ids, review_claimed_by=request.user
+        ).update(review_claimed_by=None, review_lease_expires_at=None)
+
+        return 200, {"success": True, "message": f"Released {released} event(s)"}
+    except Exception as e:
+        print(f"Error releasing moderation events: {e}")
+        return 400, {"error": str(e)}
+
+
+@router.post(
+    "/admin/moderation/decisions",
+    auth=django_auth,
+    response={200: schemas.ModerationBatchResultSchema, 400: schemas.ErrorSchema, 403: schemas.ErrorSchema},
+)
+def decide_moderation_events(request, payload: schemas.ModerationBatchSchema):
+    """
+    Approve or reject a batch of events in one transaction.
+    Events under another admin's live lease or already decided are skipped.
+    Organizers are notified with one bulk insert per outcome.
+    """
+    try:
+        if request.user.role != "admin":
+            return 403, {"error": "Admin privileges required"}
+
+        now = timezone.now()
+        actions = {}
+        results = {}
+        for decision in payload.decisions:
+            if decision.action not in ("approve", "reject"):
+                results[decision.event_id] = "invalid_action"
+            else:
+                actions[decision.event_id] = decision.action
+
+        with transaction.atomic():
+            events = {
+                event.id: event
+                for event in Event.objects.select_for_update().filter(id__in=actions.keys())
+            }
+
+            approve, reject = [], []
+            for event_id, action in actions.items():
+                event = events.get(event_id)
+                if event is None:
+                    results[event_id] = "not_found"
+                elif event.verification_status in DECIDED_STATUSES:
+                    results[event_id] = "already_decided"
+                elif (
+                    event.review_claimed_by_id not in (None, request.user.id)
+                    and event.review_lease_expires_at
+                    and event.review_lease_expires_at > now
+                ):
+                    results[event_id] = "claimed_by_other"
+                elif action == "approve":
+                    approve.append(event)
+                    results[event_id] = "approved"
+                else:
+                    reject.append(event)
+                    results[event_id] = "rejected"
+
+            for status, decided in (("approved", approve), ("rejected", reject)):
+                Event.objects.filter(id__in=[event.id for event in decided]).update(
+                    verification_status=status,
+                    review_claimed_by=None,
+                    review_lease_expires_at=None,
+                    event_updated_at=now,
+                )
+
+            send_event_approval_notifications(approve)
+            send_event_rejection_notifications(reject)
+
+        if approve or reject:
+            cache.delete(ADMIN_STATISTICS_CACHE_KEY)
+
+        return 200, {
+            "success": True,
+            "approved": len(approve),
+            "rejected": len(reject),
+            "skipped": len(results) - len(approve) - len(reject),
+            "results": [
+                {"event_id": event_id, "result": results[event_id]}
+                for event_id in dict.fromkeys(d.event_id for d in payload.decisions)
+            ],
+        }
+    except Exception as e:
+        print(f"Error applying moderation decisions: {e}")
+        return 400, {"error": str(e)}
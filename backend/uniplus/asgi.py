@@ -14,3 +14,12 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'uniplus.settings')
 
 application = get_asgi_application()
+
+# Served by uvicorn (see docker-compose.yaml), so Server-Sent Events streams run on
+# the event loop. Like runserver, serve static files ourselves while DEBUG is on.
+from django.conf import settings  # noqa: E402
+
+if settings.DEBUG:
+    from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
+
+    application = ASGIStaticFilesHandler(application)
@@ -169,3 +169,12 @@ MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
 
 N8N_FEEDBACK_SUMMARY_URL = os.getenv("N8N_FEEDBACK_SUMMARY_URL")
+
+# Read notifications older than this are removed by `manage.py prune_notifications`;
+# set NOTIFICATION_ARCHIVE_DIR to keep a gzipped JSON Lines copy of what was removed.
+NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "90"))
+NOTIFICATION_ARCHIVE_DIR = os.getenv("NOTIFICATION_ARCHIVE_DIR")
+
+# Pub/sub backend for live Server-Sent Events updates.
+# Use "api.pubsub.PostgresBroker" when running more than one worker process.
+PUBSUB_BACKEND = os.getenv("PUBSUB_BACKEND", "api.pubsub.InProcessBroker")
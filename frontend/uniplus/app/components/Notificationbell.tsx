@@ -27,14 +27,78 @@ export default function NotificationBell({ className = "" }: NotificationBellPro
   const [loading, setLoading] = useState(false);
   const dropdownRef = useRef<HTMLDivElement>(null);
 
-  // Fetch unread count on mount and periodically
+  const isOpenRef = useRef(isOpen);
+  isOpenRef.current = isOpen;
+
+  // Unread count is pushed by the server: Server-Sent Events, or long-polling
+  // when the stream cannot be opened
   useEffect(() => {
-    fetchUnreadCount();
-    
-    // Poll for new notifications every 30 seconds
-    const interval = setInterval(fetchUnreadCount, 30000);
-    
-    return () => clearInterval(interval);
+    let stopped = false;
+    let source: EventSource | null = null;
+    let pollController: AbortController | null = null;
+
+    const applyUpdate = (data: { unread_count?: number; unread_delta?: number; latest_id?: number }) => {
+      if (typeof data.unread_count === "number") {
+        setUnreadCount(data.unread_count);
+      } else if (data.unread_delta) {
+        setUnreadCount((prev) => Math.max(prev + (data.unread_delta ?? 0), 0));
+      }
+      if (data.latest_id && isOpenRef.current) {
+        fetchNotifications();
+      }
+    };
+
+    const longPoll = async () => {
+      let since = 0;
+      while (!stopped) {
+        try {
+          pollController = new AbortController();
+          const response = await fetch(
+            `http://localhost:8000/api/notifications/poll?since=${since}`,
+            { credentials: "include", signal: pollController.signal }
+          );
+          if (!response.ok) throw new Error(`poll failed: ${response.status}`);
+          const data = await response.json();
+          setUnreadCount(data.unread_count);
+          if (data.latest_id > since && since > 0 && isOpenRef.current) {
+            fetchNotifications();
+          }
+          since = data.latest_id;
+        } catch (error) {
+          if (stopped) return;
+          console.error("Error polling notifications:", error);
+          await new Promise((resolve) => setTimeout(resolve, 5000));
+        }
+      }
+    };
+
+    if (typeof EventSource !== "undefined") {
+      let opened = false;
+      source = new EventSource("http://localhost:8000/api/notifications/stream", {
+        withCredentials: true,
+      });
+      source.onopen = () => {
+        opened = true;
+      };
+      source.addEventListener("snapshot", (e) => applyUpdate(JSON.parse((e as MessageEvent).data)));
+      source.addEventListener("notification", (e) => applyUpdate(JSON.parse((e as MessageEvent).data)));
+      source.onerror = () => {
+        // EventSource reconnects by itself once connected; fall back only if it never opened
+        if (!opened && source) {
+          source.close();
+          source = null;
+          longPoll();
+        }
+      };
+    } else {
+      longPoll();
+    }
+
+    return () => {
+      stopped = true;
+      source?.close();
+      pollController?.abort();
+    };
   }, []);
 
   // Fetch full notifications when dropdown opens
@@ -56,21 +120,6 @@ export default function NotificationBell({ className = "" }: NotificationBellPro
     return () => document.removeEventListener("mousedown", handleClickOutside);
   }, []);
 
-  const fetchUnreadCount = async () => {
-    try {
-      const response = await fetch("http://localhost:8000/api/notifications/unread-count", {
-        credentials: "include",
-      });
-
-      if (response.ok) {
-        const data = await response.json();
-        setUnreadCount(data.count); 
-      }
-    } catch (error) {
-      console.error("Error fetching unread count:", error);
-    }
-  };
-
   const fetchNotifications = async () => {
     try {
       setLoading(true);
@@ -80,7 +129,7 @@ export default function NotificationBell({ className = "" }: NotificationBellPro
 
       if (response.ok) {
         const data = await response.json();
-        setNotifications(data);
+        setNotifications(data.notifications);
       }
     } catch (error) {
       console.error("Error fetching notifications:", error);
@@ -113,7 +162,6 @@ export default function NotificationBell({ className = "" }: NotificationBellPro
             n.id === notificationId ? { ...n, is_read: true } : n
           )
         );
-        fetchUnreadCount();
       }
     } catch (error) {
       console.error("Error marking as read:", error);
@@ -162,7 +210,6 @@ export default function NotificationBell({ className = "" }: NotificationBellPro
 
       if (response.ok) {
         setNotifications((prev) => prev.filter((n) => n.id !== notificationId));
-        fetchUnreadCount();
       }
     } catch (error) {
       console.error("Error deleting notification:", error);
@@ -31,6 +31,9 @@ const API_BASE =
     ""
   );
 
+// the AI summary is generated by the background worker; refetch until it is ready
+const AI_SUMMARY_POLL_MS = 5000;
+
 type FeedbackReportResponse = {
   aggregates: {
     total: number;
@@ -39,6 +42,7 @@ type FeedbackReportResponse = {
     anonymous_count: number;
   };
   ai_summary: string;
+  ai_summary_pending?: boolean;
   feedback: EventFeedback[];
 };
 
@@ -46,7 +50,7 @@ function buildFeedbackReportMarkdown(
   event: { title?: string | null; id: number },
   data: FeedbackReportResponse
 ) {
-  const { aggregates, ai_summary, feedback } = data;
+  const { aggregates, ai_summary, ai_summary_pending, feedback } = data;
   const lines: string[] = [];
 
   lines.push(`# Feedback Report – ${event.title ?? "Untitled Event"}`);
@@ -76,7 +80,12 @@ function buildFeedbackReportMarkdown(
   lines.push("");
 
   lines.push("## 2. AI summary (qualitative)");
-  lines.push(ai_summary || "_No AI summary generated yet._");
+  lines.push(
+    ai_summary ||
+      (ai_summary_pending
+        ? "_AI summary is still being generated._"
+        : "_No AI summary generated yet._")
+  );
   lines.push("");
 
   lines.push("## 3. Individual feedback");
@@ -205,9 +214,9 @@ export default function DashBoardPage() {
   const [report, setReport] = useState<FeedbackReportResponse | null>(null);
   const [reportLoading, setReportLoading] = useState(false);
 
-  const fetchFeedbackReport = async () => {
+  const fetchFeedbackReport = async (showLoading = true) => {
     if (!eventId) return;
-    setReportLoading(true);
+    if (showLoading) setReportLoading(true);
     try {
       const res = await fetch(
         `${API_BASE}/events/${eventId}/feedback/report`,
@@ -234,6 +243,15 @@ export default function DashBoardPage() {
     fetchFeedbackReport();
   }, [eventId]);
 
+  useEffect(() => {
+    if (!report?.ai_summary_pending) return;
+    const timer = setTimeout(
+      () => fetchFeedbackReport(false),
+      AI_SUMMARY_POLL_MS
+    );
+    return () => clearTimeout(timer);
+  }, [report]);
+
   if (state.loading) {
     return (
       <main>
@@ -395,7 +413,9 @@ export default function DashBoardPage() {
               <FeedbackSummarySidebar
                 feedbacks={feedbacks}
                 aiSummary={report?.ai_summary || ""}
-                aiSummaryLoading={reportLoading}
+                aiSummaryLoading={
+                  reportLoading || !!report?.ai_summary_pending
+                }
                 onExport={handleExportFeedbackReport}
               />
             </div>
@@ -21,6 +21,8 @@ export default function NotificationsPage() {
   const [notifications, setNotifications] = useState<Notification[]>([]);
   const [filter, setFilter] = useState<'all' | 'unread'>('all');
   const [isLoading, setIsLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
 
   useEffect(() => {
     fetchNotifications();
@@ -35,7 +37,8 @@ export default function NotificationsPage() {
 
       if (response.ok) {
         const data = await response.json();
-        setNotifications(data);
+        setNotifications(data.notifications);
+        setNextCursor(data.next_cursor);
       }
     } catch (error) {
       console.error('Error fetching notifications:', error);
@@ -44,6 +47,27 @@ export default function NotificationsPage() {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setIsLoadingMore(true);
+    try {
+      const response = await fetch(
+        `http://localhost:8000/api/notifications?cursor=${encodeURIComponent(nextCursor)}`,
+        { credentials: 'include' }
+      );
+
+      if (response.ok) {
+        const data = await response.json();
+        setNotifications((prev) => [...prev, ...data.notifications]);
+        setNextCursor(data.next_cursor);
+      }
+    } catch (error) {
+      console.error('Error fetching notifications:', error);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const markAsRead = async (notificationId: number) => {
     try {
       const csrfRes = await fetch('http://localhost:8000/api/set-csrf-token', {
@@ -358,6 +382,16 @@ export default function NotificationsPage() {
                   </div>
                 </motion.div>
               ))}
+
+              {nextCursor && (
+                <button
+                  onClick={loadMore}
+                  disabled={isLoadingMore}
+                  className="w-full py-3 text-sm font-medium text-indigo-600 bg-white rounded-lg shadow-sm hover:bg-indigo-50 transition disabled:opacity-50"
+                >
+                  {isLoadingMore ? 'Loading...' : 'Load older notifications'}
+                </button>
+              )}
             </div>
           )}
         </div>